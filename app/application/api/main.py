@@ -1,9 +1,38 @@
+import asyncio
+import logging
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.application.api.messages import router as messages_router
+from app.application.api.metrics import MetricsMiddleware
+from app.application.api.metrics import router as metrics_router
+from app.application.api.ratelimit import RateLimitConfig, RateLimitMiddleware
+from app.application.api.search import router as search_router
+from app.application.api.messages import exports_router, streams_router
+from app.application.api.messages.router import (
+    get_chat_activity,
+    get_chat_broadcaster,
+    get_chat_repository,
+    get_event_bus,
+    get_event_publisher,
+    get_mediator,
+    get_metrics,
+    get_outbox_store,
+    get_response_cache,
+    get_search_index,
+)
+from app.domain.ids import set_id_generator
+from app.infra.ratelimit.buckets import parse_rate
+from app.infra.read_models.chat_activity import load_chat_activity
+from app.infra.search.index import index_repository
+from app.logic.init import build_id_generator, build_outbox_relay, init_fanout_mediator
+from app.logic.mediator import Mediator
+
+logger = logging.getLogger(__name__)
 
 
 def _allowed_origins() -> list[str]:
@@ -11,20 +40,103 @@ def _allowed_origins() -> list[str]:
     return [origin.strip() for origin in raw_origins.split(",") if origin.strip()]
 
 
+def _rate_limits() -> RateLimitConfig:
+    return RateLimitConfig(
+        per_ip=parse_rate(os.getenv("CHAT_RATE_LIMIT_IP", "")),
+        per_origin=parse_rate(os.getenv("CHAT_RATE_LIMIT_ORIGIN", "")),
+        per_chat=parse_rate(os.getenv("CHAT_RATE_LIMIT_CHAT", "")),
+        max_keys=int(os.getenv("CHAT_RATE_LIMIT_MAX_KEYS", "100000")),
+        max_in_flight=int(os.getenv("CHAT_MAX_IN_FLIGHT", "0")),
+    )
+
+
+def _log_backfill_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Backfill %s failed", task.get_name(), exc_info=task.exception())
+
+
+def _start_backfill(name: str, coroutine) -> asyncio.Task:
+    task = asyncio.create_task(coroutine, name=name)
+    task.add_done_callback(_log_backfill_failure)
+    return task
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    search_index = get_search_index()
+    chat_activity = get_chat_activity()
+    # Backfills run next to live traffic: the search index skips documents
+    # it already has, and chat activity adds the messages applied meanwhile
+    # to its snapshot instead of overwriting them.
+    backfills = [
+        _start_backfill("chat-activity", load_chat_activity(chat_activity, get_chat_repository())),
+    ]
+    if search_index is not None:
+        backfills.append(_start_backfill("search-index", index_repository(search_index, get_chat_repository())))
+
+    outbox_store = get_outbox_store()
+    relay = None
+    if outbox_store is not None:
+        relay = build_outbox_relay(get_mediator(), outbox_store)
+        relay.start()
+
+    event_bus = get_event_bus()
+    if event_bus is not None:
+        fanout_mediator = Mediator()
+        init_fanout_mediator(
+            fanout_mediator,
+            get_chat_broadcaster(),
+            get_response_cache(),
+            search_index,
+            chat_activity,
+        )
+        await event_bus.start(fanout_mediator.handle_event)
+
+    yield
+
+    for backfill in backfills:
+        backfill.cancel()
+    if relay is not None:
+        await relay.stop()
+        await outbox_store.stop()
+    if event_bus is not None:
+        await event_bus.stop()
+    await get_mediator().wait_background()
+    await get_chat_repository().stop()
+    # Buffered publishers flush pending events before the process exits.
+    await get_event_publisher().stop()
+
+
 def create_app() -> FastAPI:
+    set_id_generator(build_id_generator())
     app = FastAPI(
         title='Embeddable FastAPI Chat',
         docs_url='/api/docs',
         description='DDD chat API with optional Kafka event publishing.',
         debug=os.getenv("APP_DEBUG", "false").lower() in {"1", "true", "yes", "on"},
+        lifespan=lifespan,
     )
 
+    metrics = get_metrics()
+    rate_limits = _rate_limits()
+    # Added before CORS so that 429 and 503 responses carry CORS headers.
+    if rate_limits.enabled:
+        app.add_middleware(RateLimitMiddleware, config=rate_limits, registry=metrics)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=_allowed_origins(),
         allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "Retry-After"],
     )
+    if metrics.enabled:
+        app.add_middleware(MetricsMiddleware, registry=metrics)
+    # Exports and streams go before the chats router, whose /{chat_oid}
+    # would otherwise match "/api/chats/export" and "/api/chats/stream".
+    app.include_router(exports_router)
+    app.include_router(streams_router)
     app.include_router(messages_router)
+    app.include_router(search_router)
+    app.include_router(metrics_router)
     return app
@@ -1,3 +1,5 @@
+from app.application.api.messages.exports import router as exports_router
 from app.application.api.messages.router import router
+from app.application.api.messages.streams import router as streams_router
 
-__all__ = ["router"]
+__all__ = ["exports_router", "router", "streams_router"]
@@ -0,0 +1,79 @@
+"""JSON bodies of the read endpoints, encoded straight from domain entities.
+
+Building a Pydantic model per message and validating it again costs more
+than the rest of a request for long chats, so read endpoints encode plain
+dicts instead. The shapes match the models in ``schemas``, which still
+describe the endpoints in the OpenAPI schema.
+"""
+import json
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any
+
+from app.domain.entities.messages import Chat, Message
+from app.infra.read_models.chat_activity import ChatActivity
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with FastAPI extras
+    orjson = None
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON; datetimes become ISO 8601."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _messages(messages: Iterable[Message]) -> list[dict]:
+    return [
+        {"oid": message.oid, "text": message.text.as_generic_type(), "created_at": message.created_at}
+        for message in messages
+    ]
+
+
+def chat_summary(chat: Chat, activity: ChatActivity | None) -> dict:
+    return {
+        "oid": chat.oid,
+        "title": chat.title.as_generic_type(),
+        "created_at": chat.created_at,
+        "messages_count": activity.messages_count if activity else 0,
+        "last_message_preview": activity.last_message_preview if activity else None,
+        "last_activity_at": activity.last_activity_at if activity else chat.created_at,
+    }
+
+
+def activity_summary(activity: ChatActivity) -> dict:
+    return {
+        "oid": activity.chat_oid,
+        "title": activity.title,
+        "created_at": activity.created_at,
+        "messages_count": activity.messages_count,
+        "last_message_preview": activity.last_message_preview,
+        "last_activity_at": activity.last_activity_at,
+    }
+
+
+def encode_chat_detail(chat: Chat, prev_cursor: str | None = None) -> bytes:
+    return dumps({
+        "oid": chat.oid,
+        "title": chat.title.as_generic_type(),
+        "created_at": chat.created_at,
+        "messages": _messages(chat.messages),
+        "prev_cursor": prev_cursor,
+    })
+
+
+def encode_messages_page(messages: list[Message], prev_cursor: str | None, next_cursor: str | None) -> bytes:
+    return dumps({
+        "messages": _messages(messages),
+        "prev_cursor": prev_cursor,
+        "next_cursor": next_cursor,
+    })
@@ -0,0 +1,142 @@
+import csv
+import io
+import zlib
+from collections.abc import AsyncIterator
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.application.api.messages import encoders
+from app.application.api.messages.router import ChatService, get_chat_service
+from app.domain.entities.messages import Chat, Message
+from app.logic.exceptions.messages import ChatNotFoundException
+
+router = APIRouter(prefix="/api/chats", tags=["chats"])
+
+PAGE_SIZE = 500
+EXPORT_FIELDS = ("chat_oid", "chat_title", "message_oid", "created_at", "text")
+
+ExportFormat = Literal["jsonl", "csv"]
+
+_MEDIA_TYPES = {"jsonl": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _accepts_gzip(accept_encoding: str | None) -> bool:
+    for coding in (accept_encoding or "").split(","):
+        name, _, parameters = coding.partition(";")
+        if name.strip().lower() != "gzip":
+            continue
+        try:
+            return float(parameters.strip().removeprefix("q=") or 1) > 0
+        except ValueError:
+            return True
+    return False
+
+
+def _csv(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _encode_rows(chat: Chat, messages: list[Message], export_format: ExportFormat) -> bytes:
+    title = chat.title.as_generic_type()
+    if export_format == "jsonl":
+        return b"".join(
+            encoders.dumps({
+                "chat_oid": chat.oid,
+                "chat_title": title,
+                "message_oid": message.oid,
+                "created_at": message.created_at,
+                "text": message.text.as_generic_type(),
+            }) + b"\n"
+            for message in messages
+        )
+    return _csv(
+        (chat.oid, title, message.oid, message.created_at.isoformat(), message.text.as_generic_type())
+        for message in messages
+    )
+
+
+async def _chat_rows(
+    service: ChatService,
+    chat: Chat,
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    async for messages in service.iter_messages(chat.oid, PAGE_SIZE):
+        yield _encode_rows(chat, messages, export_format)
+
+
+async def _all_chats_rows(service: ChatService, export_format: ExportFormat) -> AsyncIterator[bytes]:
+    async for chats in service.iter_chats(PAGE_SIZE):
+        for chat in chats:
+            async for chunk in _chat_rows(service, chat, export_format):
+                yield chunk
+
+
+async def _with_header(rows: AsyncIterator[bytes], export_format: ExportFormat) -> AsyncIterator[bytes]:
+    if export_format == "csv":
+        yield _csv([EXPORT_FIELDS])
+    async for chunk in rows:
+        yield chunk
+
+
+async def _gzipped(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # wbits=31 writes a gzip header and trailer around the deflate stream.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def _export_response(
+    request: Request,
+    rows: AsyncIterator[bytes],
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    body = _with_header(rows, export_format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{export_format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if _accepts_gzip(request.headers.get("accept-encoding")):
+        body = _gzipped(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=_MEDIA_TYPES[export_format], headers=headers)
+
+
+@router.get("/export")
+async def export_chats(
+    request: Request,
+    export_format: ExportFormat = Query("jsonl", alias="format"),
+    service: ChatService = Depends(get_chat_service),
+) -> StreamingResponse:
+    """Stream the messages of every chat, one row per message.
+
+    Chats and messages are read in pages of ``PAGE_SIZE``, so memory use
+    does not grow with the amount exported. The body is gzip-compressed
+    on the fly when the client accepts it.
+    """
+    return _export_response(request, _all_chats_rows(service, export_format), export_format, "chats")
+
+
+@router.get("/{chat_oid}/export")
+async def export_chat(
+    chat_oid: str,
+    request: Request,
+    export_format: ExportFormat = Query("jsonl", alias="format"),
+    service: ChatService = Depends(get_chat_service),
+) -> StreamingResponse:
+    """Stream the transcript of one chat, oldest message first."""
+    try:
+        chat = await service.get_chat_metadata(chat_oid)
+    except ChatNotFoundException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=exc.message,
+        ) from exc
+    return _export_response(request, _chat_rows(service, chat, export_format), export_format, f"chat-{chat_oid}")
@@ -1,35 +1,76 @@
+import os
+from collections.abc import AsyncIterator
+from datetime import datetime
 from functools import lru_cache
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.application.api.messages import encoders
 from app.application.api.messages.schemas import (
     ChatCreateRequest,
     ChatDetailResponse,
     ChatResponse,
+    ChatSummaryResponse,
+    MessageBatchItemResponse,
     MessageCreateRequest,
     MessageResponse,
+    MessagesBatchCreateRequest,
+    MessagesBatchResponse,
+    MessagesPageResponse,
 )
+from app.domain.entities.messages import Chat, Message
 from app.domain.exceptions import messages as domain_exceptions
 from app.domain.exceptions.messages import ApplicationException
+from app.domain.values.cursors import Cursor
+from app.infra.bus.events import EventBus
+from app.infra.cache.responses import (
+    CHAT_ACTIVITY_LIST_TAG,
+    CHAT_LIST_TAG,
+    CachedResponse,
+    ResponseCache,
+    chat_tag,
+)
+from app.infra.kafka.producer import EventPublisher
+from app.infra.metrics.registry import Metrics
+from app.infra.outbox.stores import BaseOutboxStore
+from app.infra.push.broadcaster import ChatBroadcaster
+from app.infra.read_models.chat_activity import MemoryChatActivityReadModel
+from app.infra.repositories.messages import BaseChatRepository
+from app.infra.search.index import InvertedIndex
 from app.logic.commands.messages import (
     CreateChatCommand,
     CreateMessageCommand,
+    CreateMessagesBatchCommand,
     GetChatCommand,
+    GetMessagesCommand,
     ListChatsCommand,
 )
 from app.logic.exceptions.messages import (
     ChatNotFoundException,
     CheckWithThatTitleAlreadyExistsException,
 )
-from app.logic.init import init_mediator
+from app.logic.init import (
+    build_chat_repository,
+    build_event_bus,
+    build_event_publisher,
+    build_mediator,
+    build_metrics,
+    build_outbox_store,
+    build_search_index,
+    init_mediator,
+)
 from app.logic.mediator import Mediator
 
 router = APIRouter(prefix="/api/chats", tags=["chats"])
 
+# Sorts before every message, so paging forward from it starts at the oldest.
+_HISTORY_START = Cursor.for_key(datetime.min, "").as_generic_type()
 
 class ChatService:
-    def __init__(self, mediator: Mediator):
+    def __init__(self, mediator: Mediator, chat_activity: MemoryChatActivityReadModel | None = None):
         self._mediator = mediator
+        self._chat_activity = chat_activity or MemoryChatActivityReadModel()
 
     async def create_chat(self, title: str) -> ChatResponse:
         results = await self._mediator.handle_command(CreateChatCommand(title=title))
@@ -40,33 +81,104 @@ class ChatService:
             created_at=chat.created_at,
         )
 
-    async def list_chats(self) -> list[ChatResponse]:
-        results = await self._mediator.handle_command(ListChatsCommand())
-        chats = results[0]
-        return [
-            ChatResponse(
-                oid=chat.oid,
-                title=chat.title.as_generic_type(),
-                created_at=chat.created_at,
+    async def list_chats(
+        self,
+        limit: int | None = None,
+        after: str | None = None,
+        created_after: datetime | None = None,
+        title_prefix: str | None = None,
+    ) -> tuple[bytes, str | None, list[str]]:
+        """Return a JSON page of chat summaries by creation time, the next cursor and the chat oids."""
+        results = await self._mediator.handle_command(
+            ListChatsCommand(
+                limit=limit,
+                after=after,
+                created_after=created_after,
+                title_prefix=title_prefix,
             )
-            for chat in chats
-        ]
+        )
+        chats = results[0]
+        next_cursor = None
+        if limit is not None and len(chats) == limit:
+            next_cursor = Cursor.for_entity(chats[-1]).as_generic_type()
+        summaries = [encoders.chat_summary(chat, self._chat_activity.get(chat.oid)) for chat in chats]
+        return encoders.dumps(summaries), next_cursor, [chat.oid for chat in chats]
+
+    def list_chats_by_activity(
+        self,
+        limit: int,
+        after: str | None = None,
+        title_prefix: str | None = None,
+    ) -> tuple[bytes, str | None]:
+        """Return a JSON page of chat summaries, most recently active first, and the next cursor."""
+        page = self._chat_activity.list_by_activity(
+            limit=limit,
+            after=Cursor(value=after).as_key() if after else None,
+            title_prefix=title_prefix,
+        )
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = Cursor.for_key(*page[-1].activity_key).as_generic_type()
+        return encoders.dumps([encoders.activity_summary(activity) for activity in page]), next_cursor
 
-    async def get_chat(self, chat_oid: str) -> ChatDetailResponse:
-        results = await self._mediator.handle_command(GetChatCommand(chat_oid=chat_oid))
+    async def get_chat(self, chat_oid: str, messages_limit: int | None = None) -> bytes:
+        results = await self._mediator.handle_command(
+            GetChatCommand(chat_oid=chat_oid, messages_limit=messages_limit)
+        )
         chat = results[0]
-        return ChatDetailResponse(
-            oid=chat.oid,
-            title=chat.title.as_generic_type(),
-            created_at=chat.created_at,
-            messages=[
-                MessageResponse(
-                    oid=message.oid,
-                    text=message.text.as_generic_type(),
-                    created_at=message.created_at,
-                )
-                for message in sorted(chat.messages, key=lambda item: item.created_at)
-            ],
+        prev_cursor = None
+        if messages_limit and len(chat.messages) == messages_limit:
+            prev_cursor = Cursor.for_entity(next(iter(chat.messages))).as_generic_type()
+        return encoders.encode_chat_detail(chat, prev_cursor)
+
+    async def get_chat_metadata(self, chat_oid: str) -> Chat:
+        results = await self._mediator.handle_command(GetChatCommand(chat_oid=chat_oid, messages_limit=0))
+        return results[0]
+
+    async def check_chat_exists(self, chat_oid: str) -> None:
+        await self.get_chat_metadata(chat_oid)
+
+    async def iter_chats(self, page_size: int) -> AsyncIterator[list[Chat]]:
+        """Yield every chat in creation order, one page at a time."""
+        after = None
+        while True:
+            results = await self._mediator.handle_command(ListChatsCommand(limit=page_size, after=after))
+            chats = results[0]
+            if chats:
+                yield chats
+            if len(chats) < page_size:
+                return
+            after = Cursor.for_entity(chats[-1]).as_generic_type()
+
+    async def iter_messages(self, chat_oid: str, page_size: int) -> AsyncIterator[list[Message]]:
+        """Yield the whole history of a chat, oldest first, one page at a time."""
+        after = _HISTORY_START
+        while True:
+            results = await self._mediator.handle_command(
+                GetMessagesCommand(chat_oid=chat_oid, limit=page_size, after=after)
+            )
+            messages = results[0]
+            if messages:
+                yield messages
+            if len(messages) < page_size:
+                return
+            after = Cursor.for_entity(messages[-1]).as_generic_type()
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        limit: int,
+        after: str | None = None,
+        before: str | None = None,
+    ) -> bytes:
+        results = await self._mediator.handle_command(
+            GetMessagesCommand(chat_oid=chat_oid, limit=limit, after=after, before=before)
+        )
+        messages = results[0]
+        return encoders.encode_messages_page(
+            messages,
+            prev_cursor=Cursor.for_entity(messages[0]).as_generic_type() if messages else before,
+            next_cursor=Cursor.for_entity(messages[-1]).as_generic_type() if messages else after,
         )
 
     async def create_message(self, chat_oid: str, text: str) -> MessageResponse:
@@ -80,16 +192,120 @@ class ChatService:
             created_at=message.created_at,
         )
 
+    async def create_messages_batch(self, chat_oid: str, texts: list[str]) -> MessagesBatchResponse:
+        results = await self._mediator.handle_command(
+            CreateMessagesBatchCommand(chat_oid=chat_oid, texts=tuple(texts))
+        )
+        items = []
+        for index, result in enumerate(results[0]):
+            if result.message is not None:
+                items.append(MessageBatchItemResponse(
+                    index=index,
+                    status=status.HTTP_201_CREATED,
+                    message=MessageResponse(
+                        oid=result.message.oid,
+                        text=result.message.text.as_generic_type(),
+                        created_at=result.message.created_at,
+                    ),
+                ))
+            else:
+                items.append(MessageBatchItemResponse(
+                    index=index,
+                    status=_BATCH_ITEM_ERROR_STATUSES.get(
+                        type(result.error), status.HTTP_400_BAD_REQUEST,
+                    ),
+                    error=result.error.message,
+                ))
+        created = sum(1 for item in items if item.message is not None)
+        return MessagesBatchResponse(created=created, failed=len(items) - created, results=items)
+
+
+_BATCH_ITEM_ERROR_STATUSES = {
+    domain_exceptions.EmptyTextException: status.HTTP_400_BAD_REQUEST,
+    domain_exceptions.TextTooLongException: status.HTTP_422_UNPROCESSABLE_ENTITY,
+}
+
+
+@lru_cache
+def get_chat_broadcaster() -> ChatBroadcaster:
+    return ChatBroadcaster(queue_size=int(os.getenv("CHAT_STREAM_QUEUE_SIZE", "100")))
+
+
+@lru_cache
+def get_metrics() -> Metrics:
+    return build_metrics()
+
+
+@lru_cache
+def get_event_publisher() -> EventPublisher:
+    return build_event_publisher(get_metrics(), get_outbox_store())
+
+
+@lru_cache
+def get_outbox_store() -> BaseOutboxStore | None:
+    return build_outbox_store()
+
+
+@lru_cache
+def get_response_cache() -> ResponseCache:
+    return ResponseCache(max_bytes=int(os.getenv("CHAT_RESPONSE_CACHE_BYTES", str(16 * 1024 * 1024))))
+
+
+@lru_cache
+def get_event_bus() -> EventBus | None:
+    return build_event_bus()
+
+
+@lru_cache
+def get_chat_repository() -> BaseChatRepository:
+    return build_chat_repository(get_metrics(), get_outbox_store())
+
+
+@lru_cache
+def get_search_index() -> InvertedIndex | None:
+    return build_search_index()
+
+
+@lru_cache
+def get_chat_activity() -> MemoryChatActivityReadModel:
+    return MemoryChatActivityReadModel()
+
 
 @lru_cache
 def get_mediator() -> Mediator:
-    mediator = Mediator()
-    init_mediator(mediator=mediator)
+    mediator = build_mediator(outbox=get_outbox_store(), metrics=get_metrics())
+    init_mediator(
+        mediator=mediator,
+        chat_repository=get_chat_repository(),
+        event_publisher=get_event_publisher(),
+        broadcaster=get_chat_broadcaster(),
+        response_cache=get_response_cache(),
+        event_bus=get_event_bus(),
+        search_index=get_search_index(),
+        chat_activity=get_chat_activity(),
+    )
     return mediator
 
 
-def get_chat_service(mediator: Mediator = Depends(get_mediator)) -> ChatService:
-    return ChatService(mediator=mediator)
+def get_chat_service(
+    mediator: Mediator = Depends(get_mediator),
+    chat_activity: MemoryChatActivityReadModel = Depends(get_chat_activity),
+) -> ChatService:
+    return ChatService(mediator=mediator, chat_activity=chat_activity)
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    headers = {"ETag": entry.etag, **dict(entry.headers)}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
 
 
 @router.post("", response_model=ChatResponse, status_code=status.HTTP_201_CREATED)
@@ -99,11 +315,6 @@ async def create_chat(
 ) -> ChatResponse:
     try:
         return await service.create_chat(payload.title)
-    except ApplicationException as exc:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=exc.message,
-        ) from exc
     except CheckWithThatTitleAlreadyExistsException as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -122,27 +333,129 @@ async def create_chat(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=exc.message,
         ) from exc
+    except ApplicationException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=exc.message,
+        ) from exc
 
 
-@router.get("", response_model=list[ChatResponse])
+@router.get("", response_model=list[ChatSummaryResponse])
 async def list_chats(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000),
+    after: str | None = None,
+    created_after: datetime | None = None,
+    title_prefix: str | None = Query(None, max_length=255),
+    order: Literal["created", "activity"] = "created",
     service: ChatService = Depends(get_chat_service),
-) -> list[ChatResponse]:
-    return await service.list_chats()
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    """List chats with their message count and last message preview.
+
+    ``order=created`` (the default) lists chats by creation time, oldest
+    first; ``order=activity`` puts the most recently active chats first,
+    like an inbox, and ignores ``created_after``. When the page is full,
+    the ``X-Next-Cursor`` header carries the cursor to pass as ``after``
+    for the next page. Responses carry an ``ETag``; repeating it in
+    ``If-None-Match`` returns 304 while the page is unchanged.
+    """
+    key = (
+        f"{CHAT_LIST_TAG}?{order}|{limit}|{after}|"
+        f"{created_after and created_after.isoformat()}|{title_prefix}"
+    )
+    entry = cache.get(key)
+    if entry is None:
+        version = cache.version()
+        tag, related_tags = CHAT_ACTIVITY_LIST_TAG, ()
+        try:
+            if order == "activity":
+                body, next_cursor = service.list_chats_by_activity(
+                    limit=limit,
+                    after=after,
+                    title_prefix=title_prefix,
+                )
+            else:
+                tag = CHAT_LIST_TAG
+                body, next_cursor, chat_oids = await service.list_chats(
+                    limit=limit,
+                    after=after,
+                    created_after=created_after,
+                    title_prefix=title_prefix,
+                )
+                # A new message changes only the pages that show its chat.
+                related_tags = tuple(chat_tag(chat_oid) for chat_oid in chat_oids)
+        except ApplicationException as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=exc.message,
+            ) from exc
+
+        headers = ()
+        if next_cursor is not None:
+            headers = (("X-Next-Cursor", next_cursor),)
+        entry = cache.put(
+            key,
+            body,
+            tag=tag,
+            version=version,
+            headers=headers,
+            related_tags=related_tags,
+        )
+    return _cached_json_response(request, entry)
 
 
 @router.get("/{chat_oid}", response_model=ChatDetailResponse)
 async def get_chat(
     chat_oid: str,
+    request: Request,
+    messages_limit: int | None = Query(None, ge=0, le=500),
     service: ChatService = Depends(get_chat_service),
-) -> ChatDetailResponse:
+    cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
+    """Get a chat with its messages.
+
+    Without ``messages_limit`` the whole history is returned. With it, only
+    the newest messages are loaded, and ``prev_cursor`` pages back through
+    ``GET /api/chats/{chat_oid}/messages?before=``.
+    """
+    tag = chat_tag(chat_oid)
+    key = tag if messages_limit is None else f"{tag}?messages_limit={messages_limit}"
+    entry = cache.get(key)
+    if entry is None:
+        version = cache.version()
+        try:
+            body = await service.get_chat(chat_oid, messages_limit=messages_limit)
+        except ChatNotFoundException as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=exc.message,
+            ) from exc
+        entry = cache.put(key, body, tag=tag, version=version)
+    return _cached_json_response(request, entry)
+
+
+@router.get("/{chat_oid}/messages", response_model=MessagesPageResponse)
+async def get_messages(
+    chat_oid: str,
+    after: str | None = None,
+    before: str | None = None,
+    limit: int = Query(50, ge=1, le=500),
+    service: ChatService = Depends(get_chat_service),
+) -> Response:
     try:
-        return await service.get_chat(chat_oid)
+        body = await service.get_messages(chat_oid, limit=limit, after=after, before=before)
     except ChatNotFoundException as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=exc.message,
         ) from exc
+    except ApplicationException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=exc.message,
+        ) from exc
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/{chat_oid}/messages", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
@@ -158,18 +471,38 @@ async def create_message(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=exc.message,
         ) from exc
-    except ApplicationException as exc:
+    except domain_exceptions.EmptyTextException as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=exc.message,
         ) from exc
-    except domain_exceptions.EmptyTextException as exc:
+    except domain_exceptions.TextTooLongException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=exc.message,
+        ) from exc
+    except ApplicationException as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=exc.message,
         ) from exc
-    except domain_exceptions.TextTooLongException as exc:
+
+
+@router.post("/{chat_oid}/messages:batch", response_model=MessagesBatchResponse)
+async def create_messages_batch(
+    chat_oid: str,
+    payload: MessagesBatchCreateRequest,
+    service: ChatService = Depends(get_chat_service),
+) -> MessagesBatchResponse:
+    try:
+        return await service.create_messages_batch(chat_oid, [item.text for item in payload.messages])
+    except ChatNotFoundException as exc:
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=exc.message,
+        ) from exc
+    except ApplicationException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
             detail=exc.message,
         ) from exc
@@ -17,11 +17,49 @@ class MessageCreateRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=4000)
 
 
+class MessageBatchItemRequest(BaseModel):
+    # Length is checked per item by the domain so one bad text does not
+    # reject the whole batch.
+    text: str
+
+
+class MessagesBatchCreateRequest(BaseModel):
+    messages: list[MessageBatchItemRequest] = Field(..., min_length=1, max_length=1000)
+
+
 class MessageResponse(BaseModel):
     oid: str
     text: str
     created_at: datetime
 
 
+class ChatSummaryResponse(ChatResponse):
+    messages_count: int = 0
+    last_message_preview: str | None = None
+    last_activity_at: datetime | None = None
+
+
 class ChatDetailResponse(ChatResponse):
     messages: list[MessageResponse]
+    # Set when only the newest messages were loaded; pass it as ``before``
+    # to the messages endpoint to page back.
+    prev_cursor: str | None = None
+
+
+class MessagesPageResponse(BaseModel):
+    messages: list[MessageResponse]
+    prev_cursor: str | None = None
+    next_cursor: str | None = None
+
+
+class MessageBatchItemResponse(BaseModel):
+    index: int
+    status: int
+    message: MessageResponse | None = None
+    error: str | None = None
+
+
+class MessagesBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: list[MessageBatchItemResponse]
@@ -0,0 +1,119 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, status
+from fastapi.responses import StreamingResponse
+
+from app.application.api.messages.router import (
+    ChatService,
+    get_chat_broadcaster,
+    get_chat_service,
+)
+from app.infra.push.broadcaster import INBOX_TOPIC, ChatBroadcaster
+from app.logic.exceptions.messages import ChatNotFoundException
+
+router = APIRouter(prefix="/api/chats", tags=["chats"])
+
+HEARTBEAT_INTERVAL = 15.0
+
+
+async def _sse_events(broadcaster: ChatBroadcaster, topic: str) -> AsyncIterator[str]:
+    # Subscribed only once the body is iterated, so a response that is never
+    # sent does not leave a subscription buffering events.
+    subscription = broadcaster.subscribe(topic)
+    try:
+        while True:
+            try:
+                data = await asyncio.wait_for(subscription.get(), timeout=HEARTBEAT_INTERVAL)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            dropped = subscription.take_dropped()
+            if dropped:
+                yield f'event: lagged\ndata: {{"dropped": {dropped}}}\n\n'
+            yield f"data: {data}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+def _sse_response(broadcaster: ChatBroadcaster, topic: str) -> StreamingResponse:
+    return StreamingResponse(
+        _sse_events(broadcaster, topic),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _websocket_stream(
+    websocket: WebSocket,
+    broadcaster: ChatBroadcaster,
+    topic: str,
+) -> None:
+    await websocket.accept()
+    subscription = broadcaster.subscribe(topic)
+
+    async def pump() -> None:
+        while True:
+            data = await subscription.get()
+            dropped = subscription.take_dropped()
+            if dropped:
+                await websocket.send_json({"type": "lagged", "dropped": dropped})
+            await websocket.send_text(data)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        # Incoming frames are ignored; the loop only detects disconnects.
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        pump_task.cancel()
+        broadcaster.unsubscribe(subscription)
+
+
+@router.get("/stream")
+async def inbox_stream(
+    broadcaster: ChatBroadcaster = Depends(get_chat_broadcaster),
+) -> StreamingResponse:
+    """Server-Sent Events with every new chat and message."""
+    return _sse_response(broadcaster, INBOX_TOPIC)
+
+
+@router.websocket("/stream")
+async def inbox_websocket(
+    websocket: WebSocket,
+    broadcaster: ChatBroadcaster = Depends(get_chat_broadcaster),
+) -> None:
+    await _websocket_stream(websocket, broadcaster, INBOX_TOPIC)
+
+
+@router.get("/{chat_oid}/stream")
+async def chat_stream(
+    chat_oid: str,
+    service: ChatService = Depends(get_chat_service),
+    broadcaster: ChatBroadcaster = Depends(get_chat_broadcaster),
+) -> StreamingResponse:
+    """Server-Sent Events with new messages of a single chat."""
+    try:
+        await service.check_chat_exists(chat_oid)
+    except ChatNotFoundException as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=exc.message,
+        ) from exc
+    return _sse_response(broadcaster, chat_oid)
+
+
+@router.websocket("/{chat_oid}/stream")
+async def chat_websocket(
+    websocket: WebSocket,
+    chat_oid: str,
+    service: ChatService = Depends(get_chat_service),
+    broadcaster: ChatBroadcaster = Depends(get_chat_broadcaster),
+) -> None:
+    try:
+        await service.check_chat_exists(chat_oid)
+    except ChatNotFoundException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await _websocket_stream(websocket, broadcaster, chat_oid)
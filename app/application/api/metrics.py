@@ -0,0 +1,66 @@
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.application.api.messages.router import get_metrics
+from app.infra.metrics.registry import Metrics
+
+router = APIRouter(tags=["monitoring"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(registry: Metrics = Depends(get_metrics)) -> Response:
+    """Metrics in the Prometheus text format; 404 when ``CHAT_METRICS=off``."""
+    if not registry.enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics are disabled")
+    return Response(content=registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """Records the duration and status of every HTTP request.
+
+    Requests are labelled with the route template rather than the raw path,
+    so chat ids do not create a time series each. Streaming responses are
+    measured until the stream closes.
+    """
+
+    def __init__(self, app: ASGIApp, registry: Metrics) -> None:
+        self.app = app
+        self._duration = registry.histogram(
+            "chat_http_request_duration_seconds",
+            "Time from receiving an HTTP request to finishing the response.",
+            ("method", "route", "status"),
+        )
+        self._in_progress = registry.gauge(
+            "chat_http_requests_in_progress",
+            "HTTP requests currently being handled.",
+        ).labels()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self._in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._in_progress.dec()
+            route = scope.get("route")
+            self._duration.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - started)
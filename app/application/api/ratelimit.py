@@ -0,0 +1,162 @@
+import json
+import math
+import re
+from dataclasses import dataclass
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.infra.metrics.registry import NOOP_METRICS, Metrics
+from app.infra.ratelimit.buckets import TokenBucketLimiter
+
+_CHAT_WRITE_RE = re.compile(r"/api/chats/([^/]+)/messages(:batch)?")
+
+_REJECTION_DETAILS = {
+    "ip": "Too many requests from this client",
+    "origin": "Too many requests from this website",
+    "chat": "Too many messages in this chat",
+}
+
+
+@dataclass(frozen=True)
+class RateLimitConfig:
+    """Limits as ``(tokens per second, burst)``; ``None`` disables one."""
+
+    per_ip: tuple[float, float] | None = None
+    per_origin: tuple[float, float] | None = None
+    per_chat: tuple[float, float] | None = None
+    max_keys: int = 100_000
+    max_in_flight: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.per_ip or self.per_origin or self.per_chat or self.max_in_flight)
+
+
+class RateLimitMiddleware:
+    """Rate limits writes and sheds load before the event loop saturates.
+
+    ``POST /api/chats`` and the message endpoints spend a token from the
+    bucket of the client IP, of the ``Origin`` header and, for messages, of
+    the chat; a batch spends one token per message. Every bucket is checked
+    before any is spent, and an empty one answers 429 with ``Retry-After``.
+    Every HTTP
+    request except streams and ``/metrics`` also takes an in-flight slot;
+    when ``max_in_flight`` are taken, new requests get 503 at once instead
+    of queueing behind the busy ones.
+    """
+
+    def __init__(self, app: ASGIApp, config: RateLimitConfig, registry: Metrics = NOOP_METRICS) -> None:
+        self.app = app
+        self._max_in_flight = config.max_in_flight
+        self._in_flight = 0
+        self._limiters = {
+            name: TokenBucketLimiter(*limit, max_keys=config.max_keys)
+            for name, limit in (
+                ("ip", config.per_ip),
+                ("origin", config.per_origin),
+                ("chat", config.per_chat),
+            )
+            if limit is not None
+        }
+        self._rejected = registry.counter(
+            "chat_http_requests_rejected_total",
+            "HTTP requests rejected by rate limits (429) or admission control (503).",
+            ("reason",),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path.endswith("/stream") or path == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        if self._max_in_flight and self._in_flight >= self._max_in_flight:
+            self._rejected.labels("overloaded").inc()
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        if scope["method"] == "POST" and self._limiters:
+            keys, is_batch = self._write_keys(scope, path)
+            cost = 1
+            if keys and is_batch:
+                body = await _read_body(receive)
+                cost = _batch_size(body)
+                receive = _replay(body, receive)
+            for reason, key in keys:
+                retry_after = self._limiters[reason].retry_after(key, cost)
+                if retry_after:
+                    self._rejected.labels(reason).inc()
+                    response = JSONResponse(
+                        {"detail": _REJECTION_DETAILS[reason]},
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        headers={"Retry-After": str(math.ceil(retry_after))},
+                    )
+                    await response(scope, receive, send)
+                    return
+            for reason, key in keys:
+                self._limiters[reason].acquire(key, cost)
+
+        self._in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    def _write_keys(self, scope: Scope, path: str) -> tuple[list[tuple[str, str]], bool]:
+        chat_write = _CHAT_WRITE_RE.fullmatch(path)
+        if chat_write is None and path != "/api/chats":
+            return [], False
+
+        keys = []
+        if "ip" in self._limiters:
+            client = scope.get("client")
+            keys.append(("ip", client[0] if client else "unknown"))
+        if "origin" in self._limiters:
+            for name, value in scope["headers"]:
+                if name == b"origin":
+                    keys.append(("origin", value.decode("latin-1")))
+                    break
+        if "chat" in self._limiters and chat_write is not None:
+            keys.append(("chat", chat_write.group(1)))
+        return keys, chat_write is not None and chat_write.group(2) is not None
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: bytes, receive: Receive) -> Receive:
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if sent:
+            return await receive()
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return replay
+
+
+def _batch_size(body: bytes) -> int:
+    # Malformed batches are rejected by validation and cost one token.
+    try:
+        messages = json.loads(body).get("messages")
+    except (ValueError, AttributeError):
+        return 1
+    return max(len(messages), 1) if isinstance(messages, list) else 1
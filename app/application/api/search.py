@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import BaseModel
+
+from app.application.api.messages.router import get_search_index
+from app.infra.search.index import MESSAGE_DOCUMENT, InvertedIndex
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+
+class SearchHitResponse(BaseModel):
+    kind: str
+    chat_oid: str
+    message_oid: str | None = None
+    text: str
+    score: float
+
+
+class SearchResponse(BaseModel):
+    total: int
+    hits: list[SearchHitResponse]
+
+
+@router.get("", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=255),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10_000),
+    index: InvertedIndex | None = Depends(get_search_index),
+) -> SearchResponse:
+    """Search chat titles and message texts.
+
+    Every word of ``q`` must match; a trailing ``*`` makes a word a prefix
+    (``прив*`` finds "привет" and "Привёт"). Case and "ё"/"е" are ignored.
+    Hits are ranked by relevance and paged with ``offset``/``limit``.
+    """
+    if index is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Search is disabled")
+
+    result = index.search(q, limit=limit, offset=offset)
+    return SearchResponse(
+        total=result.total,
+        hits=[
+            SearchHitResponse(
+                kind=hit.document.kind,
+                chat_oid=hit.document.chat_oid,
+                message_oid=hit.document.oid if hit.document.kind == MESSAGE_DOCUMENT else None,
+                text=hit.document.text,
+                score=round(hit.score, 4),
+            )
+            for hit in result.hits
+        ],
+    )
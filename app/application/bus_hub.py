@@ -0,0 +1,23 @@
+"""Event bus hub for several API processes on one host.
+
+Run with ``python -m app.application.bus_hub`` and start the API workers
+with ``CHAT_BUS=socket`` and the same ``CHAT_BUS_SOCKET``.
+"""
+import asyncio
+import logging
+import os
+
+from app.infra.bus.events import UnixSocketBusHub
+
+
+async def run_hub() -> None:
+    hub = UnixSocketBusHub(path=os.getenv("CHAT_BUS_SOCKET", "/tmp/chat-bus.sock"))
+    try:
+        await hub.serve_forever()
+    finally:
+        await hub.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_hub())
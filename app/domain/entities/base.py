@@ -1,19 +1,15 @@
 from abc import ABC
 from copy import copy
 from dataclasses import dataclass, field
-from uuid import uuid4
 
 from app.domain.events.base import BaseEvent
+from app.domain.ids import new_oid
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseEntity(ABC):
     oid: str = field(
-        default_factory=lambda: str(uuid4()),
-        kw_only=True,
-    )
-    _events: list[BaseEvent] = field(
-        default_factory=list,
+        default_factory=new_oid,
         kw_only=True,
     )
 
@@ -23,11 +19,29 @@ class BaseEntity(ABC):
     def __eq__(self, __value: 'BaseEntity') -> bool:
         return self.oid == __value.oid
 
+
+@dataclass(slots=True)
+class AggregateRoot(BaseEntity):
+    """Entity that records domain events until they are pulled and published.
+
+    Plain entities such as messages do not carry an event list; their
+    aggregate registers the events on their behalf.
+    """
+
+    _events: list[BaseEvent] = field(
+        default_factory=list,
+        kw_only=True,
+    )
+
     def register_event(self, event: BaseEvent) -> None:
         self._events.append(event)
 
+    def peek_events(self) -> list[BaseEvent]:
+        """Return the registered events without clearing them."""
+        return copy(self._events)
+
     def pull_events(self) -> list[BaseEvent]:
         registered_events = copy(self._events)
         self._events.clear()
 
-        return registered_events
\ No newline at end of file
+        return registered_events
@@ -1,12 +1,14 @@
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from app.domain.entities.base import BaseEntity
+from app.domain.entities.base import AggregateRoot, BaseEntity
 from app.domain.values.messages import Text, Title
 from app.domain.events.messages import NewMessageReceivedEvent, NewChatCreated
 
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True)
 class Message(BaseEntity):
     created_at: datetime = field(
         default_factory=datetime.now,
@@ -14,16 +16,75 @@ class Message(BaseEntity):
     )
     text: Text
 
-@dataclass(eq=False)
-class Chat(BaseEntity):
+
+def message_sort_key(message: Message) -> tuple[datetime, str]:
+    return message.created_at, message.oid
+
+
+class MessageLog:
+    """Append-only chat history ordered by ``(created_at, oid)``.
+
+    New messages normally land at the tail, so appends are O(1) and range
+    queries by a ``(created_at, oid)`` key are a binary search.
+    """
+
+    __slots__ = ("_messages", "_oids")
+
+    def __init__(self, messages: Iterable[Message] = ()) -> None:
+        self._messages: list[Message] = []
+        self._oids: set[str] = set()
+        for message in messages:
+            self.append(message)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages)
+
+    def __contains__(self, message: object) -> bool:
+        return isinstance(message, Message) and message.oid in self._oids
+
+    def append(self, message: Message) -> None:
+        if message.oid in self._oids:
+            return
+
+        self._oids.add(message.oid)
+        if self._messages and message_sort_key(self._messages[-1]) > message_sort_key(message):
+            insort(self._messages, message, key=message_sort_key)
+        else:
+            self._messages.append(message)
+
+    def page(
+        self,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[Message]:
+        """Return up to ``limit`` messages strictly between ``after`` and ``before``.
+
+        Without ``after`` the newest messages of the range are returned, which
+        is what scrolling back through history needs.
+        """
+        start = 0 if after is None else bisect_right(self._messages, after, key=message_sort_key)
+        stop = len(self._messages) if before is None else bisect_left(self._messages, before, key=message_sort_key)
+
+        if after is None:
+            start = max(start, stop - limit)
+        return self._messages[start:min(stop, start + limit)]
+
+
+@dataclass(eq=False, slots=True)
+class Chat(AggregateRoot):
     created_at: datetime = field(
         default_factory=datetime.now,
         kw_only=True,
     )
 
     title: Title
-    messages: set[Message] = field(
-        default_factory=set,
+    messages: MessageLog = field(
+        default_factory=MessageLog,
         kw_only=True,
     )
 
@@ -34,15 +95,17 @@ class Chat(BaseEntity):
         new_chat.register_event(NewChatCreated(
             chat_oid=new_chat.oid,
             chat_title=new_chat.title.as_generic_type(),
+            occurred_at=new_chat.created_at,
         ))
         return new_chat
 
     def add_messages(self, message: Message):
-        self.messages.add(message)
+        self.messages.append(message)
         self.register_event(NewMessageReceivedEvent(
             message_text=message.text.as_generic_type(),
             chat_oid=self.oid,
-            message_oid=message.oid
+            message_oid=message.oid,
+            occurred_at=message.created_at,
         ))
 
 
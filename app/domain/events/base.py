@@ -1,8 +1,12 @@
 from abc import ABC
 from dataclasses import dataclass, field
-from uuid import uuid4, UUID
+from datetime import datetime
+from uuid import UUID
+
+from app.domain.ids import new_id
 
 
 @dataclass
 class BaseEvent(ABC):
-    event_id: UUID = field(default_factory=uuid4, kw_only=True)
+    event_id: UUID = field(default_factory=new_id, kw_only=True)
+    occurred_at: datetime = field(default_factory=datetime.now, kw_only=True)
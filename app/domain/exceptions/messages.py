@@ -30,3 +30,12 @@ class EmptyTextException(ApplicationException):
     @property
     def message(self):
         return 'Текст не может быть пустым'
+
+
+@dataclass(eq=False)
+class InvalidCursorException(ApplicationException):
+    cursor: str
+
+    @property
+    def message(self):
+        return f'Некорректный курсор пагинации "{self.cursor[:255]}"'
@@ -0,0 +1,81 @@
+"""Identifier generation for entities and events.
+
+Ids are UUIDv7 by default (RFC 9562): a 48-bit Unix millisecond timestamp,
+a 12-bit counter and 62 random bits. They sort by creation time both as
+UUIDs and as their canonical strings, so stores that index ``oid`` append
+at the end of the index instead of writing to random pages. The generator
+is pluggable through ``set_id_generator``.
+"""
+import random
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from typing import Protocol
+
+_COUNTER_MAX = 0xFFF
+_RANDOM_MASK = (1 << 62) - 1
+_VERSION_AND_VARIANT = (0x7 << 76) | (0b10 << 62)
+
+# The random part only has to keep ids from different nodes apart, so the
+# module-level Mersenne Twister (seeded from os.urandom and reseeded in forked
+# children) is used instead of a system call per id.
+_random_bits = random.getrandbits
+
+
+class IdGenerator(Protocol):
+    def __call__(self) -> uuid.UUID:
+        ...
+
+
+class UUID7Generator:
+    """Monotonic UUIDv7 generator.
+
+    Within one millisecond the counter is incremented, starting from a
+    random value below 2048 so that there is room for at least 2048 ids.
+    When it overflows, or the clock goes backwards, the timestamp part is
+    advanced past the last issued one, so ids never repeat or go back.
+    """
+
+    __slots__ = ("_clock", "_lock", "_last_ms", "_counter")
+
+    def __init__(self, clock: Callable[[], int] = time.time_ns) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def __call__(self) -> uuid.UUID:
+        now_ms = self._clock() // 1_000_000
+        random_bits = _random_bits(74)
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._counter = random_bits >> 63
+            elif self._counter < _COUNTER_MAX:
+                self._counter += 1
+            else:
+                self._last_ms += 1
+                self._counter = 0
+            value = (self._last_ms << 80) | (self._counter << 64)
+
+        identifier = object.__new__(uuid.UUID)
+        object.__setattr__(identifier, "int", value | _VERSION_AND_VARIANT | (random_bits & _RANDOM_MASK))
+        object.__setattr__(identifier, "is_safe", uuid.SafeUUID.unknown)
+        return identifier
+
+
+_generator: IdGenerator = UUID7Generator()
+
+
+def set_id_generator(generator: IdGenerator) -> None:
+    global _generator
+    _generator = generator
+
+
+def new_id() -> uuid.UUID:
+    return _generator()
+
+
+def new_oid() -> str:
+    return str(_generator())
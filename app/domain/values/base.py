@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Generic, TypeVar, Any
 
 VT = TypeVar('VT', bound=Any)
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseValueObject(ABC, Generic[VT]):
     value: VT
 
@@ -0,0 +1,44 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.domain.exceptions.messages import InvalidCursorException
+from app.domain.values.base import BaseValueObject
+
+_SEPARATOR = '|'
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor(BaseValueObject):
+    """Opaque keyset cursor pointing at an entity's ``(created_at, oid)``."""
+
+    value: str
+
+    @classmethod
+    def for_entity(cls, entity) -> 'Cursor':
+        return cls.for_key(entity.created_at, entity.oid)
+
+    @classmethod
+    def for_key(cls, moment: datetime, oid: str) -> 'Cursor':
+        raw = f'{moment.isoformat()}{_SEPARATOR}{oid}'
+        return cls(value=urlsafe_b64encode(raw.encode()).decode().rstrip('='))
+
+    def validate(self):
+        self.as_key()
+
+    def as_key(self) -> tuple[datetime, str]:
+        try:
+            padded = self.value + '=' * (-len(self.value) % 4)
+            created_at, oid = urlsafe_b64decode(padded).decode().split(_SEPARATOR, 1)
+            moment = datetime.fromisoformat(created_at)
+        except (BinasciiError, UnicodeDecodeError, ValueError) as exc:
+            raise InvalidCursorException(self.value) from exc
+        # Stored keys are naive, and comparing them with an aware datetime
+        # raises TypeError; cursors issued here never carry an offset.
+        if moment.tzinfo is not None:
+            raise InvalidCursorException(self.value)
+        return moment, oid
+
+    def as_generic_type(self) -> str:
+        return str(self.value)
@@ -10,7 +10,7 @@ from app.domain.values.base import BaseValueObject
 MAX_TEXT_LENGTH = 4000
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Text(BaseValueObject):
     value: str
 
@@ -25,7 +25,7 @@ class Text(BaseValueObject):
         return str(self.value)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Title(BaseValueObject):
     def validate(self):
         if not self.value:
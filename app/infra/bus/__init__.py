@@ -0,0 +1 @@
+"""Cross-process fan-out of domain events for multi-node deployments."""
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import os
+import socket
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+from app.domain.events.base import BaseEvent
+from app.infra.serialization.codecs import JSONCodec
+from app.infra.serialization.events import event_from_envelope, event_to_envelope
+
+logger = logging.getLogger(__name__)
+
+_JSON_CODEC = JSONCodec()
+
+# Frames are single lines; allow message texts well beyond the default 64 KiB.
+_FRAME_LIMIT = 1024 * 1024
+
+EventDispatch = Callable[[BaseEvent], Awaitable[Any]]
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class EventBus(Protocol):
+    """Delivers events published on one node to every other node.
+
+    Events a node publishes itself are never dispatched back to it: the
+    origin has already handled them in-process.
+    """
+
+    node_id: str
+
+    async def start(self, dispatch: EventDispatch) -> None:
+        ...
+
+    async def publish(self, events: list[BaseEvent]) -> None:
+        ...
+
+    async def stop(self) -> None:
+        ...
+
+
+def encode_frame(node_id: str, event: BaseEvent) -> bytes:
+    return _JSON_CODEC.encode({"node": node_id, "event": event_to_envelope(event)}) + b"\n"
+
+
+def decode_frame(frame: bytes) -> tuple[str, BaseEvent]:
+    payload = _JSON_CODEC.decode(frame)
+    return payload["node"], event_from_envelope(payload["event"])
+
+
+@dataclass(eq=False)
+class UnixSocketBusHub:
+    """Relays newline-delimited frames between the nodes of one host.
+
+    Every frame is forwarded to all connected nodes. A node whose socket
+    buffer grows beyond ``max_buffer_bytes`` is disconnected instead of
+    letting the hub's memory grow; it reconnects and re-fetches state.
+    """
+
+    path: str
+    max_buffer_bytes: int = 8 * 1024 * 1024
+    _server: asyncio.AbstractServer | None = field(default=None, init=False)
+    _writers: set[asyncio.StreamWriter] = field(default_factory=set, init=False)
+
+    async def start(self) -> None:
+        with suppress(FileNotFoundError):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path, limit=_FRAME_LIMIT)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while frame := await reader.readline():
+                for peer in list(self._writers):
+                    if peer.transport.get_write_buffer_size() > self.max_buffer_bytes:
+                        logger.warning("Disconnecting a bus node that stopped reading")
+                        self._writers.discard(peer)
+                        peer.close()
+                        continue
+                    peer.write(frame)
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+@dataclass(eq=False)
+class UnixSocketEventBus:
+    """Event bus client for ``UnixSocketBusHub``, for nodes on one host.
+
+    It stands in for a broker in tests and single-host multi-worker setups.
+    Delivery is best effort: events published while the hub is unreachable
+    are dropped, and the connection is retried every ``reconnect_interval``.
+    """
+
+    path: str
+    node_id: str = field(default_factory=default_node_id)
+    reconnect_interval: float = 1.0
+    _writer: asyncio.StreamWriter | None = field(default=None, init=False)
+    _reader_task: asyncio.Task | None = field(default=None, init=False)
+
+    async def start(self, dispatch: EventDispatch) -> None:
+        connected = asyncio.get_running_loop().create_future()
+        self._reader_task = asyncio.create_task(self._read_forever(dispatch, connected))
+        # Wait for the first connection attempt so early events are not lost.
+        await connected
+
+    async def publish(self, events: list[BaseEvent]) -> None:
+        writer = self._writer
+        if writer is None:
+            logger.warning("Event bus is disconnected, dropping %s events", len(events))
+            return
+        writer.writelines(encode_frame(self.node_id, event) for event in events)
+        await writer.drain()
+
+    async def stop(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reader_task
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _read_forever(self, dispatch: EventDispatch, connected: asyncio.Future) -> None:
+        while True:
+            try:
+                reader, self._writer = await asyncio.open_unix_connection(self.path, limit=_FRAME_LIMIT)
+            except OSError as exc:
+                logger.warning("Event bus hub %s is unreachable: %s", self.path, exc)
+            else:
+                if not connected.done():
+                    connected.set_result(None)
+                await self._pump(reader, dispatch)
+                self._writer = None
+            if not connected.done():
+                connected.set_result(None)
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def _pump(self, reader: asyncio.StreamReader, dispatch: EventDispatch) -> None:
+        try:
+            while frame := await reader.readline():
+                try:
+                    node_id, event = decode_frame(frame)
+                    if node_id != self.node_id:
+                        await dispatch(event)
+                except Exception:
+                    logger.exception("Handling a bus frame failed")
+        except ConnectionError:
+            pass
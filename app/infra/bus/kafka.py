@@ -0,0 +1,84 @@
+import asyncio
+from contextlib import suppress
+from typing import Any
+
+from app.domain.events.base import BaseEvent
+from app.infra.bus.events import EventDispatch, default_node_id
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.kafka.consumer import KafkaEventConsumer
+from app.infra.kafka.producer import KafkaEventProducer
+
+
+class _BusProducer(KafkaEventProducer):
+    def __init__(self, config: KafkaBrokerConfig, node_id: str, client: Any | None = None) -> None:
+        super().__init__(config, client)
+        self._node_id = node_id.encode()
+
+    def _topic_for(self, event: BaseEvent) -> str:
+        return self._config.bus_topic
+
+    def _headers_for(self, event: BaseEvent) -> list[tuple[str, bytes]]:
+        return [*super()._headers_for(event), ("node-id", self._node_id)]
+
+
+class _BusConsumer(KafkaEventConsumer):
+    def __init__(self, *args: Any, node_id: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._node_id = node_id.encode()
+        # No consumer group: every node reads all partitions and nothing is
+        # committed, so restarts leave no abandoned groups on the broker.
+        self._group_id = None
+
+    async def _process_record(self, record: Any) -> None:
+        if dict(record.headers or ()).get("node-id") == self._node_id:
+            return
+        await super()._process_record(record)
+
+
+class KafkaEventBus:
+    """Event bus over the ``<prefix>.bus`` Kafka topic.
+
+    Each node reads every partition of the topic without a consumer group,
+    starting from the latest offset, so every node sees every event
+    published while it runs. ``node_id`` only tells a node's own events
+    apart and has to be unique among the running nodes.
+    """
+
+    def __init__(
+        self,
+        config: KafkaBrokerConfig,
+        node_id: str | None = None,
+        producer_client: Any | None = None,
+        consumer_client: Any | None = None,
+    ) -> None:
+        self.node_id = node_id or default_node_id()
+        self._config = config
+        self._producer = _BusProducer(config, self.node_id, client=producer_client)
+        self._consumer_client = consumer_client
+        self._consumer: _BusConsumer | None = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, dispatch: EventDispatch) -> None:
+        self._consumer = _BusConsumer(
+            self._config,
+            dispatch,
+            client=self._consumer_client,
+            topics=[self._config.bus_topic],
+            auto_offset_reset="latest",
+            node_id=self.node_id,
+        )
+        self._task = asyncio.create_task(self._consumer.run())
+
+    async def publish(self, events: list[BaseEvent]) -> None:
+        await self._producer.publish_batch(events)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._consumer is not None:
+            await self._consumer.stop()
+            self._consumer = None
+        await self._producer.stop()
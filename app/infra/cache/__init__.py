@@ -0,0 +1 @@
+"""Serialized HTTP responses cached between domain events."""
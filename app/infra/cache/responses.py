@@ -0,0 +1,121 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+CHAT_LIST_TAG = "chats"
+CHAT_ACTIVITY_LIST_TAG = "chats:activity"
+
+
+def chat_tag(chat_oid: str) -> str:
+    return f"chat:{chat_oid}"
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: tuple[tuple[str, str], ...] = ()
+    tags: tuple[str, ...] = ()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers)
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+@dataclass(eq=False)
+class ResponseCache:
+    """LRU cache of serialized response bodies under a byte budget.
+
+    Entries are grouped by tag (one per chat, one for each kind of list
+    page) so an event invalidates exactly the responses it can change; a
+    list page is also filed under the chats it shows through
+    ``related_tags``. A fill computed before an invalidation of any of its
+    tags is discarded: callers take ``version()`` before reading the
+    repository and pass it to ``put``. The version counts invalidations of
+    all tags, so it also dates related tags that are only known after the
+    read. ``max_bytes=0`` disables storage while still producing ETags.
+    """
+
+    max_bytes: int = 16 * 1024 * 1024
+    stats: ResponseCacheStats = field(default_factory=ResponseCacheStats, kw_only=True)
+    _entries: OrderedDict[str, CachedResponse] = field(default_factory=OrderedDict, kw_only=True)
+    _keys_by_tag: dict[str, set[str]] = field(default_factory=dict, kw_only=True)
+    _versions: dict[str, int] = field(default_factory=dict, kw_only=True)
+    _invalidations: int = field(default=0, kw_only=True)
+    _size: int = field(default=0, kw_only=True)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    def version(self) -> int:
+        return self._invalidations
+
+    def put(
+        self,
+        key: str,
+        body: bytes,
+        *,
+        tag: str,
+        version: int,
+        headers: tuple[tuple[str, str], ...] = (),
+        related_tags: tuple[str, ...] = (),
+    ) -> CachedResponse:
+        tags = (tag, *related_tags)
+        entry = CachedResponse(body=body, etag=make_etag(body), headers=headers, tags=tags)
+        if entry.size > self.max_bytes or any(self._versions.get(name, 0) > version for name in tags):
+            return entry
+
+        self._remove(key)
+        self._entries[key] = entry
+        for name in tags:
+            self._keys_by_tag.setdefault(name, set()).add(key)
+        self._size += entry.size
+        while self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+        return entry
+
+    def invalidate(self, tag: str) -> None:
+        self._invalidations += 1
+        self._versions[tag] = self._invalidations
+        for key in self._keys_by_tag.pop(tag, ()):
+            self._remove(key)
+            self.stats.invalidations += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= entry.size
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
@@ -12,3 +12,37 @@ class KafkaBrokerConfig:
         ],
     )
     topic_prefix: str = os.getenv("KAFKA_TOPIC_PREFIX", "chat")
+    # "sync" waits for the broker inside the request, "batch" buffers events
+    # and flushes them from a background task.
+    publish_mode: str = os.getenv("KAFKA_PUBLISH_MODE", "sync")
+    # "json" (orjson when installed) or "msgpack".
+    codec: str = os.getenv("KAFKA_CODEC", "json")
+    compression_type: str | None = os.getenv("KAFKA_COMPRESSION_TYPE") or None
+    linger_ms: int = int(os.getenv("KAFKA_LINGER_MS", "5"))
+    max_batch_size: int = int(os.getenv("KAFKA_MAX_BATCH_SIZE", "16384"))
+    flush_batch_size: int = int(os.getenv("KAFKA_FLUSH_BATCH_SIZE", "500"))
+    buffer_size: int = int(os.getenv("KAFKA_BUFFER_SIZE", "10000"))
+    # Extra attempts for events a flush could not deliver, with the backoff
+    # doubling from flush_retry_backoff_ms after each one.
+    flush_retries: int = int(os.getenv("KAFKA_FLUSH_RETRIES", "3"))
+    flush_retry_backoff_ms: int = int(os.getenv("KAFKA_FLUSH_RETRY_BACKOFF_MS", "100"))
+    consumer_group: str = os.getenv("KAFKA_CONSUMER_GROUP", "chat-projections")
+    consumer_batch_size: int = int(os.getenv("KAFKA_CONSUMER_BATCH_SIZE", "500"))
+    consumer_poll_timeout_ms: int = int(os.getenv("KAFKA_CONSUMER_POLL_TIMEOUT_MS", "1000"))
+    # Records of one partition handled at the same time; 1 keeps them ordered.
+    partition_concurrency: int = int(os.getenv("KAFKA_PARTITION_CONCURRENCY", "1"))
+    consumer_max_retries: int = int(os.getenv("KAFKA_CONSUMER_MAX_RETRIES", "3"))
+
+    @property
+    def producer_linger_ms(self) -> int:
+        # In sync mode every request waits for its own send, so lingering
+        # would only add to the request latency.
+        return self.linger_ms if self.publish_mode == "batch" else 0
+
+    @property
+    def dead_letter_topic(self) -> str:
+        return f"{self.topic_prefix}.dead-letter"
+
+    @property
+    def bus_topic(self) -> str:
+        return f"{self.topic_prefix}.bus"
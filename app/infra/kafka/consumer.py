@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from app.domain.events.base import BaseEvent
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.serialization.codecs import EventCodec, get_codec
+from app.infra.serialization.events import EVENT_TYPES, event_from_envelope
+
+logger = logging.getLogger(__name__)
+
+
+class KafkaEventConsumer:
+    """Consumes chat events in batches and dispatches them to handlers.
+
+    Each ``getmany`` batch is processed partition by partition in parallel;
+    inside a partition at most ``partition_concurrency`` records are handled
+    at once. Offsets are committed after the whole batch is processed, so a
+    crash replays the batch instead of losing it. Records that cannot be
+    decoded or keep failing after ``consumer_max_retries`` are forwarded to
+    the dead-letter topic and skipped.
+    """
+
+    def __init__(
+        self,
+        config: KafkaBrokerConfig,
+        dispatch: Callable[[BaseEvent], Awaitable[Any]],
+        client: Any | None = None,
+        dead_letter_producer: Any | None = None,
+        topics: list[str] | None = None,
+        auto_offset_reset: str = "earliest",
+    ) -> None:
+        self._config = config
+        self._dispatch = dispatch
+        self._consumer: Any | None = client
+        self._dead_letter_producer: Any | None = dead_letter_producer
+        self._topics = topics or [
+            f"{config.topic_prefix}.{event_type}" for event_type in EVENT_TYPES
+        ]
+        self._auto_offset_reset = auto_offset_reset
+        self._group_id: str | None = config.consumer_group
+        self._stopping = False
+        self._codecs: dict[str, EventCodec] = {}
+
+    async def run(self) -> None:
+        consumer = await self._get_consumer()
+        while not self._stopping:
+            await self.consume_batch(consumer)
+
+    async def consume_batch(self, consumer: Any | None = None) -> int:
+        consumer = consumer or await self._get_consumer()
+        batches = await consumer.getmany(
+            timeout_ms=self._config.consumer_poll_timeout_ms,
+            max_records=self._config.consumer_batch_size,
+        )
+        if not batches:
+            return 0
+
+        async with asyncio.TaskGroup() as task_group:
+            for records in batches.values():
+                task_group.create_task(self._process_partition(records))
+        if self._group_id is not None:
+            await consumer.commit()
+        return sum(len(records) for records in batches.values())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._consumer is not None:
+            await self._consumer.stop()
+            self._consumer = None
+        if self._dead_letter_producer is not None:
+            await self._dead_letter_producer.stop()
+            self._dead_letter_producer = None
+
+    async def _process_partition(self, records: list[Any]) -> None:
+        if self._config.partition_concurrency <= 1:
+            for record in records:
+                await self._process_record(record)
+            return
+
+        semaphore = asyncio.Semaphore(self._config.partition_concurrency)
+
+        async def process(record: Any) -> None:
+            async with semaphore:
+                await self._process_record(record)
+
+        async with asyncio.TaskGroup() as task_group:
+            for record in records:
+                task_group.create_task(process(record))
+
+    async def _process_record(self, record: Any) -> None:
+        try:
+            event = self._deserialize_event(record)
+        except Exception as exc:
+            await self._send_to_dead_letter(record, exc)
+            return
+
+        for attempt in range(1, max(self._config.consumer_max_retries, 1) + 1):
+            try:
+                await self._dispatch(event)
+                return
+            except Exception as exc:
+                logger.warning(
+                    "Handling %s@%s:%s failed (attempt %s)",
+                    record.topic,
+                    record.partition,
+                    record.offset,
+                    attempt,
+                    exc_info=exc,
+                )
+                error = exc
+        await self._send_to_dead_letter(record, error)
+
+    async def _send_to_dead_letter(self, record: Any, error: Exception) -> None:
+        logger.error(
+            "Moving %s@%s:%s to %s",
+            record.topic,
+            record.partition,
+            record.offset,
+            self._config.dead_letter_topic,
+        )
+        producer = await self._get_dead_letter_producer()
+        await producer.send_and_wait(
+            self._config.dead_letter_topic,
+            record.value,
+            key=record.key,
+            headers=[
+                ("source-topic", record.topic.encode()),
+                ("source-partition", str(record.partition).encode()),
+                ("source-offset", str(record.offset).encode()),
+                ("error", repr(error).encode()),
+            ],
+        )
+
+    def _deserialize_event(self, record: Any) -> BaseEvent:
+        # Records without a content-type header predate codecs and are JSON.
+        content_type = dict(record.headers or ()).get("content-type", b"application/json").decode()
+        codec = self._codecs.get(content_type)
+        if codec is None:
+            codec = self._codecs[content_type] = get_codec(content_type)
+        return event_from_envelope(codec.decode(record.value))
+
+    async def _get_consumer(self) -> Any:
+        if self._consumer is None:
+            try:
+                from aiokafka import AIOKafkaConsumer
+            except ImportError as exc:
+                raise RuntimeError(
+                    "Kafka support requires the aiokafka package. "
+                    "Install project dependencies or disable KAFKA_ENABLED."
+                ) from exc
+
+            self._consumer = AIOKafkaConsumer(
+                *self._topics,
+                bootstrap_servers=self._config.bootstrap_servers,
+                group_id=self._group_id,
+                enable_auto_commit=False,
+                auto_offset_reset=self._auto_offset_reset,
+            )
+            await self._consumer.start()
+        return self._consumer
+
+    async def _get_dead_letter_producer(self) -> Any:
+        if self._dead_letter_producer is None:
+            from aiokafka import AIOKafkaProducer
+
+            self._dead_letter_producer = AIOKafkaProducer(
+                bootstrap_servers=self._config.bootstrap_servers,
+            )
+            await self._dead_letter_producer.start()
+        return self._dead_letter_producer
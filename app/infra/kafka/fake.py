@@ -0,0 +1,155 @@
+import asyncio
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple
+
+
+class FakeTopicPartition(NamedTuple):
+    topic: str
+    partition: int
+
+
+@dataclass(frozen=True)
+class FakeConsumerRecord:
+    topic: str
+    partition: int
+    offset: int
+    key: bytes | None
+    value: bytes
+    headers: tuple[tuple[str, bytes], ...] = ()
+
+
+@dataclass(eq=False)
+class FakeKafkaBroker:
+    """In-memory stand-in for a Kafka cluster.
+
+    It implements the subset of the aiokafka producer and consumer API this
+    project uses, with per-group committed offsets, so consumers can be
+    tested offline including redelivery after a missing commit.
+    """
+
+    partitions: int = 1
+    _logs: dict[FakeTopicPartition, list[FakeConsumerRecord]] = field(
+        default_factory=lambda: defaultdict(list),
+    )
+    _committed: dict[tuple[str, FakeTopicPartition], int] = field(default_factory=dict)
+    _appended: asyncio.Event | None = field(default=None)
+
+    def producer(self) -> 'FakeKafkaProducer':
+        return FakeKafkaProducer(broker=self)
+
+    def consumer(self, *topics: str, group_id: str | None) -> 'FakeKafkaConsumer':
+        return FakeKafkaConsumer(broker=self, topics=topics, group_id=group_id)
+
+    def records(self, topic: str) -> list[FakeConsumerRecord]:
+        return [
+            record
+            for partition in range(self.partitions)
+            for record in self._logs[FakeTopicPartition(topic, partition)]
+        ]
+
+    def append(
+        self,
+        topic: str,
+        value: bytes,
+        key: bytes | None = None,
+        headers: tuple[tuple[str, bytes], ...] = (),
+    ) -> FakeConsumerRecord:
+        partition = zlib.crc32(key) % self.partitions if key is not None else 0
+        log = self._logs[FakeTopicPartition(topic, partition)]
+        record = FakeConsumerRecord(
+            topic=topic,
+            partition=partition,
+            offset=len(log),
+            key=key,
+            value=value,
+            headers=tuple(headers),
+        )
+        log.append(record)
+        if self._appended is not None:
+            self._appended.set()
+        return record
+
+    async def wait_for_records(self, timeout: float) -> None:
+        if self._appended is None:
+            self._appended = asyncio.Event()
+        try:
+            async with asyncio.timeout(timeout):
+                await self._appended.wait()
+        except TimeoutError:
+            pass
+        self._appended.clear()
+
+
+@dataclass(eq=False)
+class FakeKafkaProducer:
+    broker: FakeKafkaBroker
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def send(self, topic: str, value: bytes, key: bytes | None = None, headers=None) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(self.broker.append(topic, value, key, tuple(headers or ())))
+        return future
+
+    async def send_and_wait(self, topic: str, value: bytes, key: bytes | None = None, headers=None) -> Any:
+        return await (await self.send(topic, value, key, headers))
+
+
+@dataclass(eq=False)
+class FakeKafkaConsumer:
+    broker: FakeKafkaBroker
+    topics: tuple[str, ...]
+    group_id: str | None
+    _positions: dict[FakeTopicPartition, int] = field(default_factory=dict)
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    async def getmany(
+        self,
+        timeout_ms: int = 0,
+        max_records: int | None = None,
+    ) -> dict[FakeTopicPartition, list[FakeConsumerRecord]]:
+        batch = self._poll(max_records)
+        if not batch and timeout_ms:
+            await self.broker.wait_for_records(timeout_ms / 1000)
+            batch = self._poll(max_records)
+        return batch
+
+    async def commit(self, offsets: dict[FakeTopicPartition, int] | None = None) -> None:
+        if self.group_id is None:
+            raise RuntimeError("Cannot commit offsets without a consumer group")
+        for partition, position in (offsets or self._positions).items():
+            self.broker._committed[(self.group_id, partition)] = position
+
+    def _poll(self, max_records: int | None) -> dict[FakeTopicPartition, list[FakeConsumerRecord]]:
+        batch = {}
+        remaining = max_records
+        for topic in self.topics:
+            for partition_number in range(self.broker.partitions):
+                partition = FakeTopicPartition(topic, partition_number)
+                position = self._positions.get(
+                    partition,
+                    self.broker._committed.get((self.group_id, partition), 0),
+                )
+                log = self.broker._logs[partition]
+                stop = len(log) if remaining is None else min(len(log), position + remaining)
+                if stop <= position:
+                    continue
+
+                batch[partition] = log[position:stop]
+                self._positions[partition] = stop
+                if remaining is not None:
+                    remaining -= stop - position
+                    if remaining == 0:
+                        return batch
+        return batch
@@ -1,16 +1,27 @@
-import json
-from dataclasses import asdict, is_dataclass
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass
 from typing import Any, Protocol
 
 from app.domain.events.base import BaseEvent
 
 from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.metrics.registry import NOOP_METRICS, SIZE_BUCKETS, Metrics
+from app.infra.serialization.codecs import get_codec
+from app.infra.serialization.events import event_to_envelope, schema_version_of
+
+logger = logging.getLogger(__name__)
 
 
 class EventPublisher(Protocol):
     async def publish(self, event: BaseEvent) -> None:
         ...
 
+    async def publish_batch(self, events: list[BaseEvent]) -> None:
+        ...
+
     async def stop(self) -> None:
         ...
 
@@ -19,20 +30,72 @@ class NoopEventPublisher:
     async def publish(self, event: BaseEvent) -> None:
         return None
 
+    async def publish_batch(self, events: list[BaseEvent]) -> None:
+        return None
+
     async def stop(self) -> None:
         return None
 
 
 class KafkaEventProducer:
-    def __init__(self, config: KafkaBrokerConfig) -> None:
+    def __init__(
+        self,
+        config: KafkaBrokerConfig,
+        client: Any | None = None,
+        metrics: Metrics = NOOP_METRICS,
+    ) -> None:
         self._config = config
-        self._producer: Any | None = None
+        self._producer: Any | None = client
+        self._codec = get_codec(config.codec)
+        self._publish_duration = metrics.histogram(
+            "chat_kafka_publish_duration_seconds",
+            "Time until the broker acknowledged one publish call or flush.",
+            ("mode",),
+        )
+        self._publish_size = metrics.histogram(
+            "chat_kafka_publish_batch_size",
+            "Events sent to the broker per publish call or flush.",
+            ("mode",),
+            buckets=SIZE_BUCKETS,
+        )
+        self._publish_errors = metrics.counter(
+            "chat_kafka_publish_errors_total",
+            "Events the broker did not acknowledge.",
+            ("mode",),
+        )
 
     async def publish(self, event: BaseEvent) -> None:
-        producer = await self._get_producer()
-        topic = self._topic_for(event)
-        payload = self._serialize_event(event)
-        await producer.send_and_wait(topic, payload)
+        started = time.perf_counter()
+        try:
+            producer = await self._get_producer()
+            topic = self._topic_for(event)
+            payload = self._serialize_event(event)
+            await producer.send_and_wait(topic, payload, headers=self._headers_for(event))
+        except Exception:
+            self._publish_errors.labels("single").inc()
+            raise
+        finally:
+            self._observe_publish("single", started, 1)
+
+    async def publish_batch(self, events: list[BaseEvent]) -> None:
+        """Send all events before waiting, so they share producer batches."""
+        started = time.perf_counter()
+        try:
+            producer = await self._get_producer()
+            deliveries = [
+                await producer.send(
+                    self._topic_for(event),
+                    self._serialize_event(event),
+                    headers=self._headers_for(event),
+                )
+                for event in events
+            ]
+            await asyncio.gather(*deliveries)
+        except Exception:
+            self._publish_errors.labels("batch").inc(len(events))
+            raise
+        finally:
+            self._observe_publish("batch", started, len(events))
 
     async def stop(self) -> None:
         if self._producer is None:
@@ -52,16 +115,170 @@ class KafkaEventProducer:
 
             self._producer = AIOKafkaProducer(
                 bootstrap_servers=self._config.bootstrap_servers,
+                compression_type=self._config.compression_type,
+                linger_ms=self._config.producer_linger_ms,
+                max_batch_size=self._config.max_batch_size,
             )
             await self._producer.start()
         return self._producer
 
+    def _observe_publish(self, mode: str, started: float, size: int) -> None:
+        self._publish_duration.labels(mode).observe(time.perf_counter() - started)
+        self._publish_size.labels(mode).observe(size)
+
     def _topic_for(self, event: BaseEvent) -> str:
         return f"{self._config.topic_prefix}.{event.__class__.__name__}"
 
     def _serialize_event(self, event: BaseEvent) -> bytes:
-        payload = {
-            "type": event.__class__.__name__,
-            "payload": asdict(event) if is_dataclass(event) else event.__dict__,
-        }
-        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        return self._codec.encode(event_to_envelope(event))
+
+    def _headers_for(self, event: BaseEvent) -> list[tuple[str, bytes]]:
+        return [
+            ("event-type", event.__class__.__name__.encode()),
+            ("schema-version", str(schema_version_of(event)).encode()),
+            ("content-type", self._codec.content_type.encode()),
+        ]
+
+
+@dataclass
+class PublisherStats:
+    published_events: int = 0
+    failed_events: int = 0
+    flushes: int = 0
+    last_flush_seconds: float = 0.0
+    total_flush_seconds: float = 0.0
+
+
+class BufferedKafkaEventProducer(KafkaEventProducer):
+    """Publishes events from a bounded in-process buffer in batches.
+
+    ``publish`` only enqueues the event, so requests do not wait for the
+    broker. A background task flushes the buffer once ``flush_batch_size``
+    events are collected or ``linger_ms`` has passed since the first one.
+    When the buffer is full ``publish`` waits for free space, which slows
+    producers down instead of growing memory. ``stop`` drains the buffer
+    before closing the Kafka client.
+
+    Events a flush could not deliver are sent again up to ``flush_retries``
+    times with a growing backoff; the buffer keeps filling meanwhile, so a
+    broker outage slows producers down as well. Events still unacknowledged
+    after that are logged, counted and dropped: batch mode does not
+    guarantee delivery, and a crash loses whatever is still buffered.
+    """
+
+    def __init__(
+        self,
+        config: KafkaBrokerConfig,
+        client: Any | None = None,
+        metrics: Metrics = NOOP_METRICS,
+    ) -> None:
+        super().__init__(config, client, metrics)
+        self._queue: asyncio.Queue[BaseEvent] | None = None
+        self._flusher: asyncio.Task | None = None
+        self.stats = PublisherStats()
+        metrics.gauge(
+            "chat_kafka_buffer_depth",
+            "Events waiting in the publish buffer.",
+        ).labels().set_function(lambda: self.queue_depth)
+
+    @property
+    def queue_depth(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    async def publish(self, event: BaseEvent) -> None:
+        if self._flusher is None:
+            self._queue = asyncio.Queue(maxsize=self._config.buffer_size)
+            self._flusher = asyncio.create_task(self._flush_forever())
+        await self._queue.put(event)
+
+    async def publish_batch(self, events: list[BaseEvent]) -> None:
+        for event in events:
+            await self.publish(event)
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            await self._queue.join()
+            self._flusher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flusher
+            self._flusher = None
+            self._queue = None
+        await super().stop()
+
+    async def _flush_forever(self) -> None:
+        loop = asyncio.get_running_loop()
+        linger = self._config.linger_ms / 1000
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + linger
+            while len(batch) < self._config.flush_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: list[BaseEvent]) -> None:
+        pending = batch
+        for attempt in range(self._config.flush_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._config.flush_retry_backoff_ms / 1000 * 2 ** (attempt - 1))
+            pending = await self._send(pending)
+            if not pending:
+                break
+
+        if pending:
+            logger.error(
+                "Dropping %s events after %s flush attempts",
+                len(pending),
+                self._config.flush_retries + 1,
+            )
+            self.stats.failed_events += len(pending)
+            self._publish_errors.labels("flush").inc(len(pending))
+        self.stats.published_events += len(batch) - len(pending)
+
+    async def _send(self, batch: list[BaseEvent]) -> list[BaseEvent]:
+        """Send ``batch`` once and return the events the broker did not acknowledge."""
+        started = time.perf_counter()
+        try:
+            producer = await self._get_producer()
+            deliveries = [
+                await producer.send(
+                    self._topic_for(event),
+                    self._serialize_event(event),
+                    headers=self._headers_for(event),
+                )
+                for event in batch
+            ]
+            results = await asyncio.gather(*deliveries, return_exceptions=True)
+        except Exception:
+            logger.warning("Failed to publish a batch of %s events", len(batch), exc_info=True)
+            return batch
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stats.flushes += 1
+            self.stats.last_flush_seconds = elapsed
+            self.stats.total_flush_seconds += elapsed
+            self._observe_publish("flush", started, len(batch))
+
+        failed = []
+        for event, result in zip(batch, results):
+            if isinstance(result, BaseException):
+                logger.warning("Failed to publish event %s", event.event_id, exc_info=result)
+                failed.append(event)
+        return failed
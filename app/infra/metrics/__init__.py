@@ -0,0 +1 @@
+"""In-process metrics rendered in the Prometheus text format."""
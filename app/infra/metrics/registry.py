@@ -0,0 +1,248 @@
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+# Seconds; covers in-memory calls (sub-millisecond) up to slow broker writes.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "function")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.function: Callable[[], float] | None = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the value from ``function`` at scrape time."""
+        self.function = function
+
+    def get(self) -> float:
+        return self.function() if self.function is not None else self.value
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        # Counts are per bucket here and made cumulative when rendered.
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+@dataclass(eq=False)
+class _Metric(ABC):
+    name: str
+    documentation: str
+    labelnames: tuple[str, ...] = ()
+    _children: dict[tuple[str, ...], object] = field(default_factory=dict, init=False)
+
+    kind = ""
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        ...
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in self._children.items():
+            yield from self._render_child(values, child)
+
+    @abstractmethod
+    def _render_child(self, values: tuple[str, ...], child) -> Iterable[str]:
+        ...
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def _render_child(self, values: tuple[str, ...], child: _CounterChild) -> Iterable[str]:
+        yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def _render_child(self, values: tuple[str, ...], child: _GaugeChild) -> Iterable[str]:
+        yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.get())}"
+
+
+@dataclass(eq=False)
+class Histogram(_Metric):
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+
+    kind = "histogram"
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def _render_child(self, values: tuple[str, ...], child: _HistogramChild) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip((*self.buckets, math.inf), child.counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"')
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+        yield f"{self.name}_count{labels} {child.count}"
+
+
+@dataclass(eq=False)
+class MetricsRegistry:
+    """Collects metrics and renders them in the Prometheus text format.
+
+    Metrics are created on first use and shared by name afterwards, so
+    several components may ask for the same metric. All updates happen on
+    the event loop thread and need no locking.
+    """
+
+    enabled = True
+    _metrics: dict[str, _Metric] = field(default_factory=dict, init=False)
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+    def _get_or_create(self, metric_class: type, name: str, documentation: str, labelnames, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = metric_class(name, documentation, tuple(labelnames), **kwargs)
+        elif not isinstance(metric, metric_class) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} is already registered with a different type or labels")
+        return metric
+
+
+class _NoopChild:
+    __slots__ = ()
+
+    def inc(self, amount: float = 1.0) -> None:
+        return None
+
+    def dec(self, amount: float = 1.0) -> None:
+        return None
+
+    def set(self, value: float) -> None:
+        return None
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        return None
+
+    def observe(self, value: float) -> None:
+        return None
+
+
+class _NoopMetric:
+    __slots__ = ()
+
+    def labels(self, *values: str) -> _NoopChild:
+        return _NOOP_CHILD
+
+
+_NOOP_CHILD = _NoopChild()
+_NOOP_METRIC = _NoopMetric()
+
+
+class NoopMetricsRegistry:
+    """Registry used when metrics are disabled; every update is a no-op."""
+
+    enabled = False
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> _NoopMetric:
+        return _NOOP_METRIC
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> _NoopMetric:
+        return _NOOP_METRIC
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> _NoopMetric:
+        return _NOOP_METRIC
+
+    def render(self) -> str:
+        return ""
+
+
+NOOP_METRICS = NoopMetricsRegistry()
+
+
+Metrics = MetricsRegistry | NoopMetricsRegistry
@@ -0,0 +1 @@
+"""MongoDB infrastructure components."""
@@ -0,0 +1,26 @@
+from functools import lru_cache
+from typing import Any
+
+from app.infra.mongo.config import MongoDBConfig
+
+
+@lru_cache
+def get_mongo_client(config: MongoDBConfig) -> Any:
+    """Return the process-wide pooled client for ``config``.
+
+    Motor clients own a connection pool, so one instance is shared by every
+    repository in the process instead of connecting per request.
+    """
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient
+    except ImportError as exc:
+        raise RuntimeError(
+            "MongoDB support requires the motor package. "
+            "Install project dependencies or set CHAT_REPOSITORY=memory."
+        ) from exc
+
+    return AsyncIOMotorClient(
+        config.uri,
+        maxPoolSize=config.max_pool_size,
+        minPoolSize=config.min_pool_size,
+    )
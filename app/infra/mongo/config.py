@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+import os
+
+
+@dataclass(frozen=True)
+class MongoDBConfig:
+    uri: str = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    database: str = os.getenv("MONGO_DATABASE", "chat")
+    chats_collection: str = os.getenv("MONGO_CHATS_COLLECTION", "chats")
+    messages_collection: str = os.getenv("MONGO_MESSAGES_COLLECTION", "messages")
+    max_pool_size: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    min_pool_size: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
@@ -0,0 +1 @@
+"""Durable hand-off of domain events between the write path and publishers."""
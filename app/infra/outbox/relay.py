@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.domain.events.base import BaseEvent
+from app.infra.outbox.stores import BaseOutboxStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class OutboxRelay:
+    """Background worker that moves events from the outbox to their handlers.
+
+    Records are fetched and dispatched in batches, so a handler such as
+    Kafka publishing sends a whole batch in one round trip. When a batch
+    fails its records are dispatched one by one, so a single bad record
+    does not hold back the others; failed records stay in the outbox and
+    are retried until the store's ``max_attempts`` is reached.
+    """
+
+    store: BaseOutboxStore
+    dispatch: Callable[[list[BaseEvent]], Awaitable[Any]]
+    batch_size: int = 100
+    poll_interval: float = 1.0
+    _task: asyncio.Task | None = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        # Deliver whatever was written before shutdown.
+        while await self.relay_batch():
+            pass
+
+    async def relay_batch(self) -> int:
+        records = await self.store.fetch_pending(self.batch_size)
+        if not records:
+            return 0
+        try:
+            await self.dispatch([record.event for record in records])
+        except Exception:
+            logger.exception("Failed to relay a batch of %d outbox records", len(records))
+        else:
+            await self.store.mark_done([record.record_id for record in records])
+            return len(records)
+
+        done, failed = [], []
+        for record in records:
+            try:
+                await self.dispatch([record.event])
+            except Exception:
+                logger.exception("Failed to relay outbox record %s", record.record_id)
+                failed.append(record.record_id)
+            else:
+                done.append(record.record_id)
+
+        if done:
+            await self.store.mark_done(done)
+        if failed:
+            await self.store.mark_failed(failed)
+        return len(done)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception:
+                logger.exception("Outbox relay iteration failed")
+                relayed = 0
+            if relayed < self.batch_size:
+                await self.store.wait_for_pending(self.poll_interval)
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from app.domain.events.base import BaseEvent
+from app.infra.serialization.codecs import JSONCodec
+from app.infra.serialization.events import event_from_envelope, event_to_envelope
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxRecord:
+    record_id: int
+    event: BaseEvent
+    attempts: int = 0
+
+
+@dataclass
+class BaseOutboxStore(ABC):
+    max_attempts: int = field(default=5, kw_only=True)
+    _pending_signal: asyncio.Event | None = field(default=None, init=False, repr=False)
+
+    @abstractmethod
+    async def add(self, events: Iterable[BaseEvent]) -> None:
+        ...
+
+    @abstractmethod
+    async def fetch_pending(self, limit: int) -> list[OutboxRecord]:
+        """Return the oldest unprocessed records with attempts left."""
+
+    @abstractmethod
+    async def mark_done(self, record_ids: Iterable[int]) -> None:
+        ...
+
+    @abstractmethod
+    async def mark_failed(self, record_ids: Iterable[int]) -> None:
+        ...
+
+    async def stop(self) -> None:
+        """Release resources; a no-op by default."""
+        return None
+
+    async def wait_for_pending(self, timeout: float) -> None:
+        """Sleep until new records are added or ``timeout`` expires."""
+        if self._pending_signal is None:
+            self._pending_signal = asyncio.Event()
+        # asyncio.timeout, unlike wait_for, never swallows a cancellation
+        # that races with the signal, so the relay can always be stopped.
+        try:
+            async with asyncio.timeout(timeout):
+                await self._pending_signal.wait()
+        except TimeoutError:
+            pass
+        self._pending_signal.clear()
+
+    def notify_pending(self) -> None:
+        """Wake the relay; repositories call it after committing new records."""
+        if self._pending_signal is not None:
+            self._pending_signal.set()
+
+
+@dataclass
+class MemoryOutboxStore(BaseOutboxStore):
+    _records: dict[int, OutboxRecord] = field(default_factory=dict, kw_only=True)
+    _next_id: int = field(default=1, kw_only=True)
+
+    async def add(self, events: Iterable[BaseEvent]) -> None:
+        for event in events:
+            self._records[self._next_id] = OutboxRecord(record_id=self._next_id, event=event)
+            self._next_id += 1
+        self.notify_pending()
+
+    async def fetch_pending(self, limit: int) -> list[OutboxRecord]:
+        pending = []
+        # Dicts keep insertion order, so records come out oldest first.
+        for record in self._records.values():
+            if record.attempts < self.max_attempts:
+                pending.append(record)
+                if len(pending) == limit:
+                    break
+        return pending
+
+    async def mark_done(self, record_ids: Iterable[int]) -> None:
+        for record_id in record_ids:
+            self._records.pop(record_id, None)
+
+    async def mark_failed(self, record_ids: Iterable[int]) -> None:
+        for record_id in record_ids:
+            record = self._records.get(record_id)
+            if record is None:
+                continue
+            record.attempts += 1
+            # Nothing reads an exhausted record again, so keeping it would
+            # only make every fetch scan further.
+            if record.attempts >= self.max_attempts:
+                del self._records[record_id]
+                logger.error(
+                    "Dropping outbox record %s after %s attempts: %r",
+                    record_id,
+                    record.attempts,
+                    record.event,
+                )
+
+
+@dataclass
+class SQLiteOutboxStore(BaseOutboxStore):
+    """Outbox persisted in a SQLite file.
+
+    Statements run in a worker thread, so disk I/O never blocks the event
+    loop. Processed records keep their row with ``processed_at`` set.
+    ``SQLiteChatRepository`` writes records through ``insert`` in the same
+    transaction as the chat data, so the file must be the chat database.
+
+    Several processes may relay from the same file: ``fetch_pending`` claims
+    the records it returns for ``claim_timeout`` seconds, so no other relay
+    publishes them meanwhile. A relay that dies mid-batch leaves its claim
+    to expire, and the records are then published again.
+    """
+
+    path: str
+    claim_timeout: float = field(default=30.0, kw_only=True)
+    _codec: JSONCodec = field(default_factory=JSONCodec, init=False, repr=False)
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    event_type TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    processed_at REAL,
+                    claimed_until REAL
+                )
+                """
+            )
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(outbox)")}
+            if "claimed_until" not in columns:
+                self._connection.execute("ALTER TABLE outbox ADD COLUMN claimed_until REAL")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_outbox_pending ON outbox (id) WHERE processed_at IS NULL"
+            )
+
+    async def add(self, events: Iterable[BaseEvent]) -> None:
+        await asyncio.to_thread(self._insert_sync, list(events))
+        self.notify_pending()
+
+    def insert(self, connection: sqlite3.Connection, events: Iterable[BaseEvent]) -> None:
+        """Write ``events`` inside the caller's open transaction on ``connection``."""
+        now = time.time()
+        connection.executemany(
+            "INSERT INTO outbox (event_type, payload, created_at) VALUES (?, ?, ?)",
+            [
+                (event.__class__.__name__, self._codec.encode(event_to_envelope(event)).decode(), now)
+                for event in events
+            ],
+        )
+
+    async def fetch_pending(self, limit: int) -> list[OutboxRecord]:
+        now = time.time()
+        rows = await asyncio.to_thread(
+            self._claim,
+            "UPDATE outbox SET claimed_until = ? WHERE id IN ("
+            "SELECT id FROM outbox WHERE processed_at IS NULL AND attempts < ? "
+            "AND (claimed_until IS NULL OR claimed_until < ?) ORDER BY id LIMIT ?"
+            ") RETURNING id, payload, attempts",
+            (now + self.claim_timeout, self.max_attempts, now, limit),
+        )
+        # RETURNING does not keep the order of the subquery.
+        return [
+            OutboxRecord(
+                record_id=record_id,
+                event=event_from_envelope(self._codec.decode(payload)),
+                attempts=attempts,
+            )
+            for record_id, payload, attempts in sorted(rows)
+        ]
+
+    async def mark_done(self, record_ids: Iterable[int]) -> None:
+        now = time.time()
+        await asyncio.to_thread(
+            self._execute_many,
+            "UPDATE outbox SET processed_at = ? WHERE id = ?",
+            [(now, record_id) for record_id in record_ids],
+        )
+
+    async def mark_failed(self, record_ids: Iterable[int]) -> None:
+        await asyncio.to_thread(
+            self._execute_many,
+            "UPDATE outbox SET attempts = attempts + 1, claimed_until = NULL WHERE id = ?",
+            [(record_id,) for record_id in record_ids],
+        )
+
+    async def stop(self) -> None:
+        await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _insert_sync(self, events: list[BaseEvent]) -> None:
+        with self._lock, self._connection:
+            self.insert(self._connection, events)
+
+    def _execute_many(self, statement: str, rows: list[tuple]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(statement, rows)
+
+    def _claim(self, statement: str, parameters: tuple) -> list[tuple]:
+        with self._lock, self._connection:
+            return self._connection.execute(statement, parameters).fetchall()
@@ -0,0 +1 @@
+"""In-process push fan-out for streaming endpoints."""
@@ -0,0 +1,78 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from app.domain.events.base import BaseEvent
+from app.infra.serialization.codecs import JSONCodec
+from app.infra.serialization.events import event_to_dict
+
+INBOX_TOPIC = "inbox"
+
+_JSON_CODEC = JSONCodec()
+
+
+@dataclass(eq=False)
+class Subscription:
+    """A single stream consumer with a bounded queue of serialized events.
+
+    When the queue is full the oldest pending event is dropped, so a slow
+    consumer never blocks publishers or grows memory. ``dropped`` tells the
+    stream how many events the client missed and should re-fetch.
+    """
+
+    topic: str
+    queue: asyncio.Queue[str]
+    dropped: int = 0
+
+    def push(self, data: str) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(data)
+
+    async def get(self) -> str:
+        return await self.queue.get()
+
+    def take_dropped(self) -> int:
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+@dataclass(eq=False)
+class ChatBroadcaster:
+    queue_size: int = 100
+    _subscriptions: dict[str, set[Subscription]] = field(
+        default_factory=lambda: defaultdict(set),
+        kw_only=True,
+    )
+
+    @property
+    def subscribers_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(topic=topic, queue=asyncio.Queue(maxsize=self.queue_size))
+        self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.topic)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.topic]
+
+    def publish(self, event: BaseEvent, topics: Iterable[str]) -> None:
+        # Serialize once per event, not once per subscriber.
+        data = _JSON_CODEC.encode(self._event_payload(event)).decode()
+        for topic in topics:
+            for subscription in self._subscriptions.get(topic, ()):
+                subscription.push(data)
+
+    @staticmethod
+    def _event_payload(event: BaseEvent) -> dict:
+        payload = event_to_dict(event)
+        payload["type"] = event.__class__.__name__
+        return payload
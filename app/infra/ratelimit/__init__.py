@@ -0,0 +1 @@
+"""Token bucket rate limiting for the HTTP API."""
@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+
+@dataclass(eq=False)
+class TokenBucketLimiter:
+    """Token buckets keyed by an arbitrary string (client IP, chat oid...).
+
+    Each key may spend up to ``burst`` requests at once, refilled at
+    ``rate`` tokens per second. At most ``max_keys`` buckets are kept; the
+    least recently used one is dropped first. Idle buckets refill to full
+    anyway, so dropping them loses nothing.
+
+    A request costing more than ``burst`` is let through once the bucket is
+    full and leaves it in debt, so later requests wait until the whole cost
+    has been refilled.
+    """
+
+    rate: float
+    burst: float
+    max_keys: int = 100_000
+    clock: Callable[[], float] = field(default=time.monotonic, kw_only=True)
+    _buckets: OrderedDict[str, list[float]] = field(default_factory=OrderedDict, kw_only=True)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def retry_after(self, key: str, cost: float = 1.0) -> float:
+        """Return 0 when ``key`` can spend ``cost`` now, or the seconds to wait."""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return 0.0
+        return self._wait(self._tokens(bucket, self.clock()), cost)
+
+    def acquire(self, key: str, cost: float = 1.0) -> float:
+        """Spend ``cost`` tokens of ``key``; returns 0 or the seconds to wait."""
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = self.burst
+            bucket = self._buckets[key] = [tokens, now]
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            tokens = self._tokens(bucket, now)
+
+        bucket[1] = now
+        wait = self._wait(tokens, cost)
+        bucket[0] = tokens if wait else tokens - cost
+        return wait
+
+    def _tokens(self, bucket: list[float], now: float) -> float:
+        return min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+
+    def _wait(self, tokens: float, cost: float) -> float:
+        required = min(cost, self.burst)
+        return (required - tokens) / self.rate if tokens < required else 0.0
+
+
+def parse_rate(value: str) -> tuple[float, float] | None:
+    """Parse ``"rate"`` or ``"rate/burst"``; empty or zero disables the limit.
+
+    The burst defaults to one second worth of tokens.
+    """
+    value = value.strip()
+    if not value:
+        return None
+    rate, _, burst = value.partition("/")
+    if float(rate) <= 0:
+        return None
+    return float(rate), float(burst) if burst else max(float(rate), 1.0)
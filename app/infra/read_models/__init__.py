@@ -0,0 +1 @@
+"""Query-side projections built from domain events."""
@@ -0,0 +1,277 @@
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+from app.infra.repositories.messages import BaseChatRepository
+
+PREVIEW_LENGTH = 200
+
+
+@dataclass
+class ChatActivity:
+    chat_oid: str
+    title: str | None = None
+    created_at: datetime | None = None
+    messages_count: int = 0
+    last_message_oid: str | None = None
+    last_message_preview: str | None = None
+    last_activity_at: datetime | None = None
+
+    @property
+    def activity_key(self) -> tuple[datetime, str]:
+        return self.last_activity_at, self.chat_oid
+
+
+class _SortedKeys:
+    """Sorted ``(last_activity_at, chat_oid)`` keys split into short runs.
+
+    Adding or removing a key bisects the run maxima and then one run of at
+    most ``2 * _LOAD`` keys, so updates cost O(log n) comparisons plus a
+    bounded shift instead of moving the tail of one long list.
+    """
+
+    _LOAD = 512
+
+    __slots__ = ("_runs", "_maxima")
+
+    def __init__(self) -> None:
+        self._runs: list[list[tuple[datetime, str]]] = []
+        self._maxima: list[tuple[datetime, str]] = []
+
+    def add(self, key: tuple[datetime, str]) -> None:
+        if not self._runs:
+            self._runs.append([key])
+            self._maxima.append(key)
+            return
+        index = min(bisect_left(self._maxima, key), len(self._runs) - 1)
+        run = self._runs[index]
+        insort(run, key)
+        self._maxima[index] = run[-1]
+        if len(run) > 2 * self._LOAD:
+            self._runs.insert(index + 1, run[self._LOAD:])
+            del run[self._LOAD:]
+            self._maxima.insert(index, run[-1])
+
+    def remove(self, key: tuple[datetime, str]) -> None:
+        index = bisect_left(self._maxima, key)
+        run = self._runs[index]
+        del run[bisect_left(run, key)]
+        if run:
+            self._maxima[index] = run[-1]
+        else:
+            del self._runs[index]
+            del self._maxima[index]
+
+    def iter_before(self, key: tuple[datetime, str] | None) -> Iterator[tuple[datetime, str]]:
+        """Yield keys below ``key`` (all keys when it is None), largest first."""
+        if key is None:
+            index, position = len(self._runs) - 1, None
+        else:
+            index = bisect_left(self._maxima, key)
+            if index == len(self._runs):
+                index, position = index - 1, None
+            else:
+                position = bisect_left(self._runs[index], key)
+        while index >= 0:
+            run = self._runs[index]
+            for offset in range(len(run) if position is None else position, 0, -1):
+                yield run[offset - 1]
+            index, position = index - 1, None
+
+
+@dataclass
+class MemoryChatActivityReadModel:
+    """Per-chat summaries maintained from chat events.
+
+    Each chat has its message count, a preview of the last message and the
+    time of its last activity, so an inbox is rendered without touching
+    message history. Chats are also kept ordered by last activity, which
+    ``list_by_activity`` reads from the most recent end. Activity is dated
+    with the ``occurred_at`` of events, so replayed events and restored
+    chats sort by when things happened, not when they were applied.
+
+    Event delivery is at-least-once, so recently applied event ids are
+    remembered in a bounded window and replays within it are ignored.
+
+    Between ``start_restore`` and ``finish_restore`` the messages applied
+    per chat are remembered, so that ``restore`` can add the ones its
+    snapshot missed instead of overwriting them: backfills run next to
+    live events.
+    """
+
+    dedup_window: int = 100_000
+    _activities: dict[str, ChatActivity] = field(default_factory=dict, kw_only=True)
+    _by_activity: _SortedKeys = field(default_factory=_SortedKeys, kw_only=True)
+    _applied_events: OrderedDict[UUID, None] = field(default_factory=OrderedDict, kw_only=True)
+    _live_messages: dict[str, list[tuple[datetime, str]]] | None = field(default=None, kw_only=True)
+
+    def __len__(self) -> int:
+        return len(self._activities)
+
+    def get(self, chat_oid: str) -> ChatActivity | None:
+        return self._activities.get(chat_oid)
+
+    def apply_chat_created(self, event_id: UUID, chat_oid: str, title: str, created_at: datetime) -> None:
+        if self._seen(event_id):
+            return
+        activity = self._activity(chat_oid)
+        activity.title = title
+        if activity.created_at is None:
+            activity.created_at = created_at
+        self._touch(activity, created_at)
+
+    def apply_message_received(
+        self,
+        event_id: UUID,
+        chat_oid: str,
+        message_oid: str,
+        text: str,
+        created_at: datetime,
+    ) -> None:
+        if self._seen(event_id):
+            return
+        activity = self._activity(chat_oid)
+        activity.messages_count += 1
+        if self._live_messages is not None:
+            self._live_messages.setdefault(chat_oid, []).append((created_at, message_oid))
+        if activity.last_activity_at is None or created_at >= activity.last_activity_at:
+            activity.last_message_oid = message_oid
+            activity.last_message_preview = text[:PREVIEW_LENGTH]
+        self._touch(activity, created_at)
+
+    def restore(
+        self,
+        chat_oid: str,
+        title: str,
+        created_at: datetime,
+        messages_count: int,
+        last_message_oid: str | None = None,
+        last_message_text: str | None = None,
+        last_activity_at: datetime | None = None,
+    ) -> None:
+        """Merge a summary computed from stored data, e.g. after a restart.
+
+        Messages applied from events and newer than the last message of
+        the snapshot are added to its count; the preview and activity time
+        only move forward.
+        """
+        activity = self._activity(chat_oid)
+        activity.title = title
+        activity.created_at = created_at
+        live = self._live_messages.pop(chat_oid, ()) if self._live_messages is not None else ()
+        last_key = (last_activity_at, last_message_oid) if last_message_oid is not None else None
+        activity.messages_count = messages_count + sum(1 for key in live if last_key is None or key > last_key)
+        if last_message_oid is not None and (
+            activity.last_activity_at is None or last_activity_at >= activity.last_activity_at
+        ):
+            activity.last_message_oid = last_message_oid
+            activity.last_message_preview = (last_message_text or "")[:PREVIEW_LENGTH]
+        self._touch(activity, last_activity_at or created_at)
+
+    def start_restore(self) -> None:
+        self._live_messages = {}
+
+    def finish_restore(self) -> None:
+        self._live_messages = None
+
+    def list_by_activity(
+        self,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        title_prefix: str | None = None,
+    ) -> list[ChatActivity]:
+        """Return chats with the most recent activity first.
+
+        ``after`` is the exclusive ``(last_activity_at, chat_oid)`` key of
+        the last chat of the previous page.
+        """
+        prefix = title_prefix.casefold() if title_prefix else None
+        page = []
+        for _, chat_oid in self._by_activity.iter_before(after):
+            if len(page) == limit:
+                break
+            activity = self._activities[chat_oid]
+            if activity.title is None:
+                continue
+            if prefix is not None and not activity.title.casefold().startswith(prefix):
+                continue
+            page.append(activity)
+        return page
+
+    def _activity(self, chat_oid: str) -> ChatActivity:
+        activity = self._activities.get(chat_oid)
+        if activity is None:
+            activity = self._activities[chat_oid] = ChatActivity(chat_oid=chat_oid)
+        return activity
+
+    def _touch(self, activity: ChatActivity, at: datetime) -> None:
+        if activity.last_activity_at is not None:
+            if at <= activity.last_activity_at:
+                return
+            self._by_activity.remove(activity.activity_key)
+        activity.last_activity_at = at
+        self._by_activity.add(activity.activity_key)
+
+    def _seen(self, event_id: UUID) -> bool:
+        if event_id in self._applied_events:
+            return True
+        self._applied_events[event_id] = None
+        if len(self._applied_events) > self.dedup_window:
+            self._applied_events.popitem(last=False)
+        return False
+
+
+async def load_chat_activity(
+    read_model: MemoryChatActivityReadModel,
+    repository: BaseChatRepository,
+    page_size: int = 500,
+) -> int:
+    """Compute summaries of the chats already stored; returns their number.
+
+    Live events keep the summaries current afterwards, so this only runs
+    once at startup; it may run while events are applied.
+    """
+    read_model.start_restore()
+    try:
+        return await _restore_chats(read_model, repository, page_size)
+    finally:
+        read_model.finish_restore()
+
+
+async def _restore_chats(
+    read_model: MemoryChatActivityReadModel,
+    repository: BaseChatRepository,
+    page_size: int,
+) -> int:
+    restored = 0
+    after = None
+    while True:
+        chats = await repository.list_chats(limit=page_size, after=after)
+        for chat in chats:
+            messages = await repository.get_messages(chat.oid, limit=page_size) or []
+            last_message = messages[-1] if messages else None
+            count = len(messages)
+            while len(messages) == page_size:
+                messages = await repository.get_messages(
+                    chat.oid,
+                    limit=page_size,
+                    before=(messages[0].created_at, messages[0].oid),
+                ) or []
+                count += len(messages)
+            read_model.restore(
+                chat.oid,
+                chat.title.as_generic_type(),
+                chat.created_at,
+                count,
+                last_message_oid=last_message.oid if last_message else None,
+                last_message_text=last_message.text.as_generic_type() if last_message else None,
+                last_activity_at=last_message.created_at if last_message else None,
+            )
+            restored += 1
+        if len(chats) < page_size:
+            return restored
+        after = (chats[-1].created_at, chats[-1].oid)
@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.messages import MemoryChatRepository
+from app.infra.serialization.codecs import JSONCodec
+
+logger = logging.getLogger(__name__)
+
+# Every record is framed as <payload length><CRC32 of the payload><payload>,
+# so a write torn by a crash is detected and ignored on recovery. Payloads
+# are JSON arrays:
+#   ["c", chat_oid, title, created_at]
+#   ["m", chat_oid, [[message_oid, text, created_at], ...]]
+_FRAME = struct.Struct("<II")
+_SEGMENT_RE = re.compile(r"wal-(\d{8})\.log")
+_SNAPSHOT_RE = re.compile(r"snapshot-(\d{8})\.snap")
+_SNAPSHOT_BATCH = 1000
+_CODEC = JSONCodec()
+
+
+def _frame(record: list) -> bytes:
+    payload = _CODEC.encode(record)
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _message_row(message: Message) -> list:
+    return [message.oid, message.text.as_generic_type(), message.created_at.isoformat()]
+
+
+def _read_records(path: Path) -> Iterator[list]:
+    """Yield the records of a log segment or snapshot up to a torn tail."""
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            offset = 0
+            while offset + _FRAME.size <= size:
+                length, checksum = _FRAME.unpack_from(view, offset)
+                start = offset + _FRAME.size
+                payload = view[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                yield _CODEC.decode(payload)
+                offset = start + length
+
+
+@dataclass(eq=False)
+class DurableMemoryChatRepository(MemoryChatRepository):
+    """In-memory repository made durable by a write-ahead log and snapshots.
+
+    Mutations are appended to the log before they are applied in memory,
+    and a call returns once its record is on disk. Records from concurrent
+    calls are written and fsynced together (group commit); with
+    ``commit_interval`` the writer also waits that long to gather more of
+    them. Reads are served from memory as in ``MemoryChatRepository``.
+
+    When the active log segment grows past ``compact_after_bytes`` it is
+    sealed, and a worker thread folds the previous snapshot and the sealed
+    segments into a new snapshot. The live state is never read, so the
+    event loop keeps serving requests meanwhile. ``snapshot-N.snap`` holds
+    everything written to segments below N. On startup the newest snapshot
+    is loaded through ``mmap`` and the newer segments are replayed.
+    """
+
+    directory: str
+    fsync: bool = True
+    commit_interval: float = 0.0
+    compact_after_bytes: int = 64 * 1024 * 1024
+    commits: int = field(default=0, init=False)
+    committed_records: int = field(default=0, init=False)
+    _segment: int = field(default=1, init=False, repr=False)
+    _file: BinaryIO = field(init=False, repr=False)
+    _file_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _reserved_titles: set[str] = field(default_factory=set, init=False, repr=False)
+    _pending: list[bytes] = field(default_factory=list, init=False, repr=False)
+    _waiters: list[asyncio.Future] = field(default_factory=list, init=False, repr=False)
+    _flusher: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _compaction_lock: asyncio.Lock | None = field(default=None, init=False, repr=False)
+    _compactions: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        self._recover()
+        self._file = open(self._segment_path(self._segment), "ab")
+
+    async def add_chat(self, chat: Chat) -> None:
+        await self._commit(_frame(["c", chat.oid, chat.title.as_generic_type(), chat.created_at.isoformat()]))
+        await super().add_chat(chat)
+
+    async def add_chat_if_absent(self, chat: Chat) -> bool:
+        # The title is reserved while the record is written, so a concurrent
+        # request cannot take it in the meantime.
+        title = chat.title.as_generic_type()
+        if title in self._chats_by_title or title in self._reserved_titles:
+            return False
+        self._reserved_titles.add(title)
+        try:
+            await self.add_chat(chat)
+        finally:
+            self._reserved_titles.discard(title)
+        return True
+
+    async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
+        if chat_oid not in self._chats_by_oid:
+            return None
+        await self._commit(_frame(["m", chat_oid, [_message_row(message)]]))
+        return await super().add_message(chat_oid, message)
+
+    async def add_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        if chat_oid not in self._chats_by_oid:
+            return None
+        if messages:
+            await self._commit(_frame(["m", chat_oid, [_message_row(message) for message in messages]]))
+        return await super().add_messages(chat_oid, messages)
+
+    async def compact(self) -> None:
+        """Seal the active segment and wait until it is folded into a snapshot."""
+        upto = await asyncio.to_thread(self._rotate)
+        await self._compact_in_background(upto)
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            await self._flusher
+        if self._compactions:
+            await asyncio.gather(*self._compactions, return_exceptions=True)
+        with self._file_lock:
+            self._file.close()
+
+    async def _commit(self, frame: bytes) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._pending.append(frame)
+        self._waiters.append(waiter)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_pending())
+        await waiter
+
+    async def _flush_pending(self) -> None:
+        # Records queued while a write is in flight go out together next.
+        while self._pending:
+            if self.commit_interval:
+                await asyncio.sleep(self.commit_interval)
+            frames, self._pending = self._pending, []
+            waiters, self._waiters = self._waiters, []
+            try:
+                sealed = await asyncio.to_thread(self._write, b"".join(frames))
+            except Exception as exc:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(exc)
+                continue
+
+            self.commits += 1
+            self.committed_records += len(frames)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+            if sealed is not None:
+                task = asyncio.create_task(self._compact_in_background(sealed))
+                self._compactions.add(task)
+                task.add_done_callback(self._compaction_done)
+
+    def _compaction_done(self, task: asyncio.Task) -> None:
+        self._compactions.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Chat log compaction failed", exc_info=task.exception())
+
+    async def _compact_in_background(self, upto: int) -> None:
+        if self._compaction_lock is None:
+            self._compaction_lock = asyncio.Lock()
+        async with self._compaction_lock:
+            await asyncio.to_thread(self._compact, upto)
+
+    def _write(self, data: bytes) -> int | None:
+        """Append ``data`` to the log; returns the sealed boundary on rollover."""
+        with self._file_lock:
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            if self._file.tell() < self.compact_after_bytes:
+                return None
+            return self._rotate_locked()
+
+    def _rotate(self) -> int:
+        with self._file_lock:
+            return self._rotate_locked()
+
+    def _rotate_locked(self) -> int:
+        self._file.close()
+        self._segment += 1
+        self._file = open(self._segment_path(self._segment), "ab")
+        return self._segment
+
+    def _compact(self, upto: int) -> None:
+        base = max(self._numbered(_SNAPSHOT_RE), default=0)
+        if base >= upto:
+            return
+
+        chats: dict[str, tuple[str, str, list]] = {}
+        for record in self._records(base, upto):
+            if record[0] == "c":
+                chats.setdefault(record[1], (record[2], record[3], []))
+            elif record[1] in chats:
+                chats[record[1]][2].extend(record[2])
+
+        path = self._snapshot_path(upto)
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb") as file:
+            for chat_oid, (title, created_at, rows) in chats.items():
+                file.write(_frame(["c", chat_oid, title, created_at]))
+                for start in range(0, len(rows), _SNAPSHOT_BATCH):
+                    file.write(_frame(["m", chat_oid, rows[start:start + _SNAPSHOT_BATCH]]))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        self._sync_directory()
+        self._remove_obsolete(upto)
+
+    def _recover(self) -> None:
+        base = max(self._numbered(_SNAPSHOT_RE), default=0)
+        segments = self._numbered(_SEGMENT_RE)
+        self._remove_obsolete(base)
+        self._apply(self._records(base, None))
+        # Never append to a segment that may end with a torn record.
+        self._segment = max([base, 1, *(number + 1 for number in segments)])
+
+    def _records(self, base: int, upto: int | None) -> Iterator[list]:
+        if base:
+            yield from _read_records(self._snapshot_path(base))
+        for number in self._numbered(_SEGMENT_RE):
+            if number >= base and (upto is None or number < upto):
+                yield from _read_records(self._segment_path(number))
+
+    def _apply(self, records: Iterable[list]) -> None:
+        chats = self._chats_by_oid
+        for record in records:
+            if record[0] == "c":
+                _, chat_oid, title, created_at = record
+                if chat_oid not in chats:
+                    self._index_chat(Chat(
+                        oid=chat_oid,
+                        title=Title(value=title),
+                        created_at=datetime.fromisoformat(created_at),
+                    ))
+                continue
+
+            chat = chats.get(record[1])
+            if chat is None:
+                continue
+            # Appended directly: replayed messages must not raise events again.
+            append = chat.messages.append
+            for oid, text, created_at in record[2]:
+                append(Message(oid=oid, text=Text(value=text), created_at=datetime.fromisoformat(created_at)))
+
+    def _remove_obsolete(self, base: int) -> None:
+        for path in Path(self.directory).iterdir():
+            if path.suffix == ".tmp":
+                path.unlink()
+                continue
+            match = _SNAPSHOT_RE.fullmatch(path.name) or _SEGMENT_RE.fullmatch(path.name)
+            if match is not None and int(match.group(1)) < base:
+                path.unlink()
+
+    def _sync_directory(self) -> None:
+        # Makes the rename of a new snapshot itself durable.
+        descriptor = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+    def _numbered(self, pattern: re.Pattern) -> list[int]:
+        numbers = []
+        for path in Path(self.directory).iterdir():
+            match = pattern.fullmatch(path.name)
+            if match is not None:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def _segment_path(self, number: int) -> Path:
+        return Path(self.directory) / f"wal-{number:08d}.log"
+
+    def _snapshot_path(self, number: int) -> Path:
+        return Path(self.directory) / f"snapshot-{number:08d}.snap"
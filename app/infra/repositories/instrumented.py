@@ -0,0 +1,122 @@
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.domain.entities.messages import Chat, Message
+from app.infra.metrics.registry import Metrics
+from app.infra.repositories.messages import BaseChatRepository
+
+
+@dataclass(eq=False)
+class InstrumentedChatRepository(BaseChatRepository):
+    """Times every call of the wrapped repository.
+
+    Only installed when metrics are enabled, so the disabled mode pays
+    nothing for it.
+    """
+
+    repository: BaseChatRepository
+    metrics: Metrics
+    _duration: object = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._duration = self.metrics.histogram(
+            "chat_repository_operation_duration_seconds",
+            "Time spent in one chat repository call.",
+            ("operation",),
+        )
+
+    async def check_chat_exists_by_title(self, title: str) -> bool:
+        started = time.perf_counter()
+        try:
+            return await self.repository.check_chat_exists_by_title(title)
+        finally:
+            self._observe("check_chat_exists_by_title", started)
+
+    async def add_chat(self, chat: Chat) -> None:
+        started = time.perf_counter()
+        try:
+            await self.repository.add_chat(chat)
+        finally:
+            self._observe("add_chat", started)
+
+    async def add_chat_if_absent(self, chat: Chat) -> bool:
+        started = time.perf_counter()
+        try:
+            return await self.repository.add_chat_if_absent(chat)
+        finally:
+            self._observe("add_chat_if_absent", started)
+
+    async def get_chat_by_oid(self, oid: str) -> Chat | None:
+        started = time.perf_counter()
+        try:
+            return await self.repository.get_chat_by_oid(oid)
+        finally:
+            self._observe("get_chat_by_oid", started)
+
+    async def get_chat_by_title(self, title: str) -> Chat | None:
+        started = time.perf_counter()
+        try:
+            return await self.repository.get_chat_by_title(title)
+        finally:
+            self._observe("get_chat_by_title", started)
+
+    async def get_chat_metadata(self, oid: str) -> Chat | None:
+        started = time.perf_counter()
+        try:
+            return await self.repository.get_chat_metadata(oid)
+        finally:
+            self._observe("get_chat_metadata", started)
+
+    async def list_chats(
+        self,
+        *,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        created_after: datetime | None = None,
+        title_prefix: str | None = None,
+    ) -> list[Chat]:
+        started = time.perf_counter()
+        try:
+            return await self.repository.list_chats(
+                limit=limit,
+                after=after,
+                created_after=created_after,
+                title_prefix=title_prefix,
+            )
+        finally:
+            self._observe("list_chats", started)
+
+    async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
+        started = time.perf_counter()
+        try:
+            return await self.repository.add_message(chat_oid, message)
+        finally:
+            self._observe("add_message", started)
+
+    async def add_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        started = time.perf_counter()
+        try:
+            return await self.repository.add_messages(chat_oid, messages)
+        finally:
+            self._observe("add_messages", started)
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[Message] | None:
+        started = time.perf_counter()
+        try:
+            return await self.repository.get_messages(chat_oid, limit=limit, after=after, before=before)
+        finally:
+            self._observe("get_messages", started)
+
+    async def stop(self) -> None:
+        await self.repository.stop()
+
+    def _observe(self, operation: str, started: float) -> None:
+        self._duration.labels(operation).observe(time.perf_counter() - started)
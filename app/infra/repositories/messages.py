@@ -1,7 +1,14 @@
 from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field
+from datetime import datetime
 
 from app.domain.entities.messages import Chat, Message
+from app.infra.outbox.stores import BaseOutboxStore
+
+
+def _chat_sort_key(chat: Chat) -> tuple:
+    return chat.created_at, chat.oid
 
 
 @dataclass
@@ -14,6 +21,14 @@ class BaseChatRepository(ABC):
     async def add_chat(self, chat: Chat) -> None:
         ...
 
+    @abstractmethod
+    async def add_chat_if_absent(self, chat: Chat) -> bool:
+        """Add ``chat`` unless its title is taken; one atomic step.
+
+        Returns whether the chat was added. Checking the title first and
+        calling ``add_chat`` afterwards races with concurrent requests.
+        """
+
     @abstractmethod
     async def get_chat_by_oid(self, oid: str) -> Chat | None:
         ...
@@ -23,55 +38,163 @@ class BaseChatRepository(ABC):
         ...
 
     @abstractmethod
-    async def list_chats(self) -> list[Chat]:
-        ...
+    async def get_chat_metadata(self, oid: str) -> Chat | None:
+        """Return the chat without loading its message history."""
+
+    @abstractmethod
+    async def list_chats(
+        self,
+        *,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        created_after: datetime | None = None,
+        title_prefix: str | None = None,
+    ) -> list[Chat]:
+        """Return chats ordered by ``(created_at, oid)``.
+
+        ``after`` is an exclusive keyset bound, ``created_after`` an exclusive
+        lower bound on ``created_at`` and ``title_prefix`` matches titles
+        case-insensitively.
+        """
 
     @abstractmethod
     async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
         ...
 
+    @abstractmethod
+    async def add_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        """Append ``messages`` to the chat in one operation."""
+
+    @abstractmethod
+    async def get_messages(
+        self,
+        chat_oid: str,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[Message] | None:
+        ...
+
+    async def stop(self) -> None:
+        """Release resources and finish pending writes; a no-op by default."""
+        return None
+
 
 @dataclass
 class MemoryChatRepository(BaseChatRepository):
-    _saved_chats: list[Chat] = field(default_factory=list, kw_only=True)
+    """In-memory repository with hash indexes by oid and title.
+
+    Chats are additionally kept in a list ordered by ``(created_at, oid)``,
+    so listing is a binary search plus a slice instead of a sort, and in a
+    list of ``(casefolded title, oid)`` pairs that answers prefix filters.
+    With an ``outbox``, each write adds the events it registered there.
+    """
+
+    _chats_by_oid: dict[str, Chat] = field(default_factory=dict, kw_only=True)
+    _chats_by_title: dict[str, Chat] = field(default_factory=dict, kw_only=True)
+    _ordered_chats: list[Chat] = field(default_factory=list, kw_only=True)
+    _ordered_titles: list[tuple[str, str]] = field(default_factory=list, kw_only=True)
+    outbox: BaseOutboxStore | None = field(default=None, kw_only=True)
 
     async def check_chat_exists_by_title(self, title: str) -> bool:
-        try:
-            return bool(
-                next(
-                    chat
-                    for chat in self._saved_chats
-                    if chat.title.as_generic_type() == title
-                )
-            )
-        except StopIteration:
-            return False
+        return title in self._chats_by_title
 
     async def add_chat(self, chat: Chat) -> None:
-        self._saved_chats.append(chat)
+        self._index_chat(chat)
+        await self._write_outbox(chat)
 
-    async def list_chats(self) -> list[Chat]:
-        return sorted(self._saved_chats, key=lambda chat: chat.created_at)
+    async def add_chat_if_absent(self, chat: Chat) -> bool:
+        # Nothing awaits between the check and the insert.
+        if chat.title.as_generic_type() in self._chats_by_title:
+            return False
+        self._index_chat(chat)
+        await self._write_outbox(chat)
+        return True
+
+    def _index_chat(self, chat: Chat) -> None:
+        self._chats_by_oid[chat.oid] = chat
+        self._chats_by_title[chat.title.as_generic_type()] = chat
+
+        if self._ordered_chats and _chat_sort_key(self._ordered_chats[-1]) > _chat_sort_key(chat):
+            insort(self._ordered_chats, chat, key=_chat_sort_key)
+        else:
+            self._ordered_chats.append(chat)
+        insort(self._ordered_titles, (chat.title.as_generic_type().casefold(), chat.oid))
+
+    async def list_chats(
+        self,
+        *,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        created_after: datetime | None = None,
+        title_prefix: str | None = None,
+    ) -> list[Chat]:
+        if title_prefix:
+            chats = self._chats_with_title_prefix(title_prefix.casefold())
+        else:
+            chats = self._ordered_chats
+
+        start = 0
+        if after is not None:
+            start = bisect_right(chats, after, key=_chat_sort_key)
+        if created_after is not None:
+            start = max(start, bisect_right(chats, created_after, key=lambda chat: chat.created_at))
+
+        stop = len(chats) if limit is None else start + limit
+        return chats[start:stop]
+
+    def _chats_with_title_prefix(self, prefix: str) -> list[Chat]:
+        position = bisect_left(self._ordered_titles, (prefix,))
+        matches = []
+        for title, oid in self._ordered_titles[position:]:
+            if not title.startswith(prefix):
+                break
+            matches.append(self._chats_by_oid[oid])
+        return sorted(matches, key=_chat_sort_key)
 
     async def get_chat_by_oid(self, chat_oid: str) -> Chat | None:
-        try:
-            return next(chat for chat in self._saved_chats if chat.oid == chat_oid)
-        except StopIteration:
-            return None
+        return self._chats_by_oid.get(chat_oid)
 
     async def get_chat_by_title(self, title: str) -> Chat | None:
-        try:
-            return next(
-                chat
-                for chat in self._saved_chats
-                if chat.title.as_generic_type() == title
-            )
-        except StopIteration:
-            return None
+        return self._chats_by_title.get(title)
+
+    async def get_chat_metadata(self, oid: str) -> Chat | None:
+        # The history is already in memory, so there is nothing to skip.
+        return self._chats_by_oid.get(oid)
 
     async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
-        chat = await self.get_chat_by_oid(chat_oid)
+        chat = self._chats_by_oid.get(chat_oid)
         if chat is None:
             return None
         chat.add_messages(message)
+        await self._write_outbox(chat)
         return chat
+
+    async def add_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        chat = self._chats_by_oid.get(chat_oid)
+        if chat is None:
+            return None
+        for message in messages:
+            chat.add_messages(message)
+        await self._write_outbox(chat)
+        return chat
+
+    async def _write_outbox(self, chat: Chat) -> None:
+        # MemoryOutboxStore.add never suspends, so no other request runs
+        # between the change and its outbox records.
+        if self.outbox is not None:
+            await self.outbox.add(chat.peek_events())
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[Message] | None:
+        chat = self._chats_by_oid.get(chat_oid)
+        if chat is None:
+            return None
+        return chat.messages.page(limit=limit, after=after, before=before)
@@ -0,0 +1,233 @@
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from app.domain.entities.messages import Chat, Message, MessageLog
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.messages import BaseChatRepository
+
+_CHAT_ORDER = [("created_at", 1), ("oid", 1)]
+
+
+def _keyset_after(key: tuple[datetime, str]) -> dict:
+    created_at, oid = key
+    return {"$or": [
+        {"created_at": {"$gt": created_at}},
+        {"created_at": created_at, "oid": {"$gt": oid}},
+    ]}
+
+
+def _keyset_before(key: tuple[datetime, str]) -> dict:
+    created_at, oid = key
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "oid": {"$lt": oid}},
+    ]}
+
+
+def _combine(filters: list[dict]) -> dict:
+    if not filters:
+        return {}
+    if len(filters) == 1:
+        return filters[0]
+    return {"$and": filters}
+
+
+def _chat_to_document(chat: Chat) -> dict:
+    title = chat.title.as_generic_type()
+    return {
+        "oid": chat.oid,
+        "title": title,
+        "title_folded": title.casefold(),
+        "created_at": chat.created_at,
+    }
+
+
+def _chat_from_document(document: dict, messages: list[Message] | None = None) -> Chat:
+    return Chat(
+        oid=document["oid"],
+        title=Title(value=document["title"]),
+        created_at=document["created_at"],
+        messages=MessageLog(messages or ()),
+    )
+
+
+def _message_to_document(chat_oid: str, message: Message) -> dict:
+    return {
+        "oid": message.oid,
+        "chat_oid": chat_oid,
+        "text": message.text.as_generic_type(),
+        "created_at": message.created_at,
+    }
+
+
+def _message_from_document(document: dict) -> Message:
+    return Message(
+        oid=document["oid"],
+        text=Text(value=document["text"]),
+        created_at=document["created_at"],
+    )
+
+
+@dataclass
+class MongoChatRepository(BaseChatRepository):
+    """Chat repository backed by MongoDB through motor.
+
+    Chats and messages live in separate collections, so appending a message
+    is a single insert and never rewrites the chat document. Chats returned
+    by ``list_chats`` and ``add_message(s)`` carry metadata only; the history is
+    loaded by ``get_chat_by_oid``/``get_chat_by_title`` or paged with
+    ``get_messages``.
+    """
+
+    mongo_client: Any
+    database_name: str
+    chats_collection_name: str = "chats"
+    messages_collection_name: str = "messages"
+    _indexes_ready: bool = field(default=False, kw_only=True)
+
+    @property
+    def _chats(self) -> Any:
+        return self.mongo_client[self.database_name][self.chats_collection_name]
+
+    @property
+    def _messages(self) -> Any:
+        return self.mongo_client[self.database_name][self.messages_collection_name]
+
+    async def ensure_indexes(self) -> None:
+        if self._indexes_ready:
+            return
+
+        await self._chats.create_index("oid", unique=True)
+        await self._chats.create_index("title", unique=True)
+        await self._chats.create_index(_CHAT_ORDER)
+        await self._chats.create_index([("title_folded", 1), *_CHAT_ORDER])
+        await self._messages.create_index("oid", unique=True)
+        await self._messages.create_index([("chat_oid", 1), *_CHAT_ORDER])
+        self._indexes_ready = True
+
+    async def check_chat_exists_by_title(self, title: str) -> bool:
+        await self.ensure_indexes()
+        return await self._chats.find_one({"title": title}, projection={"_id": 1}) is not None
+
+    async def add_chat(self, chat: Chat) -> None:
+        await self.ensure_indexes()
+        await self._chats.insert_one(_chat_to_document(chat))
+
+    async def add_chat_if_absent(self, chat: Chat) -> bool:
+        from pymongo.errors import DuplicateKeyError
+
+        await self.ensure_indexes()
+        # The unique index on title makes the insert itself the check.
+        try:
+            await self._chats.insert_one(_chat_to_document(chat))
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def get_chat_by_oid(self, oid: str) -> Chat | None:
+        await self.ensure_indexes()
+        return await self._load_chat({"oid": oid})
+
+    async def get_chat_by_title(self, title: str) -> Chat | None:
+        await self.ensure_indexes()
+        return await self._load_chat({"title": title})
+
+    async def get_chat_metadata(self, oid: str) -> Chat | None:
+        await self.ensure_indexes()
+        document = await self._chats.find_one({"oid": oid})
+        return None if document is None else _chat_from_document(document)
+
+    async def list_chats(
+        self,
+        *,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        created_after: datetime | None = None,
+        title_prefix: str | None = None,
+    ) -> list[Chat]:
+        await self.ensure_indexes()
+
+        filters = []
+        if after is not None:
+            filters.append(_keyset_after(after))
+        if created_after is not None:
+            filters.append({"created_at": {"$gt": created_after}})
+        if title_prefix:
+            filters.append({"title_folded": {"$regex": f"^{re.escape(title_prefix.casefold())}"}})
+
+        cursor = self._chats.find(_combine(filters)).sort(_CHAT_ORDER)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return [_chat_from_document(document) async for document in cursor]
+
+    async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
+        await self.ensure_indexes()
+
+        document = await self._chats.find_one({"oid": chat_oid})
+        if document is None:
+            return None
+
+        await self._messages.insert_one(_message_to_document(chat_oid, message))
+        chat = _chat_from_document(document)
+        chat.add_messages(message)
+        return chat
+
+    async def add_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        await self.ensure_indexes()
+
+        document = await self._chats.find_one({"oid": chat_oid})
+        if document is None:
+            return None
+
+        if messages:
+            await self._messages.insert_many(
+                [_message_to_document(chat_oid, message) for message in messages],
+                ordered=True,
+            )
+        chat = _chat_from_document(document)
+        for message in messages:
+            chat.add_messages(message)
+        return chat
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[Message] | None:
+        await self.ensure_indexes()
+
+        if await self._chats.find_one({"oid": chat_oid}, projection={"_id": 1}) is None:
+            return None
+
+        filters = [{"chat_oid": chat_oid}]
+        if after is not None:
+            filters.append(_keyset_after(after))
+        if before is not None:
+            filters.append(_keyset_before(before))
+
+        # Without a lower bound the newest messages are wanted, so read the
+        # index backwards and restore chronological order afterwards.
+        direction = 1 if after is not None else -1
+        cursor = (
+            self._messages.find(_combine(filters))
+            .sort([("created_at", direction), ("oid", direction)])
+            .limit(limit)
+        )
+        messages = [_message_from_document(document) async for document in cursor]
+        if direction == -1:
+            messages.reverse()
+        return messages
+
+    async def _load_chat(self, query: dict) -> Chat | None:
+        document = await self._chats.find_one(query)
+        if document is None:
+            return None
+
+        cursor = self._messages.find({"chat_oid": document["oid"]}).sort(_CHAT_ORDER)
+        messages = [_message_from_document(message) async for message in cursor]
+        return _chat_from_document(document, messages)
@@ -0,0 +1,259 @@
+import asyncio
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.domain.entities.messages import Chat, Message, MessageLog
+from app.domain.values.messages import Text, Title
+from app.infra.outbox.stores import SQLiteOutboxStore
+from app.infra.repositories.messages import BaseChatRepository
+
+# Upper bound for range scans over a prefix of ``title_folded``.
+_MAX_CHAR = "\U0010ffff"
+
+
+def _timestamp(value: datetime) -> str:
+    # Fixed width so that text order equals chronological order.
+    return value.isoformat(timespec="microseconds")
+
+
+def _chat_from_row(row: tuple, messages: list[Message] | None = None) -> Chat:
+    oid, title, created_at = row
+    return Chat(
+        oid=oid,
+        title=Title(value=title),
+        created_at=datetime.fromisoformat(created_at),
+        messages=MessageLog(messages or ()),
+    )
+
+
+def _message_from_row(row: tuple) -> Message:
+    oid, text, created_at = row
+    return Message(oid=oid, text=Text(value=text), created_at=datetime.fromisoformat(created_at))
+
+
+@dataclass(eq=False)
+class SQLiteChatRepository(BaseChatRepository):
+    """Chat repository stored in a SQLite file.
+
+    Several processes on one host can open the same file, which makes it a
+    shared store for multi-worker deployments without MongoDB. Statements
+    run in a worker thread, so disk I/O never blocks the event loop. Like
+    ``MongoChatRepository``, chats returned by ``list_chats`` and
+    ``add_message(s)`` carry metadata only.
+
+    With an ``outbox`` opened on the same file, the events a write registers
+    are inserted in the transaction that stores its data, so a crash can
+    neither lose them nor publish events for data that was never saved.
+    """
+
+    path: str
+    outbox: SQLiteOutboxStore | None = field(default=None, kw_only=True)
+    _connection: sqlite3.Connection = field(init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS chats (
+                    oid TEXT PRIMARY KEY,
+                    title TEXT NOT NULL UNIQUE,
+                    title_folded TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    oid TEXT PRIMARY KEY,
+                    chat_oid TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS ix_chats_order ON chats (created_at, oid)")
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_chats_title ON chats (title_folded, created_at, oid)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_messages_chat ON messages (chat_oid, created_at, oid)"
+            )
+
+    async def check_chat_exists_by_title(self, title: str) -> bool:
+        rows = await self._fetch("SELECT 1 FROM chats WHERE title = ?", (title,))
+        return bool(rows)
+
+    async def add_chat(self, chat: Chat) -> None:
+        await asyncio.to_thread(
+            self._insert_chat,
+            "INSERT INTO chats (oid, title, title_folded, created_at) VALUES (?, ?, ?, ?)",
+            chat,
+        )
+        self._notify_outbox()
+
+    async def add_chat_if_absent(self, chat: Chat) -> bool:
+        added = await asyncio.to_thread(
+            self._insert_chat,
+            "INSERT INTO chats (oid, title, title_folded, created_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (title) DO NOTHING",
+            chat,
+        )
+        if added:
+            self._notify_outbox()
+        return added
+
+    async def get_chat_by_oid(self, oid: str) -> Chat | None:
+        return await asyncio.to_thread(self._load_chat, "oid", oid)
+
+    async def get_chat_by_title(self, title: str) -> Chat | None:
+        return await asyncio.to_thread(self._load_chat, "title", title)
+
+    async def get_chat_metadata(self, oid: str) -> Chat | None:
+        rows = await self._fetch("SELECT oid, title, created_at FROM chats WHERE oid = ?", (oid,))
+        return _chat_from_row(rows[0]) if rows else None
+
+    async def list_chats(
+        self,
+        *,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        created_after: datetime | None = None,
+        title_prefix: str | None = None,
+    ) -> list[Chat]:
+        conditions, parameters = [], []
+        if after is not None:
+            conditions.append("(created_at, oid) > (?, ?)")
+            parameters += [_timestamp(after[0]), after[1]]
+        if created_after is not None:
+            conditions.append("created_at > ?")
+            parameters.append(_timestamp(created_after))
+        if title_prefix:
+            prefix = title_prefix.casefold()
+            conditions.append("title_folded >= ? AND title_folded < ?")
+            parameters += [prefix, prefix + _MAX_CHAR]
+
+        statement = "SELECT oid, title, created_at FROM chats"
+        if conditions:
+            statement += " WHERE " + " AND ".join(conditions)
+        statement += " ORDER BY created_at, oid"
+        if limit is not None:
+            statement += " LIMIT ?"
+            parameters.append(limit)
+        return [_chat_from_row(row) for row in await self._fetch(statement, tuple(parameters))]
+
+    async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
+        return await self.add_messages(chat_oid, [message])
+
+    async def add_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        chat = await asyncio.to_thread(self._insert_messages, chat_oid, messages)
+        if chat is not None:
+            self._notify_outbox()
+        return chat
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[Message] | None:
+        if not await self._fetch("SELECT 1 FROM chats WHERE oid = ?", (chat_oid,)):
+            return None
+
+        conditions, parameters = ["chat_oid = ?"], [chat_oid]
+        if after is not None:
+            conditions.append("(created_at, oid) > (?, ?)")
+            parameters += [_timestamp(after[0]), after[1]]
+        if before is not None:
+            conditions.append("(created_at, oid) < (?, ?)")
+            parameters += [_timestamp(before[0]), before[1]]
+
+        # Without a lower bound the newest messages are wanted, so read the
+        # index backwards and restore chronological order afterwards.
+        direction = "ASC" if after is not None else "DESC"
+        rows = await self._fetch(
+            f"SELECT oid, text, created_at FROM messages WHERE {' AND '.join(conditions)} "
+            f"ORDER BY created_at {direction}, oid {direction} LIMIT ?",
+            (*parameters, limit),
+        )
+        messages = [_message_from_row(row) for row in rows]
+        if direction == "DESC":
+            messages.reverse()
+        return messages
+
+    async def stop(self) -> None:
+        # Closing the last connection checkpoints the WAL into the database.
+        await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _load_chat(self, column: str, value: str) -> Chat | None:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT oid, title, created_at FROM chats WHERE {column} = ?", (value,)
+            ).fetchone()
+            if row is None:
+                return None
+            messages = self._connection.execute(
+                "SELECT oid, text, created_at FROM messages WHERE chat_oid = ? ORDER BY created_at, oid",
+                (row[0],),
+            ).fetchall()
+        return _chat_from_row(row, [_message_from_row(message) for message in messages])
+
+    def _insert_chat(self, statement: str, chat: Chat) -> bool:
+        title = chat.title.as_generic_type()
+        with self._lock, self._connection:
+            added = self._connection.execute(
+                statement,
+                (chat.oid, title, title.casefold(), _timestamp(chat.created_at)),
+            ).rowcount == 1
+            if added:
+                self._write_outbox(chat)
+        return added
+
+    def _insert_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT oid, title, created_at FROM chats WHERE oid = ?", (chat_oid,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.executemany(
+                "INSERT INTO messages (oid, chat_oid, text, created_at) VALUES (?, ?, ?, ?)",
+                [
+                    (message.oid, chat_oid, message.text.as_generic_type(), _timestamp(message.created_at))
+                    for message in messages
+                ],
+            )
+            chat = _chat_from_row(row)
+            for message in messages:
+                chat.add_messages(message)
+            self._write_outbox(chat)
+        return chat
+
+    def _write_outbox(self, chat: Chat) -> None:
+        # Runs inside the caller's transaction; the events stay registered
+        # on the chat for the command handler to pull.
+        if self.outbox is not None:
+            self.outbox.insert(self._connection, chat.peek_events())
+
+    def _notify_outbox(self) -> None:
+        if self.outbox is not None:
+            self.outbox.notify_pending()
+
+    async def _fetch(self, statement: str, parameters: tuple) -> list[tuple]:
+        return await asyncio.to_thread(self._fetch_sync, statement, parameters)
+
+    def _fetch_sync(self, statement: str, parameters: tuple) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(statement, parameters).fetchall()
@@ -0,0 +1,308 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from app.domain.entities.messages import Chat, Message
+from app.infra.metrics.registry import NOOP_METRICS, Metrics
+from app.infra.repositories.messages import BaseChatRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class _HotChat:
+    chat: Chat
+    # Write-back only: messages appended in memory and not yet written to
+    # the cold store.
+    unsaved: list[Message] = field(default_factory=list)
+
+
+@dataclass(eq=False)
+class TieredChatRepository(BaseChatRepository):
+    """Recently used chats in memory, the rest in a cold store on disk.
+
+    Hot chats are whole aggregates kept in least-recently-used order. When
+    there are more than ``max_chats`` of them, or more than ``max_messages``
+    messages between them, the least recently used chats are evicted; the
+    most recent one always stays. A chat that is read or written while
+    cold is loaded back from ``cold``.
+
+    Chats are written to the cold store right away, so listings and title
+    checks are answered there. New messages are too, before they are
+    appended in memory, so an acknowledged message survives a crash.
+
+    With ``write_back`` messages are only appended in memory and written
+    to the cold store when their chat is evicted and on ``stop``. That
+    saves a cold write per message, but a crash loses what was not written
+    yet, as with ``MemoryChatRepository``. The cold store of either mode
+    must not be shared with another process.
+    """
+
+    cold: BaseChatRepository
+    max_chats: int = 10_000
+    max_messages: int = 1_000_000
+    write_back: bool = False
+    metrics: Metrics = field(default=NOOP_METRICS, kw_only=True)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+    _hot: OrderedDict[str, _HotChat] = field(default_factory=OrderedDict, init=False, repr=False)
+    _hot_titles: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+    _resident_messages: int = field(default=0, init=False, repr=False)
+    _loading: dict[str, asyncio.Task] = field(default_factory=dict, init=False, repr=False)
+    _writing: dict[str, asyncio.Task] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        lookups = self.metrics.counter(
+            "chat_repository_cache_lookups_total",
+            "Chat repository lookups served from memory (hit) or the cold store (miss).",
+            ("result",),
+        )
+        self._hit_counter = lookups.labels("hit")
+        self._miss_counter = lookups.labels("miss")
+        self._eviction_counter = self.metrics.counter(
+            "chat_repository_cache_evictions_total",
+            "Chats moved from memory to the cold store.",
+        ).labels()
+        self.metrics.gauge(
+            "chat_repository_hot_chats",
+            "Chats held in memory.",
+        ).labels().set_function(lambda: len(self._hot))
+        self.metrics.gauge(
+            "chat_repository_hot_messages",
+            "Messages held in memory.",
+        ).labels().set_function(lambda: self._resident_messages)
+
+    @property
+    def resident_messages(self) -> int:
+        return self._resident_messages
+
+    async def check_chat_exists_by_title(self, title: str) -> bool:
+        return title in self._hot_titles or await self.cold.check_chat_exists_by_title(title)
+
+    async def add_chat(self, chat: Chat) -> None:
+        await self.cold.add_chat(chat)
+        if chat.messages:
+            await self.cold.add_messages(chat.oid, list(chat.messages))
+        self._install(_HotChat(chat=chat))
+
+    async def add_chat_if_absent(self, chat: Chat) -> bool:
+        if not await self.cold.add_chat_if_absent(chat):
+            return False
+        if chat.messages:
+            await self.cold.add_messages(chat.oid, list(chat.messages))
+        self._install(_HotChat(chat=chat))
+        return True
+
+    async def get_chat_by_oid(self, oid: str) -> Chat | None:
+        entry = await self._hot_chat(oid)
+        return None if entry is None else entry.chat
+
+    async def get_chat_by_title(self, title: str) -> Chat | None:
+        oid = self._hot_titles.get(title)
+        if oid is None:
+            chat = await self.cold.get_chat_by_title(title)
+            if chat is None:
+                return None
+            oid = chat.oid
+            if oid not in self._hot and oid not in self._loading and oid not in self._writing:
+                self._count_miss()
+                self._install(_HotChat(chat=chat))
+                return chat
+        return await self.get_chat_by_oid(oid)
+
+    async def get_chat_metadata(self, oid: str) -> Chat | None:
+        entry = self._hot.get(oid)
+        if entry is not None:
+            self._count_hit()
+            return entry.chat
+        self._count_miss()
+        return await self.cold.get_chat_metadata(oid)
+
+    async def list_chats(
+        self,
+        *,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        created_after: datetime | None = None,
+        title_prefix: str | None = None,
+    ) -> list[Chat]:
+        return await self.cold.list_chats(
+            limit=limit,
+            after=after,
+            created_after=created_after,
+            title_prefix=title_prefix,
+        )
+
+    async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
+        return await self.add_messages(chat_oid, [message])
+
+    async def add_messages(self, chat_oid: str, messages: list[Message]) -> Chat | None:
+        entry = await self._hot_chat(chat_oid)
+        if entry is None:
+            return None
+        if self.write_back:
+            entry.unsaved.extend(messages)
+            self._append(chat_oid, entry, messages)
+        else:
+            # Shielded, so that a cancelled request cannot leave messages in
+            # the cold store that the hot copy never gets.
+            await asyncio.shield(self._schedule_write(
+                chat_oid,
+                lambda previous: self._write_through(chat_oid, entry, messages, previous),
+            ))
+        return entry.chat
+
+    async def get_messages(
+        self,
+        chat_oid: str,
+        *,
+        limit: int,
+        after: tuple[datetime, str] | None = None,
+        before: tuple[datetime, str] | None = None,
+    ) -> list[Message] | None:
+        entry = self._hot.get(chat_oid)
+        if entry is not None:
+            self._count_hit()
+            return entry.chat.messages.page(limit=limit, after=after, before=before)
+        # A page is read from the cold store without loading the whole chat.
+        self._count_miss()
+        await self._wait_for_writes(chat_oid)
+        return await self.cold.get_messages(chat_oid, limit=limit, after=after, before=before)
+
+    async def flush(self) -> None:
+        """Write the unsaved messages of hot chats to the cold store."""
+        for oid, entry in self._hot.items():
+            if entry.unsaved:
+                self._write_back(oid, entry)
+        while self._writing:
+            await asyncio.wait(list(self._writing.values()))
+
+    async def stop(self) -> None:
+        await self.flush()
+        await self.cold.stop()
+
+    async def _hot_chat(self, oid: str) -> _HotChat | None:
+        # Callers change the returned chat without awaiting in between, so
+        # it is still the hot copy while they do.
+        entry = self._hot.get(oid)
+        if entry is not None:
+            self._hot.move_to_end(oid)
+            self._count_hit()
+            return entry
+        while entry is None:
+            loading = self._loading.get(oid)
+            if loading is None or loading.done():
+                self._count_miss()
+                loading = self._loading[oid] = asyncio.create_task(self._load(oid))
+                loading.add_done_callback(self._forget(self._loading, oid))
+            if not await asyncio.shield(loading):
+                return None
+            # Another caller may have evicted the chat again meanwhile.
+            entry = self._hot.get(oid)
+        self._hot.move_to_end(oid)
+        return entry
+
+    async def _load(self, oid: str) -> bool:
+        await self._wait_for_writes(oid)
+        if oid in self._hot:
+            return True
+        chat = await self.cold.get_chat_by_oid(oid)
+        if chat is None:
+            return False
+        if oid not in self._hot:
+            self._install(_HotChat(chat=chat))
+        return True
+
+    def _install(self, entry: _HotChat) -> None:
+        oid = entry.chat.oid
+        self._hot[oid] = entry
+        self._hot_titles[entry.chat.title.as_generic_type()] = oid
+        self._resident_messages += len(entry.chat.messages)
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._hot) > 1 and (
+            len(self._hot) > self.max_chats or self._resident_messages > self.max_messages
+        ):
+            oid, entry = self._hot.popitem(last=False)
+            self._hot_titles.pop(entry.chat.title.as_generic_type(), None)
+            self._resident_messages -= len(entry.chat.messages)
+            self.evictions += 1
+            self._eviction_counter.inc()
+            if entry.unsaved:
+                self._write_back(oid, entry)
+
+    def _append(self, oid: str, entry: _HotChat, messages: list[Message]) -> None:
+        for message in messages:
+            entry.chat.add_messages(message)
+        # An entry evicted meanwhile still records the events; a reload of
+        # the chat has read the messages from the cold store.
+        if self._hot.get(oid) is entry:
+            self._resident_messages += len(messages)
+            self._evict()
+
+    def _schedule_write(
+        self,
+        oid: str,
+        write: Callable[[asyncio.Task | None], Awaitable[None]],
+    ) -> asyncio.Task:
+        # Writes of one chat run one after another, and loads of the chat
+        # wait for the last of them.
+        task = asyncio.create_task(write(self._writing.get(oid)))
+        self._writing[oid] = task
+        task.add_done_callback(self._forget(self._writing, oid))
+        return task
+
+    async def _write_through(
+        self,
+        oid: str,
+        entry: _HotChat,
+        messages: list[Message],
+        previous: asyncio.Task | None,
+    ) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        await self.cold.add_messages(oid, messages)
+        self._append(oid, entry, messages)
+
+    def _write_back(self, oid: str, entry: _HotChat) -> None:
+        self._schedule_write(oid, lambda previous: self._write_unsaved(oid, entry, previous))
+
+    async def _write_unsaved(self, oid: str, entry: _HotChat, previous: asyncio.Task | None) -> None:
+        if previous is not None:
+            await asyncio.wait([previous])
+        messages, entry.unsaved = entry.unsaved, []
+        if not messages:
+            return
+        try:
+            await self.cold.add_messages(oid, messages)
+        except Exception:
+            logger.exception("Writing chat %s to the cold store failed", oid)
+            entry.unsaved[:0] = messages
+            # Unless a later write will retry them, the messages go back to
+            # memory before a waiting load could read the cold store.
+            if self._writing.get(oid) is asyncio.current_task() and oid not in self._hot:
+                self._install(entry)
+
+    async def _wait_for_writes(self, oid: str) -> None:
+        while (task := self._writing.get(oid)) is not None and not task.done():
+            await asyncio.wait([task])
+
+    @staticmethod
+    def _forget(tasks: dict[str, asyncio.Task], oid: str):
+        def callback(task: asyncio.Task) -> None:
+            if tasks.get(oid) is task:
+                del tasks[oid]
+        return callback
+
+    def _count_hit(self) -> None:
+        self.hits += 1
+        self._hit_counter.inc()
+
+    def _count_miss(self) -> None:
+        self.misses += 1
+        self._miss_counter.inc()
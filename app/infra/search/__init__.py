@@ -0,0 +1 @@
+"""Full-text search over chat titles and message texts."""
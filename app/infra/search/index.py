@@ -0,0 +1,198 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+
+from app.infra.repositories.messages import BaseChatRepository
+
+CHAT_DOCUMENT = "chat"
+MESSAGE_DOCUMENT = "message"
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_TERM_RE = re.compile(r"(\w+)(\*?)")
+
+# BM25 parameters; the usual defaults.
+_K1 = 1.2
+_B = 0.75
+
+
+def normalize(text: str) -> str:
+    # "ё" is routinely typed as "е", so both spellings must match.
+    return text.casefold().replace("ё", "е")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase words; ``\\w`` covers Cyrillic letters."""
+    return _TOKEN_RE.findall(normalize(text))
+
+
+@dataclass(frozen=True, slots=True)
+class SearchDocument:
+    kind: str
+    oid: str
+    chat_oid: str
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    document: SearchDocument
+    score: float
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    total: int
+    hits: list[SearchHit]
+
+
+@dataclass(eq=False)
+class InvertedIndex:
+    """In-memory inverted index over chat titles and message texts.
+
+    Every term maps to the documents containing it with its term frequency.
+    Terms are also kept sorted, so a prefix query (``прив*``) is a range
+    scan instead of a pass over the whole vocabulary. Results must match
+    every query term and are ranked with BM25; ties go to newer documents.
+    Documents are keyed by oid, so replayed events are ignored.
+    """
+
+    max_prefix_expansions: int = 256
+    _documents: list[SearchDocument] = field(default_factory=list, kw_only=True)
+    _document_ids: dict[str, int] = field(default_factory=dict, kw_only=True)
+    _postings: dict[str, dict[int, int]] = field(default_factory=dict, kw_only=True)
+    _terms: list[str] = field(default_factory=list, kw_only=True)
+    _lengths: list[int] = field(default_factory=list, kw_only=True)
+    _total_length: int = field(default=0, kw_only=True)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    @property
+    def terms_count(self) -> int:
+        return len(self._terms)
+
+    @property
+    def postings_count(self) -> int:
+        return sum(len(postings) for postings in self._postings.values())
+
+    def add_chat(self, chat_oid: str, title: str) -> bool:
+        return self._add(CHAT_DOCUMENT, chat_oid, chat_oid, title)
+
+    def add_message(self, chat_oid: str, message_oid: str, text: str) -> bool:
+        return self._add(MESSAGE_DOCUMENT, message_oid, chat_oid, text)
+
+    def search(self, query: str, *, limit: int = 20, offset: int = 0) -> SearchResult:
+        scores = self._score(query)
+        if not scores:
+            return SearchResult(total=0, hits=[])
+
+        documents = self._documents
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        hits = [SearchHit(document=documents[doc_id], score=score) for doc_id, score in top[offset:]]
+        return SearchResult(total=len(scores), hits=hits)
+
+    def _add(self, kind: str, oid: str, chat_oid: str, text: str) -> bool:
+        if oid in self._document_ids:
+            return False
+
+        tokens = tokenize(text)
+        doc_id = len(self._documents)
+        self._documents.append(SearchDocument(kind=kind, oid=oid, chat_oid=chat_oid, text=text))
+        self._document_ids[oid] = doc_id
+        self._lengths.append(len(tokens))
+        self._total_length += len(tokens)
+
+        frequencies: dict[str, int] = {}
+        for token in tokens:
+            frequencies[token] = frequencies.get(token, 0) + 1
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[doc_id] = frequency
+        return True
+
+    def _expand(self, term: str, prefix: bool) -> list[str]:
+        if not prefix:
+            return [term] if term in self._postings else []
+
+        terms = self._terms
+        expanded = []
+        index = bisect_left(terms, term)
+        while index < len(terms) and terms[index].startswith(term):
+            expanded.append(terms[index])
+            if len(expanded) == self.max_prefix_expansions:
+                break
+            index += 1
+        return expanded
+
+    def _score(self, query: str) -> dict[int, float]:
+        query_terms = [
+            self._expand(term, prefix == "*")
+            for term, prefix in _QUERY_TERM_RE.findall(normalize(query))
+        ]
+        if not query_terms or not all(query_terms):
+            return {}
+
+        documents_count = len(self._documents)
+        average_length = self._total_length / documents_count or 1.0
+        lengths = self._lengths
+        base_norm = _K1 * (1 - _B)
+        length_norm = _K1 * _B / average_length
+        # The rarest query term goes first so the candidate set only shrinks.
+        query_terms.sort(key=lambda terms: sum(len(self._postings[term]) for term in terms))
+
+        scores: dict[int, float] | None = None
+        for terms in query_terms:
+            term_scores: dict[int, float] = {}
+            best = term_scores.get
+            for term in terms:
+                postings = self._postings[term]
+                idf = math.log(1 + (documents_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                weight = idf * (_K1 + 1)
+                candidates = postings.items() if scores is None else (
+                    (doc_id, postings[doc_id]) for doc_id in scores if doc_id in postings
+                )
+                for doc_id, frequency in candidates:
+                    score = weight * frequency / (frequency + base_norm + length_norm * lengths[doc_id])
+                    # A prefix counts once per document, by its best expansion.
+                    if score > best(doc_id, 0.0):
+                        term_scores[doc_id] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: scores[doc_id] + score for doc_id, score in term_scores.items()}
+            if not scores:
+                return {}
+        return scores
+
+
+async def index_repository(index: InvertedIndex, repository: BaseChatRepository, page_size: int = 500) -> int:
+    """Add every chat and message already stored to the index.
+
+    Events only cover writes made while the process runs, so persistent
+    repositories are indexed once at startup. Returns the documents added.
+    """
+    added = 0
+    after = None
+    while True:
+        chats = await repository.list_chats(limit=page_size, after=after)
+        for chat in chats:
+            added += index.add_chat(chat.oid, chat.title.as_generic_type())
+            before = None
+            while True:
+                messages = await repository.get_messages(chat.oid, limit=page_size, before=before)
+                if not messages:
+                    break
+                for message in messages:
+                    added += index.add_message(chat.oid, message.oid, message.text.as_generic_type())
+                if len(messages) < page_size:
+                    break
+                before = (messages[0].created_at, messages[0].oid)
+        if len(chats) < page_size:
+            return added
+        after = (chats[-1].created_at, chats[-1].oid)
@@ -0,0 +1 @@
+"""Conversion of domain events to and from wire formats."""
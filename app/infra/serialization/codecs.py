@@ -0,0 +1,71 @@
+import json
+from typing import Any, Protocol
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with FastAPI extras
+    orjson = None
+
+
+class EventCodec(Protocol):
+    content_type: str
+
+    def encode(self, envelope: dict) -> bytes:
+        ...
+
+    def decode(self, data: bytes) -> dict:
+        ...
+
+
+class JSONCodec:
+    """UTF-8 JSON, through orjson when it is installed."""
+
+    content_type = "application/json"
+
+    def encode(self, envelope: dict) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(envelope)
+        return json.dumps(envelope, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes) -> dict:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class MsgpackCodec:
+    """Compact binary encoding; requires the optional msgpack package."""
+
+    content_type = "application/msgpack"
+
+    def __init__(self) -> None:
+        try:
+            import msgpack
+        except ImportError as exc:
+            raise RuntimeError(
+                "The msgpack codec requires the msgpack package. "
+                "Install the msgpack extra or set KAFKA_CODEC=json."
+            ) from exc
+        self._msgpack: Any = msgpack
+
+    def encode(self, envelope: dict) -> bytes:
+        return self._msgpack.packb(envelope, use_bin_type=True)
+
+    def decode(self, data: bytes) -> dict:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+_CODEC_FACTORIES = {
+    "json": JSONCodec,
+    JSONCodec.content_type: JSONCodec,
+    "msgpack": MsgpackCodec,
+    MsgpackCodec.content_type: MsgpackCodec,
+}
+
+
+def get_codec(name: str) -> EventCodec:
+    """Return a codec by short name (``json``, ``msgpack``) or content type."""
+    try:
+        return _CODEC_FACTORIES[name]()
+    except KeyError as exc:
+        raise ValueError(f"Unknown event codec: {name}") from exc
@@ -0,0 +1,113 @@
+from collections.abc import Callable
+from dataclasses import fields
+from datetime import datetime
+from operator import attrgetter
+from uuid import UUID
+
+from app.domain.events.base import BaseEvent
+from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
+
+EnvelopeUpcaster = Callable[[dict], dict]
+
+
+class UnknownEventTypeError(ValueError):
+    pass
+
+
+class UnsupportedSchemaVersionError(ValueError):
+    pass
+
+
+class EventSerializer:
+    """Converts one event type to plain dicts without ``dataclasses.asdict``.
+
+    Field names are resolved once per type and read with a single
+    ``attrgetter`` call, which avoids the recursive deep copy ``asdict``
+    performs on every event.
+    """
+
+    def __init__(self, event_class: type[BaseEvent], schema_version: int = 1) -> None:
+        self.event_class = event_class
+        self.schema_version = schema_version
+        self._names = tuple(
+            field.name for field in fields(event_class) if field.name not in ("event_id", "occurred_at")
+        )
+        self._getter = attrgetter(*self._names) if self._names else None
+
+    def to_dict(self, event: BaseEvent) -> dict:
+        payload = {"event_id": str(event.event_id), "occurred_at": event.occurred_at.isoformat()}
+        if len(self._names) == 1:
+            payload[self._names[0]] = self._getter(event)
+        elif self._names:
+            payload.update(zip(self._names, self._getter(event)))
+        return payload
+
+    def from_dict(self, payload: dict) -> BaseEvent:
+        values = {name: payload[name] for name in self._names}
+        if "event_id" in payload:
+            values["event_id"] = UUID(str(payload["event_id"]))
+        # Payloads written before events were timestamped lack it.
+        if "occurred_at" in payload:
+            values["occurred_at"] = datetime.fromisoformat(payload["occurred_at"])
+        return self.event_class(**values)
+
+
+EVENT_SERIALIZERS: dict[str, EventSerializer] = {
+    serializer.event_class.__name__: serializer
+    for serializer in (
+        EventSerializer(NewChatCreated),
+        EventSerializer(NewMessageReceivedEvent),
+    )
+}
+EVENT_TYPES: dict[str, type[BaseEvent]] = {
+    name: serializer.event_class for name, serializer in EVENT_SERIALIZERS.items()
+}
+
+# (event type, version) -> function turning that version's payload into the next one.
+UPCASTERS: dict[tuple[str, int], EnvelopeUpcaster] = {}
+
+
+def _serializer_for(event_type: str) -> EventSerializer:
+    try:
+        return EVENT_SERIALIZERS[event_type]
+    except KeyError as exc:
+        raise UnknownEventTypeError(event_type) from exc
+
+
+def event_to_dict(event: BaseEvent) -> dict:
+    """Return the event fields as JSON-compatible primitives."""
+    return _serializer_for(event.__class__.__name__).to_dict(event)
+
+
+def event_from_dict(event_type: str, payload: dict, schema_version: int | None = None) -> BaseEvent:
+    serializer = _serializer_for(event_type)
+    version = schema_version or serializer.schema_version
+    if version > serializer.schema_version:
+        raise UnsupportedSchemaVersionError(f"{event_type} v{version}")
+
+    while version < serializer.schema_version:
+        try:
+            payload = UPCASTERS[(event_type, version)](payload)
+        except KeyError as exc:
+            raise UnsupportedSchemaVersionError(f"{event_type} v{version}") from exc
+        version += 1
+    return serializer.from_dict(payload)
+
+
+def event_to_envelope(event: BaseEvent) -> dict:
+    event_type = event.__class__.__name__
+    serializer = _serializer_for(event_type)
+    return {
+        "type": event_type,
+        "version": serializer.schema_version,
+        "payload": serializer.to_dict(event),
+    }
+
+
+def event_from_envelope(envelope: dict) -> BaseEvent:
+    # Envelopes written before versioning carry no "version" and are v1.
+    return event_from_dict(envelope["type"], envelope["payload"], envelope.get("version", 1))
+
+
+def schema_version_of(event: BaseEvent) -> int:
+    return _serializer_for(event.__class__.__name__).schema_version
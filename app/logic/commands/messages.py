@@ -1,6 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
 
-from app.domain.entities.messages import Chat, Message
+from app.domain.entities.messages import Chat, Message, MessageLog
+from app.domain.exceptions.messages import ApplicationException
+from app.domain.values.cursors import Cursor
 from app.domain.values.messages import Text, Title
 from app.infra.repositories.messages import BaseChatRepository
 from app.logic.commands.base import BaseCommand, CommandHandler, CT, CR
@@ -8,6 +11,7 @@ from app.logic.exceptions.messages import (
     ChatNotFoundException,
     CheckWithThatTitleAlreadyExistsException,
 )
+from app.logic.locks import StripedLocks
 from app.logic.mediator import Mediator
 
 
@@ -18,12 +22,17 @@ class CreateChatCommand(BaseCommand):
 
 @dataclass(frozen=True)
 class ListChatsCommand(BaseCommand):
-    ...
+    limit: int | None = None
+    after: str | None = None
+    created_after: datetime | None = None
+    title_prefix: str | None = None
 
 
 @dataclass(frozen=True)
 class GetChatCommand(BaseCommand):
     chat_oid: str
+    # Only the newest messages are loaded when set; None loads the history.
+    messages_limit: int | None = None
 
 
 @dataclass(frozen=True)
@@ -32,21 +41,37 @@ class CreateMessageCommand(BaseCommand):
     text: str
 
 
+@dataclass(frozen=True)
+class CreateMessagesBatchCommand(BaseCommand):
+    chat_oid: str
+    texts: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class MessageBatchItemResult:
+    message: Message | None = None
+    error: ApplicationException | None = None
+
+
+@dataclass(frozen=True)
+class GetMessagesCommand(BaseCommand):
+    chat_oid: str
+    limit: int
+    after: str | None = None
+    before: str | None = None
+
+
 @dataclass(frozen=True)
 class CreateChatCommandHandler(CommandHandler[CreateChatCommand, Chat]):
     chat_repository: BaseChatRepository
     mediator: Mediator
 
     async def handle(self, command: CreateChatCommand) -> Chat:
-        if await self.chat_repository.check_chat_exists_by_title(command.title):
-            raise CheckWithThatTitleAlreadyExistsException(command.title)
-
         title = Title(value=command.title)
         new_chat = Chat.create_chat(title=title)
-        await self.chat_repository.add_chat(new_chat)
-        events = new_chat.pull_events()
-        for event in events:
-            await self.mediator.handle_event(event)
+        if not await self.chat_repository.add_chat_if_absent(new_chat):
+            raise CheckWithThatTitleAlreadyExistsException(command.title)
+        await self.mediator.publish_events(new_chat.pull_events())
 
         return new_chat
 
@@ -56,7 +81,17 @@ class ListChatsCommandHandler(CommandHandler[ListChatsCommand, list[Chat]]):
     chat_repository: BaseChatRepository
 
     async def handle(self, command: ListChatsCommand) -> list[Chat]:
-        return await self.chat_repository.list_chats()
+        created_after = command.created_after
+        if created_after is not None and created_after.tzinfo is not None:
+            # Entities carry naive local timestamps.
+            created_after = created_after.astimezone().replace(tzinfo=None)
+
+        return await self.chat_repository.list_chats(
+            limit=command.limit,
+            after=Cursor(value=command.after).as_key() if command.after else None,
+            created_after=created_after,
+            title_prefix=command.title_prefix,
+        )
 
 
 @dataclass(frozen=True)
@@ -64,23 +99,92 @@ class GetChatCommandHandler(CommandHandler[GetChatCommand, Chat]):
     chat_repository: BaseChatRepository
 
     async def handle(self, command: GetChatCommand) -> Chat:
-        chat = await self.chat_repository.get_chat_by_oid(command.chat_oid)
+        if command.messages_limit is None:
+            chat = await self.chat_repository.get_chat_by_oid(command.chat_oid)
+            if chat is None:
+                raise ChatNotFoundException(command.chat_oid)
+            return chat
+
+        chat = await self.chat_repository.get_chat_metadata(command.chat_oid)
         if chat is None:
             raise ChatNotFoundException(command.chat_oid)
-        return chat
+        messages = await self.chat_repository.get_messages(command.chat_oid, limit=command.messages_limit)
+        return Chat(
+            oid=chat.oid,
+            title=chat.title,
+            created_at=chat.created_at,
+            messages=MessageLog(messages or ()),
+        )
 
 
 @dataclass(frozen=True)
 class CreateMessageCommandHandler(CommandHandler[CreateMessageCommand, Message]):
+    """Append one message under the chat's lock.
+
+    The stored chat collects the events of every writer, so the append and
+    ``pull_events`` must not interleave with another request to the chat.
+    """
+
     chat_repository: BaseChatRepository
     mediator: Mediator
+    chat_locks: StripedLocks = field(default_factory=StripedLocks, kw_only=True)
 
     async def handle(self, command: CreateMessageCommand) -> Message:
         message = Message(text=Text(value=command.text))
-        chat = await self.chat_repository.add_message(command.chat_oid, message)
-        if chat is None:
-            raise ChatNotFoundException(command.chat_oid)
-        events = chat.pull_events()
-        for event in events:
-            await self.mediator.handle_event(event)
+        async with self.chat_locks.for_key(command.chat_oid):
+            chat = await self.chat_repository.add_message(command.chat_oid, message)
+            if chat is None:
+                raise ChatNotFoundException(command.chat_oid)
+            events = chat.pull_events()
+        await self.mediator.publish_events(events)
         return message
+
+
+@dataclass(frozen=True)
+class CreateMessagesBatchCommandHandler(
+    CommandHandler[CreateMessagesBatchCommand, list[MessageBatchItemResult]],
+):
+    """Validate every text, then append the valid ones in one repository call.
+
+    Invalid items are reported in place and do not fail the batch; a missing
+    chat fails it as a whole. Takes the same chat lock as single messages.
+    """
+
+    chat_repository: BaseChatRepository
+    mediator: Mediator
+    chat_locks: StripedLocks = field(default_factory=StripedLocks, kw_only=True)
+
+    async def handle(self, command: CreateMessagesBatchCommand) -> list[MessageBatchItemResult]:
+        results = []
+        for text in command.texts:
+            try:
+                results.append(MessageBatchItemResult(message=Message(text=Text(value=text))))
+            except ApplicationException as exception:
+                results.append(MessageBatchItemResult(error=exception))
+
+        messages = [result.message for result in results if result.message is not None]
+        async with self.chat_locks.for_key(command.chat_oid):
+            chat = await self.chat_repository.add_messages(command.chat_oid, messages)
+            if chat is None:
+                raise ChatNotFoundException(command.chat_oid)
+            events = chat.pull_events()
+        await self.mediator.publish_events(events)
+        return results
+
+
+@dataclass(frozen=True)
+class GetMessagesCommandHandler(CommandHandler[GetMessagesCommand, list[Message]]):
+    chat_repository: BaseChatRepository
+
+    async def handle(self, command: GetMessagesCommand) -> list[Message]:
+        after = Cursor(value=command.after).as_key() if command.after else None
+        before = Cursor(value=command.before).as_key() if command.before else None
+        messages = await self.chat_repository.get_messages(
+            command.chat_oid,
+            limit=command.limit,
+            after=after,
+            before=before,
+        )
+        if messages is None:
+            raise ChatNotFoundException(command.chat_oid)
+        return messages
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Generic, TypeVar, Any
 
 from app.domain.events.base import BaseEvent
@@ -9,6 +9,16 @@ ER = TypeVar(name='ER', bound=Any)
 
 @dataclass
 class EventHandler(ABC, Generic[ET, ER]):
+    # Seconds the handler may run before it is cancelled; None defers to the mediator.
+    timeout: float | None = field(default=None, kw_only=True)
+    # Non-critical handlers may run in the background, see Mediator.background_non_critical.
+    critical: bool = field(default=True, kw_only=True)
+    # Deferred handlers run from the outbox relay when the mediator has an outbox.
+    deferred: bool = field(default=False, kw_only=True)
+
     @abstractmethod
     async def handle(self, event: ET) -> ER:
         ...
+
+    async def handle_many(self, events: list[ET]) -> list[ER]:
+        return [await self.handle(event) for event in events]
@@ -1,7 +1,13 @@
 from dataclasses import dataclass
 
+from app.domain.events.base import BaseEvent
 from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
+from app.infra.bus.events import EventBus
+from app.infra.cache.responses import CHAT_ACTIVITY_LIST_TAG, CHAT_LIST_TAG, ResponseCache, chat_tag
 from app.infra.kafka.producer import EventPublisher
+from app.infra.push.broadcaster import INBOX_TOPIC, ChatBroadcaster
+from app.infra.read_models.chat_activity import MemoryChatActivityReadModel
+from app.infra.search.index import InvertedIndex
 from app.logic.events.base import EventHandler
 
 
@@ -12,6 +18,10 @@ class NewChatCreatedHandler(EventHandler[NewChatCreated, None]):
     async def handle(self, event: NewChatCreated) -> None:
         await self.producer.publish(event)
 
+    async def handle_many(self, events: list[NewChatCreated]) -> list[None]:
+        await self.producer.publish_batch(events)
+        return [None] * len(events)
+
 
 @dataclass
 class NewMessageReceivedEventHandler(EventHandler[NewMessageReceivedEvent, None]):
@@ -19,3 +29,93 @@ class NewMessageReceivedEventHandler(EventHandler[NewMessageReceivedEvent, None]
 
     async def handle(self, event: NewMessageReceivedEvent) -> None:
         await self.producer.publish(event)
+
+    async def handle_many(self, events: list[NewMessageReceivedEvent]) -> list[None]:
+        await self.producer.publish_batch(events)
+        return [None] * len(events)
+
+
+@dataclass
+class PushNewChatCreatedHandler(EventHandler[NewChatCreated, None]):
+    broadcaster: ChatBroadcaster
+
+    async def handle(self, event: NewChatCreated) -> None:
+        self.broadcaster.publish(event, topics=(INBOX_TOPIC,))
+
+
+@dataclass
+class PushNewMessageReceivedHandler(EventHandler[NewMessageReceivedEvent, None]):
+    broadcaster: ChatBroadcaster
+
+    async def handle(self, event: NewMessageReceivedEvent) -> None:
+        self.broadcaster.publish(event, topics=(event.chat_oid, INBOX_TOPIC))
+
+
+@dataclass
+class InvalidateChatListCacheHandler(EventHandler[NewChatCreated, None]):
+    cache: ResponseCache
+
+    async def handle(self, event: NewChatCreated) -> None:
+        self.cache.invalidate(CHAT_LIST_TAG)
+        self.cache.invalidate(CHAT_ACTIVITY_LIST_TAG)
+
+
+@dataclass
+class InvalidateChatCacheHandler(EventHandler[NewMessageReceivedEvent, None]):
+    cache: ResponseCache
+
+    async def handle(self, event: NewMessageReceivedEvent) -> None:
+        # Also drops the list pages by creation time that show this chat.
+        self.cache.invalidate(chat_tag(event.chat_oid))
+        # The chat moves to the front of the pages by activity.
+        self.cache.invalidate(CHAT_ACTIVITY_LIST_TAG)
+
+
+@dataclass
+class IndexNewChatHandler(EventHandler[NewChatCreated, None]):
+    index: InvertedIndex
+
+    async def handle(self, event: NewChatCreated) -> None:
+        self.index.add_chat(event.chat_oid, event.chat_title)
+
+
+@dataclass
+class IndexNewMessageHandler(EventHandler[NewMessageReceivedEvent, None]):
+    index: InvertedIndex
+
+    async def handle(self, event: NewMessageReceivedEvent) -> None:
+        self.index.add_message(event.chat_oid, event.message_oid, event.message_text)
+
+
+@dataclass
+class PublishToEventBusHandler(EventHandler[BaseEvent, None]):
+    bus: EventBus
+
+    async def handle(self, event: BaseEvent) -> None:
+        await self.bus.publish([event])
+
+    async def handle_many(self, events: list[BaseEvent]) -> list[None]:
+        await self.bus.publish(events)
+        return [None] * len(events)
+
+
+@dataclass
+class ChatActivityChatCreatedHandler(EventHandler[NewChatCreated, None]):
+    read_model: MemoryChatActivityReadModel
+
+    async def handle(self, event: NewChatCreated) -> None:
+        self.read_model.apply_chat_created(event.event_id, event.chat_oid, event.chat_title, event.occurred_at)
+
+
+@dataclass
+class ChatActivityMessageReceivedHandler(EventHandler[NewMessageReceivedEvent, None]):
+    read_model: MemoryChatActivityReadModel
+
+    async def handle(self, event: NewMessageReceivedEvent) -> None:
+        self.read_model.apply_message_received(
+            event.event_id,
+            event.chat_oid,
+            event.message_oid,
+            event.message_text,
+            event.occurred_at,
+        )
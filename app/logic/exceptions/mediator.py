@@ -15,4 +15,13 @@ class CommandHandlersNotRegisteredException(LogicException):
     command_type: type
     @property
     def message(self):
-        return f'Не удалось найти обработчики для команды: {self.command_type}'
\ No newline at end of file
+        return f'Не удалось найти обработчики для команды: {self.command_type}'
+
+@dataclass(eq=False)
+class EventHandlersFailedException(LogicException):
+    event_type: type
+    errors: list[BaseException]
+
+    @property
+    def message(self):
+        return f'Обработчики события {self.event_type} завершились с ошибками: {len(self.errors)}'
@@ -1,39 +1,122 @@
 import os
+import uuid
+from functools import partial
 
 from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
+from app.domain.ids import IdGenerator, UUID7Generator
+from app.infra.bus.events import EventBus, UnixSocketEventBus, default_node_id
+from app.infra.bus.kafka import KafkaEventBus
+from app.infra.cache.responses import ResponseCache
 from app.infra.kafka.config import KafkaBrokerConfig
-from app.infra.kafka.producer import EventPublisher, KafkaEventProducer, NoopEventPublisher
+from app.infra.kafka.producer import (
+    BufferedKafkaEventProducer,
+    EventPublisher,
+    KafkaEventProducer,
+    NoopEventPublisher,
+)
+from app.infra.metrics.registry import NOOP_METRICS, Metrics, MetricsRegistry
+from app.infra.mongo.client import get_mongo_client
+from app.infra.outbox.relay import OutboxRelay
+from app.infra.outbox.stores import BaseOutboxStore, MemoryOutboxStore, SQLiteOutboxStore
+from app.infra.mongo.config import MongoDBConfig
+from app.infra.push.broadcaster import ChatBroadcaster
+from app.infra.repositories.durable import DurableMemoryChatRepository
+from app.infra.repositories.instrumented import InstrumentedChatRepository
 from app.infra.repositories.messages import MemoryChatRepository, BaseChatRepository
+from app.infra.repositories.mongo import MongoChatRepository
+from app.infra.repositories.sqlite import SQLiteChatRepository
+from app.infra.repositories.tiered import TieredChatRepository
+from app.infra.search.index import InvertedIndex
 from app.logic.commands.messages import (
     CreateChatCommand,
     CreateChatCommandHandler,
     CreateMessageCommand,
     CreateMessageCommandHandler,
+    CreateMessagesBatchCommand,
+    CreateMessagesBatchCommandHandler,
     GetChatCommand,
     GetChatCommandHandler,
+    GetMessagesCommand,
+    GetMessagesCommandHandler,
     ListChatsCommand,
     ListChatsCommandHandler,
 )
-from app.logic.events.messages import NewChatCreatedHandler, NewMessageReceivedEventHandler
+from app.infra.read_models.chat_activity import MemoryChatActivityReadModel
+from app.logic.events.messages import (
+    ChatActivityChatCreatedHandler,
+    ChatActivityMessageReceivedHandler,
+    IndexNewChatHandler,
+    IndexNewMessageHandler,
+    InvalidateChatCacheHandler,
+    InvalidateChatListCacheHandler,
+    NewChatCreatedHandler,
+    NewMessageReceivedEventHandler,
+    PublishToEventBusHandler,
+    PushNewChatCreatedHandler,
+    PushNewMessageReceivedHandler,
+)
+from app.logic.locks import StripedLocks
 from app.logic.mediator import Mediator
 
 
+def build_mediator(
+    outbox: BaseOutboxStore | None = None,
+    metrics: Metrics = NOOP_METRICS,
+) -> Mediator:
+    handler_timeout = os.getenv("MEDIATOR_HANDLER_TIMEOUT", "").strip()
+    return Mediator(
+        outbox=outbox,
+        concurrent_events=_env_flag("MEDIATOR_CONCURRENT_EVENTS"),
+        handler_timeout=float(handler_timeout) if handler_timeout else None,
+        background_non_critical=_env_flag("MEDIATOR_BACKGROUND_NON_CRITICAL"),
+        metrics=metrics,
+    )
+
+
 def init_mediator(
     mediator: Mediator,
     chat_repository: BaseChatRepository | None = None,
     event_publisher: EventPublisher | None = None,
+    broadcaster: ChatBroadcaster | None = None,
+    response_cache: ResponseCache | None = None,
+    event_bus: EventBus | None = None,
+    search_index: InvertedIndex | None = None,
+    chat_activity: MemoryChatActivityReadModel | None = None,
 ) -> BaseChatRepository:
-    repository = chat_repository or MemoryChatRepository()
-    producer = event_publisher or _build_event_publisher()
+    repository = chat_repository or build_chat_repository(mediator.metrics, mediator.outbox)
+    if mediator.metrics.enabled:
+        repository = InstrumentedChatRepository(repository=repository, metrics=mediator.metrics)
+    producer = event_publisher or build_event_publisher(mediator.metrics, mediator.outbox)
+    broadcaster = broadcaster or ChatBroadcaster()
 
-    mediator.register_event(
-        NewChatCreated,
-        [NewChatCreatedHandler(producer=producer)],
-    )
-    mediator.register_event(
-        NewMessageReceivedEvent,
-        [NewMessageReceivedEventHandler(producer=producer)],
-    )
+    # Kafka publishing is the only side effect that leaves the process, so
+    # with an outbox it alone waits for the relay.
+    chat_created_handlers = [
+        NewChatCreatedHandler(producer=producer, deferred=True),
+        # Stream clients re-fetch after gaps, so a lost push is tolerable.
+        PushNewChatCreatedHandler(broadcaster=broadcaster, critical=False),
+    ]
+    message_received_handlers = [
+        NewMessageReceivedEventHandler(producer=producer, deferred=True),
+        PushNewMessageReceivedHandler(broadcaster=broadcaster, critical=False),
+    ]
+    if response_cache is not None:
+        chat_created_handlers.insert(0, InvalidateChatListCacheHandler(cache=response_cache))
+        message_received_handlers.insert(0, InvalidateChatCacheHandler(cache=response_cache))
+    if chat_activity is not None:
+        # Before cache invalidation, so a refilled list page sees the update.
+        chat_created_handlers.insert(0, ChatActivityChatCreatedHandler(read_model=chat_activity))
+        message_received_handlers.insert(0, ChatActivityMessageReceivedHandler(read_model=chat_activity))
+    if search_index is not None:
+        chat_created_handlers.append(IndexNewChatHandler(index=search_index))
+        message_received_handlers.append(IndexNewMessageHandler(index=search_index))
+    if event_bus is not None:
+        # Other nodes re-fetch after gaps, like stream clients do.
+        chat_created_handlers.append(PublishToEventBusHandler(bus=event_bus, critical=False))
+        message_received_handlers.append(PublishToEventBusHandler(bus=event_bus, critical=False))
+
+    mediator.register_event(NewChatCreated, chat_created_handlers)
+    mediator.register_event(NewMessageReceivedEvent, message_received_handlers)
     mediator.register_command(
         CreateChatCommand,
         [CreateChatCommandHandler(chat_repository=repository, mediator=mediator)],
@@ -46,15 +129,166 @@ def init_mediator(
         GetChatCommand,
         [GetChatCommandHandler(chat_repository=repository)],
     )
+    chat_locks = StripedLocks(stripes=int(os.getenv("CHAT_LOCK_STRIPES", "1024")))
     mediator.register_command(
         CreateMessageCommand,
-        [CreateMessageCommandHandler(chat_repository=repository, mediator=mediator)],
+        [CreateMessageCommandHandler(
+            chat_repository=repository,
+            mediator=mediator,
+            chat_locks=chat_locks,
+        )],
+    )
+    mediator.register_command(
+        CreateMessagesBatchCommand,
+        [CreateMessagesBatchCommandHandler(
+            chat_repository=repository,
+            mediator=mediator,
+            chat_locks=chat_locks,
+        )],
+    )
+    mediator.register_command(
+        GetMessagesCommand,
+        [GetMessagesCommandHandler(chat_repository=repository)],
     )
     return repository
 
 
-def _build_event_publisher() -> EventPublisher:
-    kafka_enabled = os.getenv("KAFKA_ENABLED", "false").strip().lower()
-    if kafka_enabled in {"1", "true", "yes", "on"}:
-        return KafkaEventProducer(config=KafkaBrokerConfig())
+def init_fanout_mediator(
+    mediator: Mediator,
+    broadcaster: ChatBroadcaster,
+    response_cache: ResponseCache | None = None,
+    search_index: InvertedIndex | None = None,
+    chat_activity: MemoryChatActivityReadModel | None = None,
+) -> None:
+    """Register handlers for events written on other nodes.
+
+    Only node-local side effects are needed: the writing node has already
+    stored the data and published it to Kafka.
+    """
+    chat_created_handlers = [PushNewChatCreatedHandler(broadcaster=broadcaster)]
+    message_received_handlers = [PushNewMessageReceivedHandler(broadcaster=broadcaster)]
+    if response_cache is not None:
+        chat_created_handlers.insert(0, InvalidateChatListCacheHandler(cache=response_cache))
+        message_received_handlers.insert(0, InvalidateChatCacheHandler(cache=response_cache))
+    if chat_activity is not None:
+        chat_created_handlers.insert(0, ChatActivityChatCreatedHandler(read_model=chat_activity))
+        message_received_handlers.insert(0, ChatActivityMessageReceivedHandler(read_model=chat_activity))
+    if search_index is not None:
+        chat_created_handlers.append(IndexNewChatHandler(index=search_index))
+        message_received_handlers.append(IndexNewMessageHandler(index=search_index))
+
+    mediator.register_event(NewChatCreated, chat_created_handlers)
+    mediator.register_event(NewMessageReceivedEvent, message_received_handlers)
+
+
+def build_chat_repository(
+    metrics: Metrics = NOOP_METRICS,
+    outbox: BaseOutboxStore | None = None,
+) -> BaseChatRepository:
+    backend = os.getenv("CHAT_REPOSITORY", "memory").strip().lower()
+    if outbox is not None and backend not in {"memory", "sqlite"}:
+        raise ValueError(f"CHAT_REPOSITORY={backend} cannot write an outbox; use memory or sqlite")
+    if backend == "mongo":
+        config = MongoDBConfig()
+        return MongoChatRepository(
+            mongo_client=get_mongo_client(config),
+            database_name=config.database,
+            chats_collection_name=config.chats_collection,
+            messages_collection_name=config.messages_collection,
+        )
+    if backend == "sqlite":
+        return SQLiteChatRepository(path=os.getenv("CHAT_SQLITE_PATH", "chats.sqlite3"), outbox=outbox)
+    if backend == "durable":
+        return DurableMemoryChatRepository(
+            directory=os.getenv("CHAT_DURABLE_DIR", "chat-data"),
+            fsync=os.getenv("CHAT_DURABLE_FSYNC", "on").strip().lower() not in {"0", "false", "no", "off"},
+            commit_interval=float(os.getenv("CHAT_DURABLE_COMMIT_INTERVAL", "0")),
+            compact_after_bytes=int(os.getenv("CHAT_DURABLE_COMPACT_BYTES", str(64 * 1024 * 1024))),
+        )
+    if backend == "tiered":
+        return TieredChatRepository(
+            cold=SQLiteChatRepository(path=os.getenv("CHAT_SQLITE_PATH", "chats.sqlite3")),
+            max_chats=int(os.getenv("CHAT_TIERED_MAX_CHATS", "10000")),
+            max_messages=int(os.getenv("CHAT_TIERED_MAX_MESSAGES", "1000000")),
+            write_back=_env_flag("CHAT_TIERED_WRITE_BACK"),
+            metrics=metrics,
+        )
+    return MemoryChatRepository(outbox=outbox)
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def build_id_generator() -> IdGenerator:
+    if os.getenv("CHAT_ID_GENERATOR", "uuid7").strip().lower() == "uuid4":
+        return uuid.uuid4
+    return UUID7Generator()
+
+
+def build_search_index() -> InvertedIndex | None:
+    setting = os.getenv("CHAT_SEARCH", "").strip().lower()
+    if not setting:
+        # The index holds the text of every chat in memory, which would undo
+        # the memory bound of repositories that keep their data on disk.
+        repository = os.getenv("CHAT_REPOSITORY", "memory").strip().lower()
+        setting = "on" if repository in {"memory", "durable"} else "off"
+    if setting in {"0", "false", "no", "off"}:
+        return None
+    return InvertedIndex()
+
+
+def build_metrics() -> Metrics:
+    if os.getenv("CHAT_METRICS", "on").strip().lower() in {"0", "false", "no", "off"}:
+        return NOOP_METRICS
+    return MetricsRegistry()
+
+
+def build_event_publisher(
+    metrics: Metrics = NOOP_METRICS,
+    outbox: BaseOutboxStore | None = None,
+) -> EventPublisher:
+    if _env_flag("KAFKA_ENABLED"):
+        config = KafkaBrokerConfig()
+        # The relay marks records done once the publish returns, so it needs
+        # a producer that waits for the broker; it batches records itself.
+        if config.publish_mode == "batch" and outbox is None:
+            return BufferedKafkaEventProducer(config=config, metrics=metrics)
+        return KafkaEventProducer(config=config, metrics=metrics)
     return NoopEventPublisher()
+
+
+def build_outbox_store() -> BaseOutboxStore | None:
+    backend = os.getenv("CHAT_OUTBOX", "off").strip().lower()
+    if backend not in {"memory", "sqlite"}:
+        return None
+    # The repository writes the outbox in its own transaction, so both
+    # must live in the same store.
+    repository = os.getenv("CHAT_REPOSITORY", "memory").strip().lower()
+    if repository != backend:
+        raise ValueError(f"CHAT_OUTBOX={backend} needs CHAT_REPOSITORY={backend}, not {repository}")
+    if backend == "memory":
+        return MemoryOutboxStore()
+    return SQLiteOutboxStore(
+        path=os.getenv("CHAT_SQLITE_PATH", "chats.sqlite3"),
+        claim_timeout=float(os.getenv("CHAT_OUTBOX_CLAIM_TIMEOUT", "30")),
+    )
+
+
+def build_outbox_relay(mediator: Mediator, store: BaseOutboxStore) -> OutboxRelay:
+    return OutboxRelay(
+        store=store,
+        dispatch=partial(mediator.handle_events, deferred=True),
+        batch_size=int(os.getenv("CHAT_OUTBOX_BATCH_SIZE", "100")),
+        poll_interval=float(os.getenv("CHAT_OUTBOX_POLL_INTERVAL", "1.0")),
+    )
+
+
+def build_event_bus() -> EventBus | None:
+    backend = os.getenv("CHAT_BUS", "off").strip().lower()
+    node_id = os.getenv("CHAT_NODE_ID") or default_node_id()
+    if backend == "socket":
+        return UnixSocketEventBus(path=os.getenv("CHAT_BUS_SOCKET", "/tmp/chat-bus.sock"), node_id=node_id)
+    if backend == "kafka":
+        return KafkaEventBus(KafkaBrokerConfig(), node_id=node_id)
+    return None
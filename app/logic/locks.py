@@ -0,0 +1,23 @@
+import asyncio
+from dataclasses import dataclass, field
+
+
+@dataclass(eq=False)
+class StripedLocks:
+    """A fixed pool of asyncio locks shared by hashing keys onto it.
+
+    Writes to one chat are serialized while writes to different chats
+    mostly take different locks, so there is no global bottleneck, and
+    memory stays constant however many chats exist. Two chats that share a
+    stripe only wait for each other, which never deadlocks because a
+    holder takes one lock at a time.
+    """
+
+    stripes: int = 1024
+    _locks: list[asyncio.Lock] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._locks = [asyncio.Lock() for _ in range(self.stripes)]
+
+    def for_key(self, key: str) -> asyncio.Lock:
+        return self._locks[hash(key) % self.stripes]
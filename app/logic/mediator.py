@@ -1,12 +1,23 @@
+import asyncio
+import logging
+import time
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Awaitable, Callable, Iterable
 from dataclasses import dataclass, field
 
 
 from app.domain.events.base import BaseEvent
+from app.infra.metrics.registry import NOOP_METRICS, Metrics
+from app.infra.outbox.stores import BaseOutboxStore
 from app.logic.commands.base import CommandHandler, CT, CR, BaseCommand
 from app.logic.events.base import EventHandler, ET, ER
-from app.logic.exceptions.mediator import EventHandlersNotRegisteredException, CommandHandlersNotRegisteredException
+from app.logic.exceptions.mediator import (
+    CommandHandlersNotRegisteredException,
+    EventHandlersFailedException,
+    EventHandlersNotRegisteredException,
+)
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass(eq=False)
@@ -19,6 +30,32 @@ class Mediator:
         default_factory=lambda: defaultdict(list),
         kw_only=True,
     )
+    outbox: BaseOutboxStore | None = field(default=None, kw_only=True)
+    # Run the handlers of one event at the same time instead of one by one.
+    concurrent_events: bool = field(default=False, kw_only=True)
+    # Default timeout for event handlers that do not set their own.
+    handler_timeout: float | None = field(default=None, kw_only=True)
+    # Fire-and-forget handlers marked with critical=False.
+    background_non_critical: bool = field(default=False, kw_only=True)
+    metrics: Metrics = field(default=NOOP_METRICS, kw_only=True)
+    _background_tasks: set[asyncio.Task] = field(default_factory=set, init=False)
+
+    def __post_init__(self) -> None:
+        self._command_duration = self.metrics.histogram(
+            "chat_command_duration_seconds",
+            "Time spent handling a command, including the events it publishes.",
+            ("command",),
+        )
+        self._handler_duration = self.metrics.histogram(
+            "chat_event_handler_duration_seconds",
+            "Time spent in one event handler call.",
+            ("event", "handler"),
+        )
+        self._handler_failures = self.metrics.counter(
+            "chat_event_handler_failures_total",
+            "Event handler calls that raised or timed out.",
+            ("event", "handler"),
+        )
 
     def register_event(self, event: ET, event_handlers: Iterable[EventHandler[ET, ER]]):
         self.events_map[event].extend(event_handlers)
@@ -27,17 +64,132 @@ class Mediator:
         self.commands_map[command].extend(command_handlers)
 
     async def handle_event(self, event: BaseEvent) -> Iterable[ER]:
-        event_type = event.__class__
+        return await self._dispatch(event.__class__, lambda handler: handler.handle(event))
+
+    async def handle_events(self, events: Iterable[BaseEvent], *, deferred: bool | None = None) -> None:
+        """Dispatch several events, giving each handler one batch per event type.
+
+        Handlers that override ``handle_many`` (e.g. Kafka publishing) can
+        then process the whole batch in a single round trip. ``deferred``
+        limits the call to handlers whose ``deferred`` flag equals it.
+        """
+        batches: dict[type, list[BaseEvent]] = {}
+        for event in events:
+            batches.setdefault(event.__class__, []).append(event)
+
+        for event_type, batch in batches.items():
+            await self._dispatch(
+                event_type,
+                lambda handler, batch=batch: handler.handle_many(batch),
+                deferred=deferred,
+            )
+
+    async def _dispatch(
+        self,
+        event_type: type,
+        call: Callable[[EventHandler], Awaitable[ER]],
+        deferred: bool | None = None,
+    ) -> list[ER]:
         handlers = self.events_map.get(event_type)
 
         if not handlers:
             raise EventHandlersNotRegisteredException(event_type)
-        return [await handler.handle(event) for handler in handlers]
+        if deferred is not None:
+            handlers = [handler for handler in handlers if handler.deferred == deferred]
+
+        if self.background_non_critical:
+            for handler in handlers:
+                if not handler.critical:
+                    self._run_in_background(handler, call, event_type)
+            handlers = [handler for handler in handlers if handler.critical]
+
+        if not self.concurrent_events:
+            return [await self._run_event_handler(handler, call, event_type) for handler in handlers]
+
+        # Every handler runs to completion; failures are collected and
+        # reported together instead of cancelling the other handlers.
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(self._capture(self._run_event_handler(handler, call, event_type)))
+                for handler in handlers
+            ]
+        results = [task.result() for task in tasks]
+        errors = [result for result in results if isinstance(result, _HandlerFailure)]
+        if errors:
+            raise EventHandlersFailedException(event_type, [error.exception for error in errors])
+        return results
+
+    async def publish_events(self, events: Iterable[BaseEvent]) -> None:
+        """Hand over events pulled from an aggregate after it was saved.
+
+        With an outbox the repository has already written the events to it
+        together with the data, so only the handlers that are not deferred
+        run here; the relay runs the deferred ones. Without an outbox every
+        handler runs right away.
+        """
+        await self.handle_events(events, deferred=False if self.outbox is not None else None)
+
     async def handle_command(self, command: BaseCommand) -> Iterable[CR]:
         command_type = command.__class__
         handlers = self.commands_map.get(command_type)
 
         if not handlers:
             raise CommandHandlersNotRegisteredException(command_type)
-        return [await handler.handle(command) for handler in handlers]
 
+        started = time.perf_counter()
+        try:
+            return [await handler.handle(command) for handler in handlers]
+        finally:
+            self._command_duration.labels(command_type.__name__).observe(time.perf_counter() - started)
+
+    async def wait_background(self) -> None:
+        """Wait for fire-and-forget handlers, e.g. before shutdown."""
+        while self._background_tasks:
+            await asyncio.gather(*self._background_tasks, return_exceptions=True)
+
+    async def _run_event_handler(
+        self,
+        handler: EventHandler,
+        call: Callable[[EventHandler], Awaitable[ER]],
+        event_type: type,
+    ) -> ER:
+        labels = (event_type.__name__, handler.__class__.__name__)
+        timeout = handler.timeout if handler.timeout is not None else self.handler_timeout
+        started = time.perf_counter()
+        try:
+            if timeout is None:
+                return await call(handler)
+            async with asyncio.timeout(timeout):
+                return await call(handler)
+        except Exception:
+            self._handler_failures.labels(*labels).inc()
+            raise
+        finally:
+            self._handler_duration.labels(*labels).observe(time.perf_counter() - started)
+
+    def _run_in_background(
+        self,
+        handler: EventHandler,
+        call: Callable[[EventHandler], Awaitable[ER]],
+        event_type: type,
+    ) -> None:
+        task = asyncio.create_task(self._run_event_handler(handler, call, event_type))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Background event handler failed", exc_info=task.exception())
+
+    @staticmethod
+    async def _capture(awaitable) -> 'ER | _HandlerFailure':
+        try:
+            return await awaitable
+        except Exception as exc:
+            return _HandlerFailure(exc)
+
+
+@dataclass(frozen=True)
+class _HandlerFailure:
+    exception: BaseException
@@ -0,0 +1,69 @@
+"""Recorded benchmark results and regression reports.
+
+Metrics whose name ends in ``_per_s`` are better when higher, all others
+(latencies) when lower. ``baseline.json`` is refreshed with ``--record``;
+``--check`` exits with status 1 when a metric regressed by more than
+``--tolerance`` against it.
+"""
+import argparse
+import json
+import platform
+import sys
+from pathlib import Path
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--record", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative regression")
+
+
+def load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def record(section: str, results: dict[str, float]) -> None:
+    baseline = load_baseline()
+    baseline.setdefault("environment", {}).update(
+        python=platform.python_version(),
+        machine=platform.machine(),
+        system=platform.system(),
+    )
+    baseline[section] = {name: round(value, 3) for name, value in sorted(results.items())}
+    BASELINE_PATH.write_text(json.dumps(baseline, indent=2, ensure_ascii=False) + "\n")
+
+
+def change(name: str, value: float, reference: float) -> float:
+    """Relative change where a positive number is always a regression."""
+    if reference == 0:
+        return 0.0
+    relative = (value - reference) / reference
+    return -relative if name.endswith("_per_s") else relative
+
+
+def report(section: str, results: dict[str, float], arguments: argparse.Namespace) -> None:
+    reference = load_baseline().get(section, {})
+    regressions = []
+    print(f"{'metric':<44} {'value':>14} {'baseline':>14} {'change':>9}")
+    for name, value in results.items():
+        baseline_value = reference.get(name)
+        if baseline_value is None:
+            print(f"{name:<44} {value:>14.2f} {'-':>14} {'':>9}")
+            continue
+        regression = change(name, value, baseline_value)
+        marker = " !" if regression > arguments.tolerance else ""
+        print(f"{name:<44} {value:>14.2f} {baseline_value:>14.2f} {regression:>+8.0%}{marker}")
+        if marker:
+            regressions.append(name)
+
+    if arguments.record:
+        record(section, results)
+        print(f"Recorded {section} results in {BASELINE_PATH.name}")
+    if regressions:
+        print(f"Regressed beyond {arguments.tolerance:.0%}: {', '.join(regressions)}")
+        if arguments.check:
+            sys.exit(1)
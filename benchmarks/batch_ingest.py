@@ -0,0 +1,72 @@
+"""Messages/sec through ``CreateMessageCommand`` vs ``CreateMessagesBatchCommand``.
+
+Events go to a ``KafkaEventProducer`` whose client acknowledges each send
+after ``BROKER_LATENCY`` seconds, so the numbers include the producer round
+trips the batch path saves. Run with ``python -m benchmarks.batch_ingest``.
+"""
+import asyncio
+import time
+
+from app.domain.entities.messages import Chat
+from app.domain.values.messages import Title
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.kafka.producer import KafkaEventProducer
+from app.infra.repositories.messages import MemoryChatRepository
+from app.logic.commands.messages import CreateMessageCommand, CreateMessagesBatchCommand
+from app.logic.init import init_mediator
+from app.logic.mediator import Mediator
+
+MESSAGES = 5_000
+BATCH_SIZES = (10, 100, 1_000)
+BROKER_LATENCY = 0.0005
+
+
+class _SimulatedKafkaClient:
+    async def send(self, topic: str, value: bytes, headers=None) -> asyncio.Future:
+        return asyncio.ensure_future(asyncio.sleep(BROKER_LATENCY))
+
+    async def send_and_wait(self, topic: str, value: bytes, headers=None) -> None:
+        await asyncio.sleep(BROKER_LATENCY)
+
+    async def stop(self) -> None:
+        return None
+
+
+async def _setup() -> tuple[Mediator, str]:
+    mediator = Mediator()
+    repository = init_mediator(
+        mediator,
+        chat_repository=MemoryChatRepository(),
+        event_publisher=KafkaEventProducer(KafkaBrokerConfig(), client=_SimulatedKafkaClient()),
+    )
+    chat = Chat(title=Title(value="benchmark"))
+    await repository.add_chat(chat)
+    return mediator, chat.oid
+
+
+async def single() -> float:
+    mediator, chat_oid = await _setup()
+    started = time.perf_counter()
+    for index in range(MESSAGES):
+        await mediator.handle_command(CreateMessageCommand(chat_oid=chat_oid, text=f"message {index}"))
+    return MESSAGES / (time.perf_counter() - started)
+
+
+async def batch(size: int) -> float:
+    mediator, chat_oid = await _setup()
+    started = time.perf_counter()
+    for offset in range(0, MESSAGES, size):
+        texts = tuple(f"message {index}" for index in range(offset, offset + size))
+        await mediator.handle_command(CreateMessagesBatchCommand(chat_oid=chat_oid, texts=texts))
+    return MESSAGES / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    print(f"{'path':<14} {'messages/s':>12}")
+    print(f"{'single':<14} {await single():>12.0f}")
+    for size in BATCH_SIZES:
+        print(f"{f'batch x{size}':<14} {await batch(size):>12.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
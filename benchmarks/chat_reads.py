@@ -0,0 +1,70 @@
+"""Chat detail and listing latency as chats grow, on the SQLite repository.
+
+A full ``GET /api/chats/{oid}`` loads the whole history; with
+``messages_limit`` only the newest page is read. Listing a page of chat
+summaries reads the chat rows and the in-memory projection, so it stays
+flat however many messages the chats hold. Run with
+``python -m benchmarks.chat_reads``.
+"""
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from app.application.api.messages.router import ChatService
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.read_models.chat_activity import MemoryChatActivityReadModel, load_chat_activity
+from app.infra.repositories.sqlite import SQLiteChatRepository
+from app.logic.init import init_mediator
+from app.logic.mediator import Mediator
+
+CHATS = 20
+MESSAGES_PER_CHAT = (10, 1_000, 10_000)
+MESSAGES_LIMIT = 50
+SAMPLES = 20
+
+
+async def _measure(call) -> float:
+    started = time.perf_counter()
+    for _ in range(SAMPLES):
+        await call()
+    return (time.perf_counter() - started) / SAMPLES * 1_000
+
+
+async def run(directory: str, messages: int) -> dict[str, float]:
+    repository = SQLiteChatRepository(path=str(Path(directory) / f"chats-{messages}.db"))
+    chats = [Chat(title=Title(value=f"chat {index}")) for index in range(CHATS)]
+    for chat in chats:
+        await repository.add_chat(chat)
+        await repository.add_messages(chat.oid, [Message(text=Text(value=f"message {index}")) for index in range(messages)])
+
+    chat_activity = MemoryChatActivityReadModel()
+    await load_chat_activity(chat_activity, repository)
+    mediator = Mediator()
+    init_mediator(mediator, chat_repository=repository, chat_activity=chat_activity)
+    service = ChatService(mediator=mediator, chat_activity=chat_activity)
+    oid = chats[-1].oid
+
+    async def list_by_activity() -> None:
+        service.list_chats_by_activity(limit=CHATS)
+
+    return {
+        "detail, full": await _measure(lambda: service.get_chat(oid)),
+        f"detail, {MESSAGES_LIMIT} newest": await _measure(lambda: service.get_chat(oid, MESSAGES_LIMIT)),
+        "list by creation": await _measure(lambda: service.list_chats(limit=CHATS)),
+        "list by activity": await _measure(list_by_activity),
+    }
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        results = {messages: await run(directory, messages) for messages in MESSAGES_PER_CHAT}
+    operations = next(iter(results.values()))
+    print(f"{'ms per call':<22}" + "".join(f"{messages:>12}" for messages in MESSAGES_PER_CHAT))
+    for operation in operations:
+        print(f"{operation:<22}" + "".join(f"{results[messages][operation]:>12.3f}" for messages in MESSAGES_PER_CHAT))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
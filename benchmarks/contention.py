@@ -0,0 +1,68 @@
+"""Message writes/sec under contention: striped chat locks vs one global lock.
+
+The repository awaits ``STORE_LATENCY`` per write, like a networked store,
+and ``WRITERS`` concurrent writers spread over a varying number of chats.
+``stripes=1`` is the same code with a single lock for every chat. Run with
+``python -m benchmarks.contention``.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.events.messages import NewMessageReceivedEvent
+from app.domain.values.messages import Title
+from app.infra.kafka.producer import NoopEventPublisher
+from app.infra.repositories.messages import MemoryChatRepository
+from app.logic.commands.messages import CreateMessageCommand, CreateMessageCommandHandler
+from app.logic.events.messages import NewMessageReceivedEventHandler
+from app.logic.locks import StripedLocks
+from app.logic.mediator import Mediator
+
+WRITERS = 1_000
+MESSAGES_PER_WRITER = 5
+STORE_LATENCY = 0.001
+CHAT_COUNTS = (1, 10, 100, 1_000)
+
+
+@dataclass(eq=False)
+class _NetworkedChatRepository(MemoryChatRepository):
+    async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
+        await asyncio.sleep(STORE_LATENCY)
+        return await super().add_message(chat_oid, message)
+
+
+async def _rate(chats: int, stripes: int) -> float:
+    repository = _NetworkedChatRepository()
+    mediator = Mediator()
+    mediator.register_event(NewMessageReceivedEvent, [NewMessageReceivedEventHandler(producer=NoopEventPublisher())])
+    mediator.register_command(CreateMessageCommand, [CreateMessageCommandHandler(
+        chat_repository=repository,
+        mediator=mediator,
+        chat_locks=StripedLocks(stripes=stripes),
+    )])
+    oids = []
+    for index in range(chats):
+        chat = Chat(title=Title(value=f"chat {index}"))
+        await repository.add_chat(chat)
+        oids.append(chat.oid)
+
+    async def writer(number: int) -> None:
+        for index in range(MESSAGES_PER_WRITER):
+            await mediator.handle_command(
+                CreateMessageCommand(chat_oid=oids[number % chats], text=f"message {index}")
+            )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(number) for number in range(WRITERS)))
+    return WRITERS * MESSAGES_PER_WRITER / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    print(f"{'chats':>6} {'global lock':>12} {'1024 stripes':>13}  messages/s")
+    for chats in CHAT_COUNTS:
+        print(f"{chats:>6} {await _rate(chats, 1):>12.0f} {await _rate(chats, 1024):>13.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
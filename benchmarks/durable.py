@@ -0,0 +1,127 @@
+"""Write throughput and restart time of ``DurableMemoryChatRepository``.
+
+``--writers`` coroutines append ``--messages`` messages one by one to
+``--chats`` chats, so the numbers show how far group commit amortizes each
+fsync. The same volume is then written in batches of ``--batch``. Restart
+time is measured twice: replaying the whole log, and loading the snapshot
+written by a compaction. Run with
+``python -m benchmarks.durable --messages 1000000``; add ``--no-fsync`` to
+take the disk out of the picture.
+"""
+import argparse
+import asyncio
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.durable import DurableMemoryChatRepository
+
+
+def _repository(directory: Path, arguments: argparse.Namespace) -> DurableMemoryChatRepository:
+    # Compaction is triggered explicitly, so the log is replayed in full first.
+    return DurableMemoryChatRepository(
+        str(directory),
+        fsync=not arguments.no_fsync,
+        compact_after_bytes=2**62,
+    )
+
+
+async def _create_chats(repository: DurableMemoryChatRepository, count: int) -> list[str]:
+    oids = []
+    for index in range(count):
+        chat = Chat(title=Title(value=f"chat {index}"))
+        await repository.add_chat(chat)
+        oids.append(chat.oid)
+    return oids
+
+
+async def _single_writes(directory: Path, arguments: argparse.Namespace) -> dict[str, float]:
+    repository = _repository(directory, arguments)
+    oids = await _create_chats(repository, arguments.chats)
+    per_writer = arguments.messages // arguments.writers
+
+    async def writer(number: int) -> None:
+        for index in range(per_writer):
+            oid = oids[(number + index) % len(oids)]
+            await repository.add_message(oid, Message(text=Text(value=f"message {number}-{index}")))
+
+    repository.commits = repository.committed_records = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(writer(number) for number in range(arguments.writers)))
+    elapsed = time.perf_counter() - started
+    await repository.stop()
+    return {
+        "messages_per_s": per_writer * arguments.writers / elapsed,
+        "records_per_commit": repository.committed_records / repository.commits,
+    }
+
+
+async def _batch_writes(directory: Path, arguments: argparse.Namespace) -> float:
+    repository = _repository(directory, arguments)
+    oids = await _create_chats(repository, arguments.chats)
+    started = time.perf_counter()
+    for offset in range(0, arguments.messages, arguments.batch):
+        messages = [
+            Message(text=Text(value=f"message {index}"))
+            for index in range(offset, min(offset + arguments.batch, arguments.messages))
+        ]
+        await repository.add_messages(oids[(offset // arguments.batch) % len(oids)], messages)
+    elapsed = time.perf_counter() - started
+    await repository.stop()
+    return arguments.messages / elapsed
+
+
+async def _restart(directory: Path, arguments: argparse.Namespace) -> float:
+    started = time.perf_counter()
+    repository = _repository(directory, arguments)
+    elapsed = time.perf_counter() - started
+    await repository.stop()
+    return elapsed
+
+
+async def _compact(directory: Path, arguments: argparse.Namespace) -> float:
+    repository = _repository(directory, arguments)
+    started = time.perf_counter()
+    await repository.compact()
+    elapsed = time.perf_counter() - started
+    await repository.stop()
+    return elapsed
+
+
+def _size(directory: Path) -> float:
+    return sum(path.stat().st_size for path in directory.iterdir()) / 2**20
+
+
+async def run(arguments: argparse.Namespace) -> None:
+    root = Path(tempfile.mkdtemp(prefix="chat-durable-"))
+    try:
+        single = await _single_writes(root / "single", arguments)
+        print(f"single writes     {single['messages_per_s']:>12.0f} messages/s"
+              f"  ({single['records_per_commit']:.1f} records per commit)")
+        print(f"batch writes      {await _batch_writes(root / 'batch', arguments):>12.0f} messages/s")
+
+        directory = root / "single"
+        print(f"log size          {_size(directory):>12.1f} MiB")
+        print(f"restart from log  {await _restart(directory, arguments):>12.2f} s")
+        print(f"compaction        {await _compact(directory, arguments):>12.2f} s")
+        print(f"snapshot size     {_size(directory):>12.1f} MiB")
+        print(f"restart from snap {await _restart(directory, arguments):>12.2f} s")
+    finally:
+        shutil.rmtree(root)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--chats", type=int, default=1_000)
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--no-fsync", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
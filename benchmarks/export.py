@@ -0,0 +1,72 @@
+"""Peak memory and throughput of the streaming chat export.
+
+A chat of growing length is exported as gzipped JSONL, chunk by chunk as
+the endpoint streams it, and the peak of memory allocated meanwhile is
+compared with encoding the same chat for ``GET /api/chats/{oid}``. The
+history itself is allocated before measuring. Throughput is timed in a
+separate pass without ``tracemalloc``. Run with
+``python -m benchmarks.export``.
+"""
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from app.application.api.messages.exports import _chat_rows, _gzipped, _with_header
+from app.application.api.messages.router import ChatService
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.messages import MemoryChatRepository
+from app.logic.init import init_mediator
+from app.logic.mediator import Mediator
+
+SIZES = (10_000, 100_000, 500_000)
+
+
+async def _peak_mb(operation) -> float:
+    gc.collect()
+    tracemalloc.start()
+    await operation()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+async def run(size: int) -> dict[str, float]:
+    repository = MemoryChatRepository()
+    chat = Chat(title=Title(value="Compliance"))
+    await repository.add_chat(chat)
+    await repository.add_messages(chat.oid, [Message(text=Text(value=f"message number {index}")) for index in range(size)])
+    chat.pull_events()
+    mediator = Mediator()
+    init_mediator(mediator, chat_repository=repository)
+    service = ChatService(mediator=mediator)
+
+    async def export() -> int:
+        sent = 0
+        async for chunk in _gzipped(_with_header(_chat_rows(service, chat, "jsonl"), "jsonl")):
+            sent += len(chunk)
+        return sent
+
+    async def detail() -> int:
+        return len(await service.get_chat(chat.oid))
+
+    started = time.perf_counter()
+    compressed = await export()
+    elapsed = time.perf_counter() - started
+    return {
+        "export peak MB": await _peak_mb(export),
+        "detail peak MB": await _peak_mb(detail),
+        "messages/s": size / elapsed,
+        "gzip MB": compressed / 1024 / 1024,
+    }
+
+
+async def main() -> None:
+    for size in SIZES:
+        result = await run(size)
+        print(f"{size:>8} messages: " + ", ".join(f"{name} {value:,.2f}" for name, value in result.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+"""Ids/sec of ``uuid4`` against the monotonic UUIDv7 generator.
+
+Run with ``python -m benchmarks.ids``.
+"""
+import time
+import uuid
+from collections.abc import Callable
+
+from app.domain.ids import UUID7Generator
+
+IDS = 500_000
+
+
+def _rate(function: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    for _ in range(IDS):
+        function()
+    return IDS / (time.perf_counter() - started)
+
+
+def main() -> None:
+    uuid7 = UUID7Generator()
+    generators = {
+        "uuid4": uuid.uuid4,
+        "uuid7": uuid7,
+        "str(uuid4)": lambda: str(uuid.uuid4()),
+        "str(uuid7)": lambda: str(uuid7()),
+    }
+    print(f"{'generator':<12} {'ids/s':>12} {'ns/id':>8}")
+    for name, generator in generators.items():
+        rate = _rate(generator)
+        print(f"{name:<12} {rate:>12.0f} {1e9 / rate:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""End-to-end ASGI load driver for ``create_app()``.
+
+Seeds ``--chats`` chats with ``--messages`` messages each, then replays a
+request mix in-process through ``httpx.ASGITransport`` with ``--concurrency``
+requests in flight, and reports p50/p95/p99 latency and requests/sec per
+endpoint. ``--kafka-latency-ms`` swaps the no-op publisher for a
+``KafkaEventProducer`` whose broker acknowledges after that delay, which
+shows what Kafka publishing adds to each write.
+
+Run with ``python -m benchmarks.load`` (``--chats 10000 --messages 1000``
+for the full-size data set; ``--record``/``--check`` as in ``baseline``).
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+import httpx
+
+from app.application.api.main import create_app
+from app.application.api.messages.router import get_mediator, get_response_cache
+from app.infra.cache.responses import ResponseCache
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.kafka.producer import EventPublisher, KafkaEventProducer, NoopEventPublisher
+from app.infra.push.broadcaster import ChatBroadcaster
+from app.infra.repositories.messages import MemoryChatRepository
+from app.logic.commands.messages import CreateChatCommand, CreateMessagesBatchCommand
+from app.logic.init import init_mediator
+from app.logic.mediator import Mediator
+from benchmarks import baseline
+
+
+class _SimulatedKafkaClient:
+    def __init__(self, latency: float) -> None:
+        self._latency = latency
+
+    async def send(self, topic: str, value: bytes, headers=None) -> asyncio.Future:
+        return asyncio.ensure_future(asyncio.sleep(self._latency))
+
+    async def send_and_wait(self, topic: str, value: bytes, headers=None) -> None:
+        await asyncio.sleep(self._latency)
+
+    async def stop(self) -> None:
+        return None
+
+
+async def _seed(mediator: Mediator, chats: int, messages: int) -> list[str]:
+    oids = []
+    for index in range(chats):
+        chat = (await mediator.handle_command(CreateChatCommand(title=f"chat-{index}")))[0]
+        oids.append(chat.oid)
+        for offset in range(0, messages, 1_000):
+            texts = tuple(f"message {number}" for number in range(offset, min(offset + 1_000, messages)))
+            await mediator.handle_command(CreateMessagesBatchCommand(chat_oid=chat.oid, texts=texts))
+    return oids
+
+
+def _scenarios(oids: list[str], rng: random.Random) -> dict[str, Callable[[httpx.AsyncClient], Awaitable]]:
+    return {
+        "create_message": lambda client: client.post(
+            f"/api/chats/{rng.choice(oids)}/messages", json={"text": "load test"}
+        ),
+        "get_chat": lambda client: client.get(f"/api/chats/{rng.choice(oids)}"),
+        "get_messages": lambda client: client.get(
+            f"/api/chats/{rng.choice(oids)}/messages", params={"limit": 50}
+        ),
+        "list_chats": lambda client: client.get("/api/chats", params={"limit": 100}),
+    }
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    request: Callable[[httpx.AsyncClient], Awaitable],
+    requests: int,
+    concurrency: int,
+) -> dict[str, float]:
+    latencies: list[float] = []
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await request(client)
+            latencies.append((time.perf_counter() - started) * 1000)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "p50_ms": percentiles[49],
+        "p95_ms": percentiles[94],
+        "p99_ms": percentiles[98],
+        "requests_per_s": requests / elapsed,
+    }
+
+
+async def run(arguments: argparse.Namespace) -> dict[str, float]:
+    publisher: EventPublisher = NoopEventPublisher()
+    if arguments.kafka_latency_ms:
+        publisher = KafkaEventProducer(
+            KafkaBrokerConfig(),
+            client=_SimulatedKafkaClient(arguments.kafka_latency_ms / 1000),
+        )
+    cache = ResponseCache(max_bytes=0) if arguments.no_cache else ResponseCache()
+    mediator = Mediator()
+    init_mediator(
+        mediator,
+        chat_repository=MemoryChatRepository(),
+        event_publisher=publisher,
+        broadcaster=ChatBroadcaster(),
+        response_cache=cache,
+    )
+    oids = await _seed(mediator, arguments.chats, arguments.messages)
+
+    app = create_app()
+    app.dependency_overrides[get_mediator] = lambda: mediator
+    app.dependency_overrides[get_response_cache] = lambda: cache
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for name, request in _scenarios(oids, random.Random(0)).items():
+            metrics = await _drive(client, request, arguments.requests, arguments.concurrency)
+            results.update({f"{name}.{metric}": value for metric, value in metrics.items()})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=1_000)
+    parser.add_argument("--messages", type=int, default=100, help="messages per chat")
+    parser.add_argument("--requests", type=int, default=2_000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--kafka-latency-ms", type=float, default=0.0)
+    parser.add_argument("--no-cache", action="store_true", help="disable the response cache")
+    baseline.add_arguments(parser)
+    arguments = parser.parse_args()
+
+    section = "load"
+    if arguments.kafka_latency_ms:
+        section += f".kafka{arguments.kafka_latency_ms:g}ms"
+    if arguments.no_cache:
+        section += ".no-cache"
+    baseline.report(section, asyncio.run(run(arguments)), arguments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Bytes per stored message in the in-memory chat history.
+
+Measures the memory allocated while ``MESSAGES`` messages are appended to
+one chat: the ``Message`` entity, its ``Text`` value, its timestamp, its oid
+and the ``MessageLog`` bookkeeping. ``legacy`` rebuilds the previous layout
+(``__dict__``-based dataclasses and an ``_events`` list on every message)
+for comparison. Run with ``python -m benchmarks.memory``.
+"""
+import gc
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import uuid4
+
+from app.domain.entities.messages import Message, MessageLog
+from app.domain.values.messages import Text
+
+MESSAGES = 200_000
+
+
+@dataclass(frozen=True)
+class _LegacyText:
+    value: str
+
+
+@dataclass(eq=False)
+class _LegacyMessage:
+    text: _LegacyText
+    oid: str = field(default_factory=lambda: str(uuid4()), kw_only=True)
+    _events: list = field(default_factory=list, kw_only=True)
+    created_at: datetime = field(default_factory=datetime.now, kw_only=True)
+
+
+def _bytes_per_message(factory: Callable[[str], object]) -> float:
+    # Texts are created up front: their size depends on the payload, not on
+    # the domain layout.
+    texts = [f"message {index}" for index in range(MESSAGES)]
+    log = MessageLog()
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for text in texts:
+        log.append(factory(text))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / MESSAGES
+
+
+def main() -> None:
+    layouts = {
+        "legacy": lambda text: _LegacyMessage(text=_LegacyText(value=text)),
+        "slots": lambda text: Message(text=Text(value=text)),
+    }
+    print(f"{'layout':<8} {'bytes/message':>14}")
+    for name, factory in layouts.items():
+        print(f"{name:<8} {_bytes_per_message(factory):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
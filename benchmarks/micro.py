@@ -0,0 +1,106 @@
+"""Micro benchmarks of the domain, mediator, repository and serialization layers.
+
+Run with ``python -m benchmarks.micro`` (add ``--record`` to refresh the
+baseline, ``--check`` to fail on regressions).
+"""
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+
+from app.domain.entities.messages import Chat, Message, MessageLog
+from app.domain.events.messages import NewMessageReceivedEvent
+from app.domain.values.messages import Text, Title
+from app.infra.kafka.producer import NoopEventPublisher
+from app.infra.repositories.messages import MemoryChatRepository
+from app.infra.serialization.codecs import JSONCodec
+from app.infra.serialization.events import event_from_envelope, event_to_envelope
+from app.logic.commands.messages import CreateMessageCommand, GetChatCommand
+from app.logic.init import init_mediator
+from app.logic.mediator import Mediator
+from benchmarks import baseline
+
+ITERATIONS = 20_000
+ROUNDS = 3
+CHATS = 10_000
+
+
+def _rate(function: Callable[[int], object], iterations: int = ITERATIONS) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for index in range(iterations):
+            function(index)
+        best = min(best, time.perf_counter() - started)
+    return iterations / best
+
+
+async def _async_rate(function: Callable[[int], object], iterations: int = ITERATIONS) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for index in range(iterations):
+            await function(index)
+        best = min(best, time.perf_counter() - started)
+    return iterations / best
+
+
+async def _layer_benchmarks() -> dict[str, float]:
+    repository = MemoryChatRepository()
+    chats = [Chat(title=Title(value=f"chat-{index}")) for index in range(CHATS)]
+    for chat in chats:
+        await repository.add_chat(chat)
+    oids = [chat.oid for chat in chats]
+
+    mediator = Mediator()
+    init_mediator(mediator, chat_repository=repository, event_publisher=NoopEventPublisher())
+
+    return {
+        "repository.get_chat_by_oid_per_s": await _async_rate(
+            lambda index: repository.get_chat_by_oid(oids[index % CHATS])
+        ),
+        "repository.list_chats_page_per_s": await _async_rate(
+            lambda index: repository.list_chats(
+                limit=100,
+                after=(chats[index % CHATS].created_at, oids[index % CHATS]),
+            )
+        ),
+        "mediator.get_chat_per_s": await _async_rate(
+            lambda index: mediator.handle_command(GetChatCommand(chat_oid=oids[index % CHATS]))
+        ),
+        "mediator.create_message_per_s": await _async_rate(
+            lambda index: mediator.handle_command(
+                CreateMessageCommand(chat_oid=oids[index % CHATS], text="ping")
+            )
+        ),
+    }
+
+
+def run() -> dict[str, float]:
+    codec = JSONCodec()
+    event = NewMessageReceivedEvent(message_text="Здравствуйте!", message_oid="m-1", chat_oid="c-1")
+    encoded = codec.encode(event_to_envelope(event))
+    log = MessageLog(Message(text=Text(value=str(index))) for index in range(1_000))
+
+    results = {
+        "text.validate_per_s": _rate(lambda index: Text(value="Hello from the widget")),
+        "title.validate_per_s": _rate(lambda index: Title(value="Support")),
+        "message.create_per_s": _rate(lambda index: Message(text=Text(value="Hello"))),
+        "chat.create_per_s": _rate(lambda index: Chat.create_chat(title=Title(value="Support"))),
+        "message_log.page_per_s": _rate(lambda index: log.page(limit=50)),
+        "event.encode_per_s": _rate(lambda index: codec.encode(event_to_envelope(event))),
+        "event.decode_per_s": _rate(lambda index: event_from_envelope(codec.decode(encoded))),
+    }
+    results.update(asyncio.run(_layer_benchmarks()))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    baseline.add_arguments(parser)
+    arguments = parser.parse_args()
+    baseline.report("micro", run(), arguments)
+
+
+if __name__ == "__main__":
+    main()
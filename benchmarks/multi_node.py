@@ -0,0 +1,140 @@
+"""Multi-process load test of the shared-state deployment mode.
+
+Starts a bus hub and ``NODES`` API processes that share one SQLite chat
+repository, subscribes to the chat stream on every node, posts messages
+round-robin across the nodes and checks that each node's subscriber sees
+every message. Reports write throughput and the latency from sending a
+message to its arrival on each node's stream.
+
+Run with ``python -m benchmarks.multi_node``.
+"""
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+NODES = 3
+BASE_PORT = 8100
+MESSAGES = 2_000
+CONCURRENCY = 32
+
+
+def _spawn(arguments: list[str], env: dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *arguments], env={**os.environ, **env})
+
+
+async def _wait_ready(client: httpx.AsyncClient, url: str) -> None:
+    for _ in range(100):
+        try:
+            if (await client.get(url)).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"{url} did not start")
+
+
+async def _subscribe(
+    client: httpx.AsyncClient,
+    url: str,
+    received: dict[str, float],
+    subscribed: asyncio.Event,
+) -> None:
+    async with client.stream("GET", url) as response:
+        subscribed.set()
+        async for line in response.aiter_lines():
+            if line.startswith("data: "):
+                received[json.loads(line[6:])["message_text"]] = time.perf_counter()
+
+
+async def run(workdir: Path) -> None:
+    env = {
+        "CHAT_REPOSITORY": "sqlite",
+        "CHAT_SQLITE_PATH": str(workdir / "chats.sqlite3"),
+        "CHAT_BUS": "socket",
+        "CHAT_BUS_SOCKET": str(workdir / "bus.sock"),
+    }
+    processes = [_spawn(["-m", "app.application.bus_hub"], env)]
+    while not (workdir / "bus.sock").exists():
+        await asyncio.sleep(0.05)
+
+    urls = [f"http://127.0.0.1:{BASE_PORT + index}" for index in range(NODES)]
+    for index, url in enumerate(urls):
+        processes.append(_spawn(
+            [
+                "-m", "uvicorn", "app.application.api.main:create_app", "--factory",
+                "--port", str(BASE_PORT + index), "--log-level", "warning",
+            ],
+            {**env, "CHAT_NODE_ID": f"node-{index}"},
+        ))
+
+    try:
+        async with httpx.AsyncClient(timeout=30) as client:
+            for url in urls:
+                await _wait_ready(client, f"{url}/api/chats")
+            chat_oid = (await client.post(f"{urls[0]}/api/chats", json={"title": "load"})).json()["oid"]
+
+            received = [{} for _ in urls]
+            streams = []
+            for url, node_received in zip(urls, received):
+                subscribed = asyncio.Event()
+                streams.append(asyncio.create_task(
+                    _subscribe(client, f"{url}/api/chats/{chat_oid}/stream", node_received, subscribed)
+                ))
+                await subscribed.wait()
+
+            sent: dict[str, float] = {}
+            semaphore = asyncio.Semaphore(CONCURRENCY)
+
+            async def post(index: int) -> None:
+                async with semaphore:
+                    text = f"message {index}"
+                    sent[text] = time.perf_counter()
+                    response = await client.post(
+                        f"{urls[index % NODES]}/api/chats/{chat_oid}/messages",
+                        json={"text": text},
+                    )
+                    response.raise_for_status()
+
+            started = time.perf_counter()
+            await asyncio.gather(*(post(index) for index in range(MESSAGES)))
+            elapsed = time.perf_counter() - started
+
+            deadline = time.perf_counter() + 10
+            while time.perf_counter() < deadline and any(len(node) < MESSAGES for node in received):
+                await asyncio.sleep(0.1)
+            for stream in streams:
+                stream.cancel()
+            await asyncio.gather(*streams, return_exceptions=True)
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+
+    print(f"nodes={NODES} messages={MESSAGES} concurrency={CONCURRENCY}")
+    print(f"write throughput: {MESSAGES / elapsed:.0f} messages/s")
+    for index, node_received in enumerate(received):
+        latencies = sorted((arrived - sent[text]) * 1000 for text, arrived in node_received.items())
+        p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else float("nan")
+        median = statistics.median(latencies) if latencies else float("nan")
+        print(
+            f"node-{index}: delivered {len(node_received)}/{MESSAGES}, "
+            f"fan-out p50 {median:.1f} ms, p99 {p99:.1f} ms"
+        )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        asyncio.run(run(Path(workdir)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Per-operation latency of ``MemoryChatRepository`` as the number of chats grows.
+
+Run with ``python -m benchmarks.repositories``.
+"""
+import asyncio
+import random
+import time
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.messages import MemoryChatRepository
+
+SIZES = (1_000, 10_000, 100_000)
+SAMPLES = 2_000
+
+
+async def _measure(operation, arguments) -> float:
+    started = time.perf_counter()
+    for argument in arguments:
+        await operation(argument)
+    return (time.perf_counter() - started) / len(arguments) * 1_000_000
+
+
+async def run(size: int) -> dict[str, float]:
+    repository = MemoryChatRepository()
+    chats = [Chat(title=Title(value=f"chat-{index}")) for index in range(size)]
+    for chat in chats:
+        await repository.add_chat(chat)
+
+    sample = random.sample(chats, k=min(SAMPLES, size))
+    oids = [chat.oid for chat in sample]
+    titles = [chat.title.as_generic_type() for chat in sample]
+
+    async def add_message(oid: str) -> None:
+        await repository.add_message(oid, Message(text=Text(value="ping")))
+
+    return {
+        "get_chat_by_oid": await _measure(repository.get_chat_by_oid, oids),
+        "get_chat_by_title": await _measure(repository.get_chat_by_title, titles),
+        "check_chat_exists_by_title": await _measure(repository.check_chat_exists_by_title, titles),
+        "add_message": await _measure(add_message, oids),
+    }
+
+
+async def main() -> None:
+    print(f"{'chats':>8} {'operation':<28} {'us/op':>10}")
+    for size in SIZES:
+        for operation, latency in (await run(size)).items():
+            print(f"{size:>8} {operation:<28} {latency:>10.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Latency of ``GET /api/chats/{oid}`` for chats of growing length.
+
+Requests go through the whole ASGI app with the response cache disabled,
+so every request loads the chat and serializes it. The serialization step
+is also timed alone: ``pydantic`` builds a response model per message and
+dumps it with a ``TypeAdapter``, as the endpoint used to; ``encoders`` is
+the current path. Run with ``python -m benchmarks.responses``.
+"""
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+from pydantic import TypeAdapter
+
+from app.application.api.messages import encoders
+from app.application.api.messages.schemas import ChatDetailResponse, MessageResponse
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text
+
+SIZES = (10, 1_000, 10_000)
+REQUESTS = 50
+
+_DETAIL_ADAPTER = TypeAdapter(ChatDetailResponse)
+
+
+async def _measure(client: httpx.AsyncClient, url: str) -> float:
+    samples = []
+    for _ in range(REQUESTS):
+        started = time.perf_counter()
+        response = await client.get(url)
+        samples.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return statistics.median(samples) * 1_000
+
+
+def _pydantic_detail(chat: Chat) -> bytes:
+    return _DETAIL_ADAPTER.dump_json(ChatDetailResponse(
+        oid=chat.oid,
+        title=chat.title.as_generic_type(),
+        created_at=chat.created_at,
+        messages=[
+            MessageResponse(oid=message.oid, text=message.text.as_generic_type(), created_at=message.created_at)
+            for message in chat.messages
+        ],
+    ))
+
+
+def _serialization(chat: Chat) -> tuple[float, float]:
+    timings = []
+    for encode in (_pydantic_detail, encoders.encode_chat_detail):
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            encode(chat)
+        timings.append((time.perf_counter() - started) / REQUESTS * 1_000)
+    return timings[0], timings[1]
+
+
+async def main() -> None:
+    os.environ.update(CHAT_RESPONSE_CACHE_BYTES="0", CHAT_SEARCH="off", CHAT_METRICS="off")
+    from app.application.api.main import create_app
+    from app.application.api.messages.router import get_chat_repository
+
+    app = create_app()
+    repository = get_chat_repository()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        print(f"{'messages':>8} {'ms per request':>15} {'pydantic ms':>12} {'encoders ms':>12}")
+        for size in SIZES:
+            response = await client.post("/api/chats", json={"title": f"chat {size}"})
+            oid = response.json()["oid"]
+            await repository.add_messages(oid, [Message(text=Text(value=f"message number {index}")) for index in range(size)])
+            request = await _measure(client, f"/api/chats/{oid}")
+            pydantic, fast = _serialization(await repository.get_chat_by_oid(oid))
+            print(f"{size:>8} {request:>15.3f} {pydantic:>12.3f} {fast:>12.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
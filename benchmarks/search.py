@@ -0,0 +1,93 @@
+"""Index size and query latency of the full-text search index.
+
+Indexes ``--messages`` synthetic Russian messages spread over chats, then
+reports indexing throughput, vocabulary and posting counts, the memory the
+index allocates, and p50/p99 latency of exact, multi-word and prefix
+queries. Run with ``python -m benchmarks.search --messages 100000``.
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from app.infra.search.index import InvertedIndex
+
+_STEMS = (
+    "заказ", "оплат", "доставк", "возврат", "курьер", "адрес", "товар", "скидк",
+    "карт", "счет", "ошибк", "приложени", "пароль", "аккаунт", "подписк", "чек",
+)
+_ENDINGS = ("", "а", "у", "ом", "е", "и", "ы", "ой", "ами", "ах")
+_FILLER = ("не", "где", "мой", "когда", "почему", "уже", "ещё", "пришёл", "помогите", "спасибо")
+
+QUERIES = {
+    "exact": ["заказ", "курьером", "пароля", "скидки"],
+    "two_words": ["заказ курьер", "оплата карты", "возврат товара", "ошибка приложения"],
+    "prefix": ["заказ*", "опл*", "доставк* адрес*", "приложени*"],
+}
+
+
+def _vocabulary(rng: random.Random) -> list[str]:
+    words = [stem + ending for stem in _STEMS for ending in _ENDINGS]
+    # A long tail of rare words, as in real chats.
+    words += [f"{rng.choice(_STEMS)}{index}" for index in range(5_000)]
+    return words
+
+
+def _messages(count: int, rng: random.Random) -> list[str]:
+    vocabulary = _vocabulary(rng)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [
+        " ".join(rng.choices(vocabulary, weights, k=rng.randint(3, 10)) + rng.sample(_FILLER, 2))
+        for _ in range(count)
+    ]
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--chats", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    arguments = parser.parse_args()
+
+    rng = random.Random(0)
+    texts = _messages(arguments.messages, rng)
+    index = InvertedIndex()
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for number, text in enumerate(texts):
+        index.add_message(f"chat-{number % arguments.chats}", f"message-{number}", text)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    text_bytes = sum(len(text.encode()) for text in texts)
+
+    print(f"documents        {len(index):>12}")
+    print(f"terms            {index.terms_count:>12}")
+    print(f"postings         {index.postings_count:>12}")
+    print(f"index MiB        {allocated / 2**20:>12.1f}  (texts: {text_bytes / 2**20:.1f} MiB)")
+    print(f"bytes/document   {allocated / len(index):>12.0f}")
+    print(f"indexed/s        {len(index) / elapsed:>12.0f}")
+    print()
+    print(f"{'query':<10} {'p50 ms':>8} {'p99 ms':>8} {'hits':>8}")
+    for name, queries in QUERIES.items():
+        samples = []
+        hits = 0
+        for _ in range(arguments.repeat):
+            for query in queries:
+                started = time.perf_counter()
+                result = index.search(query, limit=20)
+                samples.append((time.perf_counter() - started) * 1000)
+                hits = max(hits, result.total)
+        print(f"{name:<10} {_percentile(samples, 0.5):>8.2f} {_percentile(samples, 0.99):>8.2f} {hits:>8}")
+
+
+if __name__ == "__main__":
+    main()
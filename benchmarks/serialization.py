@@ -0,0 +1,70 @@
+"""Events/sec and bytes/event for the Kafka event codecs.
+
+``legacy`` is the previous ``dataclasses.asdict`` + stdlib ``json`` path.
+Run with ``python -m benchmarks.serialization``.
+"""
+import json
+import time
+from dataclasses import asdict
+
+from app.domain.events.messages import NewMessageReceivedEvent
+from app.infra.serialization.codecs import get_codec
+from app.infra.serialization.events import event_from_envelope, event_to_envelope
+
+EVENTS = 100_000
+
+
+def _legacy_encode(event) -> bytes:
+    payload = {"type": event.__class__.__name__, "payload": asdict(event)}
+    return json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _rate(function, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        function(item)
+    return len(items) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    events = [
+        NewMessageReceivedEvent(
+            message_text=f"Здравствуйте! Message number {index}",
+            message_oid=f"message-{index}",
+            chat_oid="chat-1",
+        )
+        for index in range(EVENTS)
+    ]
+
+    print(f"{'codec':<10} {'encode ev/s':>14} {'decode ev/s':>14} {'bytes/event':>12}")
+
+    # The legacy path had no decoder, so only encoding is measured.
+    legacy = [_legacy_encode(event) for event in events[:1000]]
+    print(
+        f"{'legacy':<10} {_rate(_legacy_encode, events):>14,.0f} {'-':>14} "
+        f"{sum(map(len, legacy)) / len(legacy):>12.1f}"
+    )
+
+    for name in ("json", "msgpack"):
+        try:
+            codec = get_codec(name)
+        except RuntimeError as exc:
+            print(f"{name:<10} skipped: {exc}")
+            continue
+
+        def encode(event):
+            return codec.encode(event_to_envelope(event))
+
+        def decode(data):
+            return event_from_envelope(codec.decode(data))
+
+        encoded = [encode(event) for event in events]
+        print(
+            f"{name:<10} {_rate(encode, events):>14,.0f} "
+            f"{_rate(decode, encoded):>14,.0f} "
+            f"{sum(map(len, encoded)) / len(encoded):>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Resident memory and latency of ``TieredChatRepository`` under skewed access.
+
+``--chats`` chats with ``--messages`` messages each are created, then
+``--operations`` requests pick a chat from a Zipf distribution with
+exponent ``--skew``: most go to a few popular chats, a long tail to the
+rest. One request in ten appends a message, the others read the chat.
+``memory`` keeps everything in the heap; ``tiered`` keeps up to
+``--hot-chats`` chats in memory over a SQLite file and writes each message
+through to it, ``write-back`` only writes messages on eviction. Memory is measured with
+``tracemalloc`` in a first pass, latency in a second pass without it. Run
+with ``python -m benchmarks.tiered``.
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.messages import BaseChatRepository, MemoryChatRepository
+from app.infra.repositories.sqlite import SQLiteChatRepository
+from app.infra.repositories.tiered import TieredChatRepository
+
+WRITE_RATIO = 0.1
+
+
+def _zipf_sample(population: list[str], skew: float, count: int, seed: int) -> list[str]:
+    weights = itertools.accumulate(1 / rank**skew for rank in range(1, len(population) + 1))
+    return random.Random(seed).choices(population, cum_weights=list(weights), k=count)
+
+
+async def _fill(repository: BaseChatRepository, arguments: argparse.Namespace) -> list[str]:
+    oids = []
+    for index in range(arguments.chats):
+        chat = Chat(title=Title(value=f"chat {index}"))
+        await repository.add_chat(chat)
+        await repository.add_messages(
+            chat.oid,
+            [Message(text=Text(value=f"message {number} of chat {index}")) for number in range(arguments.messages)],
+        )
+        oids.append(chat.oid)
+    return oids
+
+
+async def _serve(repository: BaseChatRepository, requests: list[str]) -> list[float]:
+    writes = random.Random(1)
+    latencies = []
+    for oid in requests:
+        started = time.perf_counter()
+        if writes.random() < WRITE_RATIO:
+            await repository.add_message(oid, Message(text=Text(value="ping")))
+        else:
+            await repository.get_chat_by_oid(oid)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def run(mode: str, arguments: argparse.Namespace, directory: str) -> dict[str, float]:
+    gc.collect()
+    tracemalloc.start()
+    if mode == "memory":
+        repository = MemoryChatRepository()
+    else:
+        repository = TieredChatRepository(
+            cold=SQLiteChatRepository(path=str(Path(directory) / f"{mode}.sqlite3")),
+            max_chats=arguments.hot_chats,
+            write_back=mode == "write-back",
+        )
+    oids = await _fill(repository, arguments)
+    # Popular chats are not the newest ones, so they start out cold.
+    random.Random(2).shuffle(oids)
+    await _serve(repository, _zipf_sample(oids, arguments.skew, arguments.operations, seed=3))
+    gc.collect()
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    latencies = sorted(await _serve(repository, _zipf_sample(oids, arguments.skew, arguments.operations, seed=4)))
+    result = {
+        "resident MB": resident / 1024 / 1024,
+        "p50 us": latencies[len(latencies) // 2] * 1_000_000,
+        "p99 us": latencies[int(len(latencies) * 0.99)] * 1_000_000,
+    }
+    if isinstance(repository, TieredChatRepository):
+        lookups = repository.hits + repository.misses
+        result["hit rate %"] = repository.hits / lookups * 100
+        result["evictions"] = repository.evictions
+    await repository.stop()
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=20_000)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--operations", type=int, default=50_000)
+    parser.add_argument("--skew", type=float, default=1.1)
+    parser.add_argument("--hot-chats", type=int, default=1_000)
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in ("memory", "tiered", "write-back"):
+            result = await run(mode, arguments, directory)
+            print(f"{mode:>10}: " + ", ".join(
+                f"{name} {value:,}" if isinstance(value, int) else f"{name} {value:,.1f}"
+                for name, value in result.items()
+            ))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,11 +1,12 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useMemo, useRef, useState } from 'react';
 import './App.css';
 
 const VISITOR_PREFIX = 'VISITOR:';
 const ADMIN_PREFIX = 'ADMIN:';
 const STORAGE_KEY = 'fastchat-demo-chat-id';
+const CHATS_PAGE_SIZE = 50;
 
-async function requestJson(url, options) {
+async function requestPage(url, options) {
   const response = await fetch(url, options);
   const payload = await response.json().catch(() => null);
 
@@ -13,7 +14,57 @@ async function requestJson(url, options) {
     throw new Error(payload?.detail ?? 'Request failed');
   }
 
-  return payload;
+  return { payload, nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
+async function requestJson(url, options) {
+  return (await requestPage(url, options)).payload;
+}
+
+// The inbox shows the most recently active chats first and loads older
+// pages only when the list is scrolled to its end.
+async function requestChatsPage(cursor) {
+  const params = new URLSearchParams({ order: 'activity', limit: String(CHATS_PAGE_SIZE) });
+  if (cursor) {
+    params.set('after', cursor);
+  }
+
+  return requestPage(`/api/chats?${params}`);
+}
+
+function lastActivity(chat) {
+  return chat.last_activity_at ?? chat.created_at;
+}
+
+// Stream events carry enough to update the loaded summaries in place.
+function applyChatEvent(chats, event) {
+  if (event.type === 'NewChatCreated') {
+    const chat = {
+      oid: event.chat_oid,
+      title: event.chat_title,
+      created_at: event.occurred_at,
+      messages_count: 0,
+      last_message_preview: null,
+      last_activity_at: event.occurred_at,
+    };
+    return [chat, ...chats.filter((item) => item.oid !== chat.oid)];
+  }
+
+  return chats.map((chat) =>
+    chat.oid === event.chat_oid
+      ? {
+          ...chat,
+          messages_count: (chat.messages_count ?? 0) + 1,
+          last_message_preview: event.message_text,
+          last_activity_at: event.occurred_at,
+        }
+      : chat,
+  );
+}
+
+function mergeChats(current, page) {
+  const known = new Set(current.map((chat) => chat.oid));
+  return [...current, ...page.filter((chat) => !known.has(chat.oid))];
 }
 
 function formatTime(value) {
@@ -28,7 +79,7 @@ function formatTime(value) {
 }
 
 function sortChats(chats) {
-  return [...chats].sort((left, right) => new Date(right.created_at) - new Date(left.created_at));
+  return [...chats].sort((left, right) => new Date(lastActivity(right)) - new Date(lastActivity(left)));
 }
 
 function sortMessages(messages = []) {
@@ -309,11 +360,19 @@ function AdminDock({
   onOpen,
   onClose,
   onSelectChat,
+  onLoadMore,
   onTextChange,
   onSubmit,
 }) {
   const sortedChats = useMemo(() => sortChats(chats), [chats]);
 
+  const handleListScroll = (event) => {
+    const list = event.currentTarget;
+    if (list.scrollHeight - list.scrollTop - list.clientHeight < 80) {
+      onLoadMore();
+    }
+  };
+
   if (!isOpen) {
     return (
       <button className="chat-launcher admin-launcher" type="button" onClick={onOpen} aria-label="Open inbox">
@@ -337,8 +396,7 @@ function AdminDock({
       {error && <div className="dock-error">{error}</div>}
 
       <div className="admin-chat-layout">
-        <div className="dock-list" aria-label="Chats">
-          {isLoading && <span className="list-note">Loading</span>}
+        <div className="dock-list" aria-label="Chats" onScroll={handleListScroll}>
           {!isLoading && sortedChats.length === 0 && <span className="list-note">No chats</span>}
           {sortedChats.map((chat) => (
             <button
@@ -348,9 +406,10 @@ function AdminDock({
               onClick={() => onSelectChat(chat.oid)}
             >
               <strong>{chat.title}</strong>
-              <span>{formatTime(chat.created_at)}</span>
+              <span>{formatTime(lastActivity(chat))}</span>
             </button>
           ))}
+          {isLoading && <span className="list-note">Loading</span>}
         </div>
 
         <div className="admin-thread">
@@ -382,6 +441,7 @@ function AdminDock({
 export default function App() {
   const [view, setView] = useState(() => (window.location.hash === '#admin' ? 'admin' : 'site'));
   const [chats, setChats] = useState([]);
+  const [chatsCursor, setChatsCursor] = useState(null);
   const [visitorChat, setVisitorChat] = useState(null);
   const [adminChat, setAdminChat] = useState(null);
   const [visitorDockOpen, setVisitorDockOpen] = useState(false);
@@ -394,17 +454,34 @@ export default function App() {
   const [isVisitorSending, setIsVisitorSending] = useState(false);
   const [isAdminSending, setIsAdminSending] = useState(false);
 
-  const sortedChats = useMemo(() => sortChats(chats), [chats]);
-
   const loadChat = async (chatId) => requestJson(`/api/chats/${chatId}`);
 
   const loadChats = async () => {
     setIsLoadingChats(true);
 
     try {
-      const payload = await requestJson('/api/chats');
-      setChats(payload);
-      return payload;
+      const page = await requestChatsPage(null);
+      setChats(page.payload);
+      setChatsCursor(page.nextCursor);
+      return page.payload;
+    } finally {
+      setIsLoadingChats(false);
+    }
+  };
+
+  const loadMoreChats = async () => {
+    if (!chatsCursor || isLoadingChats) {
+      return;
+    }
+
+    setIsLoadingChats(true);
+
+    try {
+      const page = await requestChatsPage(chatsCursor);
+      setChats((current) => mergeChats(current, page.payload));
+      setChatsCursor(page.nextCursor);
+    } catch (fetchError) {
+      setError(fetchError?.message ?? 'Chats are not available');
     } finally {
       setIsLoadingChats(false);
     }
@@ -524,8 +601,6 @@ export default function App() {
       if (adminChat?.oid === chat.oid) {
         setAdminChat(nextChat);
       }
-
-      await loadChats();
     } catch (fetchError) {
       setError(fetchError?.message ?? 'Message was not sent');
     } finally {
@@ -552,8 +627,6 @@ export default function App() {
       if (visitorChat?.oid === adminChat.oid) {
         setVisitorChat(nextChat);
       }
-
-      await loadChats();
     } catch (fetchError) {
       setError(fetchError?.message ?? 'Reply was not sent');
     } finally {
@@ -584,7 +657,9 @@ export default function App() {
   }, []);
 
   useEffect(() => {
-    loadChats().catch((fetchError) => setError(fetchError?.message ?? 'Chats are not available'));
+    if (view === 'admin') {
+      loadChats().catch((fetchError) => setError(fetchError?.message ?? 'Chats are not available'));
+    }
 
     const storedChatId = readStoredChatId();
     if (storedChatId) {
@@ -594,36 +669,88 @@ export default function App() {
     }
   }, []);
 
+  // The stream handlers read the selected and loaded chats through refs, so
+  // selecting a chat or receiving an event does not reopen the stream.
+  const visitorChatIdRef = useRef(null);
+  const adminChatIdRef = useRef(null);
+  const chatsRef = useRef([]);
+  visitorChatIdRef.current = visitorChat?.oid ?? null;
+  adminChatIdRef.current = adminChat?.oid ?? null;
+  chatsRef.current = chats;
+
+  // Visitors only listen to their own chat.
   useEffect(() => {
-    if (!visitorDockOpen && !adminDockOpen) {
+    const chatId = visitorChat?.oid;
+    if (view !== 'site' || !visitorDockOpen || !chatId) {
       return undefined;
     }
 
-    const intervalId = window.setInterval(async () => {
+    const refresh = async () => {
       try {
-        const payload = await requestJson('/api/chats');
-        setChats(payload);
-
-        if (visitorDockOpen) {
-          const visitorChatId = visitorChat?.oid ?? readStoredChatId();
-          if (visitorChatId) {
-            setVisitorChat(await loadChat(visitorChatId));
-          }
-        }
+        const chat = await loadChat(chatId);
+        setVisitorChat((current) => (current?.oid === chatId ? chat : current));
+      } catch {
+        // The next manual action will surface a visible error.
+      }
+    };
+
+    const source = new EventSource(`/api/chats/${chatId}/stream`);
+    source.onmessage = refresh;
+    source.addEventListener('lagged', refresh);
 
-        if (adminDockOpen) {
-          const adminChatId = adminChat?.oid ?? visitorChat?.oid ?? sortedChats[0]?.oid;
-          if (adminChatId) {
-            setAdminChat(await loadChat(adminChatId));
-          }
+    return () => source.close();
+  }, [view, visitorDockOpen, visitorChat?.oid]);
+
+  // Only the admin inbox listens to activity in every chat. Events update
+  // the loaded pages in place; after a gap the first page is reloaded.
+  useEffect(() => {
+    if (view !== 'admin' || !adminDockOpen) {
+      return undefined;
+    }
+
+    const refreshAdminChat = async (chatId) => {
+      const adminChatId = adminChatIdRef.current ?? visitorChatIdRef.current ?? chatId;
+      if (adminChatId && (!chatId || adminChatId === chatId)) {
+        const chat = await loadChat(adminChatId);
+        setAdminChat((current) => (!current || current.oid === adminChatId ? chat : current));
+      }
+    };
+
+    const applyEvent = async (message) => {
+      try {
+        const event = JSON.parse(message.data);
+        const isKnown =
+          event.type === 'NewChatCreated' || chatsRef.current.some((chat) => chat.oid === event.chat_oid);
+        setChats((current) => applyChatEvent(current, event));
+
+        if (!isKnown) {
+          // A chat beyond the loaded pages became active; show it on top.
+          const chat = await requestJson(`/api/chats/${event.chat_oid}?messages_limit=0`);
+          const summary = { ...chat, last_message_preview: event.message_text, last_activity_at: event.occurred_at };
+          setChats((current) => [summary, ...current.filter((item) => item.oid !== chat.oid)]);
         }
+
+        await refreshAdminChat(event.chat_oid);
       } catch {
         // The next manual action will surface a visible error.
       }
-    }, 3000);
+    };
+
+    const reload = async () => {
+      try {
+        await loadChats();
+        await refreshAdminChat(null);
+      } catch {
+        // The next manual action will surface a visible error.
+      }
+    };
+
+    const source = new EventSource('/api/chats/stream');
+    source.onmessage = applyEvent;
+    source.addEventListener('lagged', reload);
 
-    return () => window.clearInterval(intervalId);
-  }, [visitorDockOpen, adminDockOpen, visitorChat?.oid, adminChat?.oid, sortedChats]);
+    return () => source.close();
+  }, [view, adminDockOpen]);
 
   return (
     <div className="app-shell">
@@ -641,6 +768,7 @@ export default function App() {
           onOpen={openAdminDock}
           onClose={() => setAdminDockOpen(false)}
           onSelectChat={selectAdminChat}
+          onLoadMore={loadMoreChats}
           onTextChange={setAdminText}
           onSubmit={handleAdminSubmit}
         />
@@ -1,3 +1,17 @@
+from base64 import urlsafe_b64encode
+
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.application.api.main import create_app
+from app.application.api.messages.router import get_metrics, get_response_cache
+from app.application.api.messages.schemas import (
+    ChatDetailResponse,
+    ChatSummaryResponse,
+    MessagesPageResponse,
+)
+
+
 def test_create_chat_returns_201(client):
     response = client.post("/api/chats", json={"title": "Support"})
 
@@ -42,3 +56,238 @@ def test_create_message_for_missing_chat_returns_404(client):
     )
 
     assert response.status_code == 404
+
+
+def test_message_history_is_cursor_paginated(client):
+    chat_oid = client.post("/api/chats", json={"title": "History"}).json()["oid"]
+    for index in range(5):
+        client.post(f"/api/chats/{chat_oid}/messages", json={"text": f"message {index}"})
+
+    latest = client.get(f"/api/chats/{chat_oid}/messages", params={"limit": 2}).json()
+    older = client.get(
+        f"/api/chats/{chat_oid}/messages",
+        params={"limit": 2, "before": latest["prev_cursor"]},
+    ).json()
+    client.post(f"/api/chats/{chat_oid}/messages", json={"text": "message 5"})
+    newer = client.get(
+        f"/api/chats/{chat_oid}/messages",
+        params={"after": latest["next_cursor"]},
+    ).json()
+
+    assert [item["text"] for item in latest["messages"]] == ["message 3", "message 4"]
+    assert [item["text"] for item in older["messages"]] == ["message 1", "message 2"]
+    assert [item["text"] for item in newer["messages"]] == ["message 5"]
+
+
+def test_message_history_rejects_invalid_cursor(client):
+    chat_oid = client.post("/api/chats", json={"title": "Cursor"}).json()["oid"]
+
+    response = client.get(f"/api/chats/{chat_oid}/messages", params={"after": "bogus"})
+
+    assert response.status_code == 400
+
+
+def test_cursors_with_an_offset_are_rejected(client):
+    chat_oid = client.post("/api/chats", json={"title": "Aware"}).json()["oid"]
+    cursor = urlsafe_b64encode(b"2020-01-01T00:00:00+00:00|x").decode()
+
+    assert client.get("/api/chats", params={"after": cursor}).status_code == 400
+    assert client.get(f"/api/chats/{chat_oid}/messages", params={"after": cursor}).status_code == 400
+
+
+def test_list_chats_is_keyset_paginated(client):
+    for index in range(3):
+        client.post("/api/chats", json={"title": f"Inbox {index}"})
+    client.post("/api/chats", json={"title": "Other"})
+
+    first_page = client.get("/api/chats", params={"limit": 2})
+    second_page = client.get(
+        "/api/chats",
+        params={"limit": 2, "after": first_page.headers["X-Next-Cursor"]},
+    )
+    filtered = client.get("/api/chats", params={"title_prefix": "inbox"})
+
+    assert [chat["title"] for chat in first_page.json()] == ["Inbox 0", "Inbox 1"]
+    assert [chat["title"] for chat in second_page.json()] == ["Inbox 2", "Other"]
+    assert [chat["title"] for chat in filtered.json()] == ["Inbox 0", "Inbox 1", "Inbox 2"]
+    assert "X-Next-Cursor" not in filtered.headers
+
+
+def test_list_chats_by_activity_returns_summaries(client):
+    oids = [client.post("/api/chats", json={"title": f"Inbox {index}"}).json()["oid"] for index in range(3)]
+    client.post(f"/api/chats/{oids[0]}/messages", json={"text": "first"})
+    client.post(f"/api/chats/{oids[0]}/messages", json={"text": "latest"})
+
+    first_page = client.get("/api/chats", params={"order": "activity", "limit": 2})
+    second_page = client.get(
+        "/api/chats",
+        params={"order": "activity", "limit": 2, "after": first_page.headers["X-Next-Cursor"]},
+    )
+
+    assert [chat["oid"] for chat in first_page.json()] == [oids[0], oids[2]]
+    assert [chat["oid"] for chat in second_page.json()] == [oids[1]]
+    assert first_page.json()[0]["messages_count"] == 2
+    assert first_page.json()[0]["last_message_preview"] == "latest"
+    assert first_page.json()[1]["messages_count"] == 0
+
+
+def test_chat_detail_loads_only_the_newest_messages(client):
+    chat_oid = client.post("/api/chats", json={"title": "Long"}).json()["oid"]
+    for index in range(5):
+        client.post(f"/api/chats/{chat_oid}/messages", json={"text": f"message {index}"})
+
+    detail = client.get(f"/api/chats/{chat_oid}", params={"messages_limit": 2}).json()
+    older = client.get(
+        f"/api/chats/{chat_oid}/messages",
+        params={"limit": 3, "before": detail["prev_cursor"]},
+    ).json()
+    full = client.get(f"/api/chats/{chat_oid}").json()
+
+    assert [item["text"] for item in detail["messages"]] == ["message 3", "message 4"]
+    assert [item["text"] for item in older["messages"]] == ["message 0", "message 1", "message 2"]
+    assert len(full["messages"]) == 5
+    assert full["prev_cursor"] is None
+
+
+def test_read_endpoints_match_their_documented_schemas(client):
+    chat_oid = client.post("/api/chats", json={"title": "Schema"}).json()["oid"]
+    client.post(f"/api/chats/{chat_oid}/messages", json={"text": "Привет"})
+
+    detail = client.get(f"/api/chats/{chat_oid}")
+    page = client.get(f"/api/chats/{chat_oid}/messages")
+    listing = client.get("/api/chats")
+    paths = client.get("/openapi.json").json()["paths"]
+
+    ChatDetailResponse.model_validate_json(detail.content)
+    MessagesPageResponse.model_validate_json(page.content)
+    TypeAdapter(list[ChatSummaryResponse]).validate_json(listing.content)
+    assert detail.json()["messages"][0]["text"] == "Привет"
+    assert page.headers["content-type"] == "application/json"
+    schema = paths["/api/chats/{chat_oid}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/ChatDetailResponse"}
+
+
+def test_create_messages_batch_reports_per_item_results(client):
+    chat_oid = client.post("/api/chats", json={"title": "Bulk"}).json()["oid"]
+
+    response = client.post(
+        f"/api/chats/{chat_oid}/messages:batch",
+        json={"messages": [{"text": "first"}, {"text": ""}, {"text": "x" * 4001}, {"text": "last"}]},
+    )
+    history = client.get(f"/api/chats/{chat_oid}/messages").json()["messages"]
+    missing = client.post("/api/chats/missing/messages:batch", json={"messages": [{"text": "Hi"}]})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert (payload["created"], payload["failed"]) == (2, 2)
+    assert [item["status"] for item in payload["results"]] == [201, 400, 422, 201]
+    assert payload["results"][1]["error"]
+    assert [message["text"] for message in history] == ["first", "last"]
+    assert missing.status_code == 404
+
+
+def test_chat_responses_support_etags_and_are_invalidated_by_events(client):
+    chat_oid = client.post("/api/chats", json={"title": "Cached"}).json()["oid"]
+
+    detail = client.get(f"/api/chats/{chat_oid}")
+    listing_before_message = client.get("/api/chats")
+    not_modified = client.get(f"/api/chats/{chat_oid}", headers={"If-None-Match": detail.headers["ETag"]})
+    client.post(f"/api/chats/{chat_oid}/messages", json={"text": "Changed"})
+    changed = client.get(f"/api/chats/{chat_oid}", headers={"If-None-Match": detail.headers["ETag"]})
+    listing_after_message = client.get("/api/chats", headers={"If-None-Match": listing_before_message.headers["ETag"]})
+    listing = client.get("/api/chats")
+    listing_not_modified = client.get("/api/chats", headers={"If-None-Match": listing.headers["ETag"]})
+    client.post("/api/chats", json={"title": "Another"})
+    listing_changed = client.get("/api/chats", headers={"If-None-Match": listing.headers["ETag"]})
+
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert changed.status_code == 200
+    assert changed.json()["messages"][0]["text"] == "Changed"
+    assert listing_after_message.status_code == 200
+    assert listing_after_message.json()[0]["messages_count"] == 1
+    assert listing_not_modified.status_code == 304
+    assert listing_changed.status_code == 200
+    assert len(listing_changed.json()) == 2
+
+
+def test_new_message_keeps_cached_list_pages_of_other_chats(client):
+    first_oid = client.post("/api/chats", json={"title": "First"}).json()["oid"]
+    second_oid = client.post("/api/chats", json={"title": "Second"}).json()["oid"]
+    first_page = client.get("/api/chats", params={"limit": 1})
+    second_page = client.get("/api/chats", params={"limit": 1, "after": first_page.headers["X-Next-Cursor"]})
+
+    client.post(f"/api/chats/{second_oid}/messages", json={"text": "Only the second page changes"})
+    hits = get_response_cache().stats.hits
+    first_after = client.get("/api/chats", params={"limit": 1}, headers={"If-None-Match": first_page.headers["ETag"]})
+    second_after = client.get(
+        "/api/chats",
+        params={"limit": 1, "after": first_page.headers["X-Next-Cursor"]},
+        headers={"If-None-Match": second_page.headers["ETag"]},
+    )
+
+    assert first_page.json()[0]["oid"] == first_oid
+    assert first_after.status_code == 304
+    assert get_response_cache().stats.hits == hits + 1
+    assert second_after.status_code == 200
+    assert second_after.json()[0]["messages_count"] == 1
+
+
+def test_metrics_endpoint_exposes_request_and_command_metrics(client):
+    client.post("/api/chats", json={"title": "Observed"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'chat_http_request_duration_seconds_count{method="POST",route="/api/chats",status="201"} 1' in response.text
+    assert 'chat_command_duration_seconds_count{command="CreateChatCommand"} 1' in response.text
+    assert 'chat_repository_operation_duration_seconds_count{operation="add_chat_if_absent"} 1' in response.text
+
+
+def test_metrics_endpoint_is_hidden_when_disabled(monkeypatch):
+    monkeypatch.setenv("CHAT_METRICS", "off")
+    get_metrics.cache_clear()
+
+    with TestClient(create_app()) as client:
+        response = client.get("/metrics")
+
+    assert response.status_code == 404
+    get_metrics.cache_clear()
+
+
+def test_search_finds_messages_and_chats_by_prefix(client):
+    chat_oid = client.post("/api/chats", json={"title": "Поддержка заказов"}).json()["oid"]
+    client.post(f"/api/chats/{chat_oid}/messages", json={"text": "Где мой заказ?"})
+    client.post(f"/api/chats/{chat_oid}/messages", json={"text": "Ещё не пришёл"})
+
+    orders = client.get("/api/search", params={"q": "заказ*"}).json()
+    arrival = client.get("/api/search", params={"q": "ПРИШЕЛ"}).json()
+    paged = client.get("/api/search", params={"q": "заказ*", "limit": 1, "offset": 1}).json()
+
+    assert orders["total"] == 2
+    assert {hit["kind"] for hit in orders["hits"]} == {"chat", "message"}
+    assert all(hit["chat_oid"] == chat_oid for hit in orders["hits"])
+    assert arrival["hits"][0]["text"] == "Ещё не пришёл"
+    assert arrival["hits"][0]["message_oid"]
+    assert paged["total"] == 2
+    assert paged["hits"] == orders["hits"][1:]
+
+
+def test_message_writes_are_rate_limited_per_chat(monkeypatch):
+    monkeypatch.setenv("CHAT_RATE_LIMIT_CHAT", "0.01/2")
+
+    with TestClient(create_app()) as client:
+        busy_oid = client.post("/api/chats", json={"title": "Busy"}).json()["oid"]
+        quiet_oid = client.post("/api/chats", json={"title": "Quiet"}).json()["oid"]
+        statuses = [
+            client.post(f"/api/chats/{busy_oid}/messages", json={"text": "Flood"}).status_code
+            for _ in range(3)
+        ]
+        limited = client.post(f"/api/chats/{busy_oid}/messages", json={"text": "Flood"})
+        other_chat = client.post(f"/api/chats/{quiet_oid}/messages", json={"text": "Hi"})
+
+    assert statuses == [201, 201, 429]
+    assert limited.status_code == 429
+    assert int(limited.headers["retry-after"]) > 0
+    assert other_chat.status_code == 201
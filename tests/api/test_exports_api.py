@@ -0,0 +1,55 @@
+import csv
+import gzip
+import io
+import json
+
+from app.application.api.messages import exports
+
+
+def _chat_with_messages(client, title: str, count: int) -> str:
+    chat_oid = client.post("/api/chats", json={"title": title}).json()["oid"]
+    client.post(
+        f"/api/chats/{chat_oid}/messages:batch",
+        json={"messages": [{"text": f"{title} {index}"} for index in range(count)]},
+    )
+    return chat_oid
+
+
+def test_chat_export_streams_every_message_in_pages(client, monkeypatch):
+    monkeypatch.setattr(exports, "PAGE_SIZE", 2)
+    chat_oid = _chat_with_messages(client, "Compliance", 5)
+
+    response = client.get(f"/api/chats/{chat_oid}/export", headers={"Accept-Encoding": "identity"})
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    assert [row["text"] for row in rows] == [f"Compliance {index}" for index in range(5)]
+    assert {row["chat_oid"] for row in rows} == {chat_oid}
+
+
+def test_bulk_export_as_gzipped_csv(client, monkeypatch):
+    monkeypatch.setattr(exports, "PAGE_SIZE", 2)
+    for index in range(3):
+        _chat_with_messages(client, f"Chat, {index}", 3)
+
+    with client.stream(
+        "GET",
+        "/api/chats/export",
+        params={"format": "csv"},
+        headers={"Accept-Encoding": "gzip"},
+    ) as response:
+        body = gzip.decompress(b"".join(response.iter_raw()))
+
+    rows = list(csv.reader(io.StringIO(body.decode("utf-8"))))
+    assert response.headers["content-encoding"] == "gzip"
+    assert rows[0] == list(exports.EXPORT_FIELDS)
+    assert len(rows) == 1 + 9
+    assert rows[1][1] == "Chat, 0"
+
+
+def test_export_of_missing_chat_returns_404(client):
+    response = client.get("/api/chats/missing/export")
+
+    assert response.status_code == 404
@@ -0,0 +1,67 @@
+from fastapi.testclient import TestClient
+
+from app.application.api.main import create_app
+from app.application.api.messages.router import (
+    get_chat_activity,
+    get_chat_broadcaster,
+    get_chat_repository,
+    get_event_bus,
+    get_mediator,
+    get_metrics,
+    get_outbox_store,
+    get_response_cache,
+    get_search_index,
+)
+
+
+def test_chat_websocket_receives_new_messages(client):
+    chat_oid = client.post("/api/chats", json={"title": "Live"}).json()["oid"]
+
+    with client.websocket_connect(f"/api/chats/{chat_oid}/stream") as websocket:
+        client.post(f"/api/chats/{chat_oid}/messages", json={"text": "Hello live"})
+        payload = websocket.receive_json()
+
+    assert payload["type"] == "NewMessageReceivedEvent"
+    assert payload["chat_oid"] == chat_oid
+    assert payload["message_text"] == "Hello live"
+
+
+def test_inbox_websocket_receives_new_chats(client):
+    with client.websocket_connect("/api/chats/stream") as websocket:
+        chat_oid = client.post("/api/chats", json={"title": "Inbox live"}).json()["oid"]
+        payload = websocket.receive_json()
+
+    assert payload["type"] == "NewChatCreated"
+    assert payload["chat_oid"] == chat_oid
+
+
+def test_chat_stream_for_missing_chat_returns_404(client):
+    response = client.get("/api/chats/missing-chat/stream")
+
+    assert response.status_code == 404
+
+
+def test_events_are_relayed_through_outbox(monkeypatch):
+    monkeypatch.setenv("CHAT_OUTBOX", "memory")
+    monkeypatch.setenv("CHAT_OUTBOX_POLL_INTERVAL", "0.01")
+    for provider in (
+        get_mediator,
+        get_metrics,
+        get_chat_broadcaster,
+        get_event_bus,
+        get_outbox_store,
+        get_response_cache,
+        get_chat_repository,
+        get_search_index,
+        get_chat_activity,
+    ):
+        provider.cache_clear()
+
+    with TestClient(create_app()) as client:
+        chat_oid = client.post("/api/chats", json={"title": "Outbox"}).json()["oid"]
+        with client.websocket_connect(f"/api/chats/{chat_oid}/stream") as websocket:
+            client.post(f"/api/chats/{chat_oid}/messages", json={"text": "Relayed"})
+            payload = websocket.receive_json()
+
+    assert payload["message_text"] == "Relayed"
+    get_outbox_store.cache_clear()
@@ -9,12 +9,32 @@ if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from app.application.api.main import create_app  # noqa: E402
-from app.application.api.messages.router import get_mediator  # noqa: E402
+from app.application.api.messages.router import (  # noqa: E402
+    get_chat_activity,
+    get_chat_broadcaster,
+    get_chat_repository,
+    get_event_bus,
+    get_event_publisher,
+    get_mediator,
+    get_metrics,
+    get_outbox_store,
+    get_response_cache,
+    get_search_index,
+)
 
 
 @pytest.fixture
 def client() -> TestClient:
     get_mediator.cache_clear()
+    get_metrics.cache_clear()
+    get_chat_broadcaster.cache_clear()
+    get_event_publisher.cache_clear()
+    get_event_bus.cache_clear()
+    get_outbox_store.cache_clear()
+    get_response_cache.cache_clear()
+    get_chat_repository.cache_clear()
+    get_search_index.cache_clear()
+    get_chat_activity.cache_clear()
     app = create_app()
     with TestClient(app) as test_client:
         yield test_client
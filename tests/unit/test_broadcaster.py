@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+from app.application.api.messages.streams import _sse_response
+from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
+from app.infra.push.broadcaster import INBOX_TOPIC, ChatBroadcaster
+
+
+def test_publish_reaches_only_matching_topics():
+    async def scenario():
+        broadcaster = ChatBroadcaster()
+        chat_subscription = broadcaster.subscribe("chat-1")
+        other_subscription = broadcaster.subscribe("chat-2")
+        inbox_subscription = broadcaster.subscribe(INBOX_TOPIC)
+
+        broadcaster.publish(
+            NewMessageReceivedEvent(message_text="Hi", message_oid="m-1", chat_oid="chat-1"),
+            topics=("chat-1", INBOX_TOPIC),
+        )
+
+        assert json.loads(await chat_subscription.get())["message_oid"] == "m-1"
+        assert json.loads(await inbox_subscription.get())["type"] == "NewMessageReceivedEvent"
+        assert other_subscription.queue.empty()
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_drops_oldest_events():
+    async def scenario():
+        broadcaster = ChatBroadcaster(queue_size=2)
+        subscription = broadcaster.subscribe(INBOX_TOPIC)
+
+        for index in range(5):
+            broadcaster.publish(
+                NewChatCreated(chat_oid=f"chat-{index}", chat_title="Title"),
+                topics=(INBOX_TOPIC,),
+            )
+
+        assert subscription.take_dropped() == 3
+        assert json.loads(await subscription.get())["chat_oid"] == "chat-3"
+        assert json.loads(await subscription.get())["chat_oid"] == "chat-4"
+
+        broadcaster.unsubscribe(subscription)
+        assert broadcaster.subscribers_count == 0
+
+    asyncio.run(scenario())
+
+
+def test_sse_stream_subscribes_only_while_iterated():
+    async def scenario():
+        broadcaster = ChatBroadcaster()
+        response = _sse_response(broadcaster, "chat-1")
+        assert broadcaster.subscribers_count == 0
+
+        body = response.body_iterator
+        pending = asyncio.ensure_future(body.__anext__())
+        await asyncio.sleep(0)
+        assert broadcaster.subscribers_count == 1
+
+        broadcaster.publish(
+            NewChatCreated(chat_oid="chat-1", chat_title="Title"),
+            topics=("chat-1",),
+        )
+        assert json.loads((await pending).removeprefix("data: "))["chat_oid"] == "chat-1"
+        await body.aclose()
+        assert broadcaster.subscribers_count == 0
+
+    asyncio.run(scenario())
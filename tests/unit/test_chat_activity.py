@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.read_models.chat_activity import (
+    PREVIEW_LENGTH,
+    MemoryChatActivityReadModel,
+    _SortedKeys,
+    load_chat_activity,
+)
+from app.infra.repositories.messages import MemoryChatRepository
+
+
+START = datetime(2024, 1, 1)
+
+
+def _at(seconds: int) -> datetime:
+    return START + timedelta(seconds=seconds)
+
+
+def test_messages_move_chats_to_the_top_of_the_activity_order():
+    read_model = MemoryChatActivityReadModel()
+    for index, oid in enumerate(("a", "b", "c")):
+        read_model.apply_chat_created(uuid4(), oid, f"Chat {oid}", _at(index))
+    read_model.apply_message_received(uuid4(), "a", "m-1", "hello", _at(10))
+
+    first = read_model.list_by_activity(limit=2)
+    second = read_model.list_by_activity(limit=2, after=first[-1].activity_key)
+
+    assert [activity.chat_oid for activity in first] == ["a", "c"]
+    assert [activity.chat_oid for activity in second] == ["b"]
+    assert read_model.get("a").messages_count == 1
+    assert read_model.get("a").last_message_preview == "hello"
+    assert read_model.get("a").last_activity_at == _at(10)
+
+
+def test_replayed_events_and_long_texts():
+    read_model = MemoryChatActivityReadModel()
+    event_id = uuid4()
+    read_model.apply_chat_created(uuid4(), "a", "Support", _at(0))
+
+    read_model.apply_message_received(event_id, "a", "m-1", "x" * (PREVIEW_LENGTH + 50), _at(1))
+    read_model.apply_message_received(event_id, "a", "m-1", "x" * (PREVIEW_LENGTH + 50), _at(1))
+
+    activity = read_model.get("a")
+    assert activity.messages_count == 1
+    assert len(activity.last_message_preview) == PREVIEW_LENGTH
+    assert [item.chat_oid for item in read_model.list_by_activity(limit=10, title_prefix="sup")] == ["a"]
+    assert read_model.list_by_activity(limit=10, title_prefix="sales") == []
+
+
+def test_activity_order_is_kept_across_many_runs(monkeypatch):
+    monkeypatch.setattr(_SortedKeys, "_LOAD", 2)
+    read_model = MemoryChatActivityReadModel()
+    # Chats created out of order, as events replayed from several sources are.
+    for index in (5, 1, 8, 3, 0, 9, 2, 7, 4, 6):
+        read_model.apply_chat_created(uuid4(), f"c-{index}", "Chat", _at(index))
+    for index in (0, 9, 4):
+        read_model.apply_message_received(uuid4(), f"c-{index}", f"m-{index}", "hi", _at(20 + index))
+
+    pages, after = [], None
+    while page := read_model.list_by_activity(limit=3, after=after):
+        pages.append([activity.chat_oid for activity in page])
+        after = page[-1].activity_key
+
+    assert sum(pages, []) == [f"c-{index}" for index in (9, 4, 0, 8, 7, 6, 5, 3, 2, 1)]
+    assert [len(page) for page in pages] == [3, 3, 3, 1]
+
+
+def test_restore_keeps_messages_applied_while_it_ran():
+    read_model = MemoryChatActivityReadModel()
+    read_model.start_restore()
+    # One message is in the stored snapshot too, one arrived after it was read.
+    read_model.apply_message_received(uuid4(), "a", "m-2", "second", _at(2))
+    read_model.apply_message_received(uuid4(), "a", "m-3", "third", _at(3))
+
+    read_model.restore("a", "Support", _at(0), 2, "m-2", "second", _at(2))
+    read_model.finish_restore()
+    read_model.apply_message_received(uuid4(), "a", "m-4", "fourth", _at(4))
+
+    activity = read_model.get("a")
+    assert activity.messages_count == 4
+    assert activity.last_message_preview == "fourth"
+    assert activity.last_activity_at == _at(4)
+
+
+def test_load_chat_activity_counts_stored_messages():
+    async def scenario():
+        repository = MemoryChatRepository()
+        now = datetime.now()
+        quiet = Chat(title=Title(value="Quiet"), created_at=now - timedelta(minutes=10))
+        busy = Chat(title=Title(value="Busy"), created_at=now - timedelta(minutes=20))
+        await repository.add_chat(quiet)
+        await repository.add_chat(busy)
+        await repository.add_messages(busy.oid, [
+            Message(text=Text(value=f"text {index}"), created_at=now - timedelta(minutes=5 - index))
+            for index in range(5)
+        ])
+
+        read_model = MemoryChatActivityReadModel()
+        restored = await load_chat_activity(read_model, repository, page_size=2)
+
+        assert restored == 2
+        assert read_model.get(busy.oid).messages_count == 5
+        assert read_model.get(busy.oid).last_message_preview == "text 4"
+        assert read_model.get(quiet.oid).messages_count == 0
+        assert [item.chat_oid for item in read_model.list_by_activity(limit=10)] == [busy.oid, quiet.oid]
+
+    asyncio.run(scenario())
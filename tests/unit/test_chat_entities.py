@@ -1,4 +1,6 @@
-from app.domain.entities.messages import Chat, Message
+from datetime import datetime, timedelta
+
+from app.domain.entities.messages import Chat, Message, MessageLog, message_sort_key
 from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
 from app.domain.values.messages import Text, Title
 
@@ -9,7 +11,7 @@ def test_create_chat_registers_event_and_sets_title():
     chat = Chat.create_chat(title=title)
 
     assert chat.title == title
-    assert chat.messages == set()
+    assert len(chat.messages) == 0
 
     events = chat.pull_events()
     assert len(events) == 1
@@ -33,3 +35,27 @@ def test_add_messages_adds_message_and_registers_event():
     assert events[0].chat_oid == chat.oid
     assert events[0].message_oid == message.oid
     assert events[0].message_text == message.text.as_generic_type()
+
+
+def test_message_log_keeps_time_order_and_pages_by_key():
+    now = datetime.now()
+    first = Message(text=Text(value="first"), created_at=now)
+    second = Message(text=Text(value="second"), created_at=now + timedelta(seconds=1))
+    third = Message(text=Text(value="third"), created_at=now + timedelta(seconds=2))
+    log = MessageLog([first, third])
+
+    log.append(second)
+    log.append(second)
+
+    assert list(log) == [first, second, third]
+    assert log.page(limit=2) == [second, third]
+    assert log.page(limit=10, after=message_sort_key(first)) == [second, third]
+    assert log.page(limit=1, before=message_sort_key(third)) == [second]
+
+
+def test_messages_are_slotted_and_do_not_carry_events():
+    message = Message(text=Text(value="Hi"))
+
+    assert not hasattr(message, "__dict__")
+    assert not hasattr(message.text, "__dict__")
+    assert not hasattr(message, "_events")
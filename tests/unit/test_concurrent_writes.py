@@ -0,0 +1,90 @@
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.events.messages import NewMessageReceivedEvent
+from app.domain.values.messages import Title
+from app.infra.kafka.producer import NoopEventPublisher
+from app.infra.repositories.durable import DurableMemoryChatRepository
+from app.infra.repositories.messages import MemoryChatRepository
+from app.logic.commands.messages import CreateChatCommand, CreateMessageCommand
+from app.logic.events.base import EventHandler
+from app.logic.exceptions.messages import CheckWithThatTitleAlreadyExistsException
+from app.logic.init import init_mediator
+from app.logic.mediator import Mediator
+
+
+@dataclass(eq=False)
+class YieldingChatRepository(MemoryChatRepository):
+    """Memory repository that awaits mid-write like a networked backend."""
+
+    writers: Counter = field(default_factory=Counter, kw_only=True)
+    max_writers_per_chat: int = field(default=0, kw_only=True)
+    max_writers: int = field(default=0, kw_only=True)
+
+    async def add_message(self, chat_oid: str, message: Message) -> Chat | None:
+        self.writers[chat_oid] += 1
+        self.max_writers_per_chat = max(self.max_writers_per_chat, self.writers[chat_oid])
+        self.max_writers = max(self.max_writers, sum(self.writers.values()))
+        try:
+            chat = await super().add_message(chat_oid, message)
+            await asyncio.sleep(0)
+            return chat
+        finally:
+            self.writers[chat_oid] -= 1
+
+
+@dataclass
+class RecordingHandler(EventHandler[NewMessageReceivedEvent, None]):
+    message_oids: list[str] = field(default_factory=list)
+
+    async def handle(self, event: NewMessageReceivedEvent) -> None:
+        self.message_oids.append(event.message_oid)
+
+
+def test_thousands_of_writers_keep_per_chat_order_without_a_global_lock():
+    async def scenario():
+        repository = YieldingChatRepository()
+        mediator = Mediator()
+        init_mediator(mediator, chat_repository=repository, event_publisher=NoopEventPublisher())
+        recorder = RecordingHandler()
+        mediator.register_event(NewMessageReceivedEvent, [recorder])
+
+        chats = [Chat(title=Title(value=f"chat {index}")) for index in range(50)]
+        for chat in chats:
+            await repository.add_chat(chat)
+        results = await asyncio.gather(*(
+            mediator.handle_command(CreateMessageCommand(chat_oid=chat.oid, text=f"{chat.oid} {index}"))
+            for index in range(40)
+            for chat in chats
+        ))
+        return repository, recorder, chats, [result[0] for result in results]
+
+    repository, recorder, chats, messages = asyncio.run(scenario())
+
+    assert repository.max_writers_per_chat == 1
+    assert repository.max_writers > 1
+    # Every request published exactly its own event.
+    assert sorted(recorder.message_oids) == sorted(message.oid for message in messages)
+    assert all(len(chat.messages) == 40 for chat in chats)
+
+
+def test_concurrent_creates_with_the_same_title_add_one_chat(tmp_path):
+    async def scenario():
+        repository = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        mediator = Mediator()
+        init_mediator(mediator, chat_repository=repository, event_publisher=NoopEventPublisher())
+        results = await asyncio.gather(
+            *(mediator.handle_command(CreateChatCommand(title=f"title {index % 100}")) for index in range(2000)),
+            return_exceptions=True,
+        )
+        chats = await repository.list_chats()
+        await repository.stop()
+        return results, chats
+
+    results, chats = asyncio.run(scenario())
+
+    duplicates = [result for result in results if isinstance(result, CheckWithThatTitleAlreadyExistsException)]
+    assert len(chats) == 100
+    assert len(duplicates) == 1900
@@ -0,0 +1,80 @@
+import asyncio
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.durable import DurableMemoryChatRepository
+
+
+async def _fill(repository: DurableMemoryChatRepository) -> str:
+    chat = Chat.create_chat(title=Title(value="Durable"))
+    await repository.add_chat(chat)
+    await asyncio.gather(*(
+        repository.add_message(chat.oid, Message(text=Text(value=f"message {index}")))
+        for index in range(20)
+    ))
+    await repository.add_messages(chat.oid, [Message(text=Text(value="batch"))])
+    return chat.oid
+
+
+def test_restart_replays_the_log_with_group_commit(tmp_path):
+    async def scenario():
+        repository = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        chat_oid = await _fill(repository)
+        await repository.stop()
+        # Concurrent writers share writes instead of one write per record.
+        assert repository.commits < repository.committed_records == 22
+
+        restarted = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        chat = await restarted.get_chat_by_oid(chat_oid)
+        await restarted.stop()
+        return chat
+
+    chat = asyncio.run(scenario())
+
+    assert chat.title.as_generic_type() == "Durable"
+    assert len(chat.messages) == 21
+    assert chat.pull_events() == []
+
+
+def test_compaction_writes_a_snapshot_and_drops_sealed_segments(tmp_path):
+    async def scenario():
+        repository = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        chat_oid = await _fill(repository)
+        await repository.compact()
+        await repository.add_message(chat_oid, Message(text=Text(value="after snapshot")))
+        await repository.stop()
+
+        restarted = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        messages = await restarted.get_messages(chat_oid, limit=100)
+        await restarted.stop()
+        return messages
+
+    messages = asyncio.run(scenario())
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "snapshot-00000002.snap",
+        "wal-00000002.log",
+        "wal-00000003.log",
+    ]
+    assert len(messages) == 22
+    assert messages[-1].text.as_generic_type() == "after snapshot"
+
+
+def test_torn_log_tail_is_ignored(tmp_path):
+    async def scenario():
+        repository = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        chat_oid = await _fill(repository)
+        await repository.stop()
+        with open(tmp_path / "wal-00000001.log", "ab") as file:
+            file.write(b"\x40\x00\x00\x00garbage")
+
+        restarted = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        await restarted.add_message(chat_oid, Message(text=Text(value="after crash")))
+        await restarted.stop()
+
+        again = DurableMemoryChatRepository(str(tmp_path), fsync=False)
+        chat = await again.get_chat_by_oid(chat_oid)
+        await again.stop()
+        return chat
+
+    assert len(asyncio.run(scenario()).messages) == 22
@@ -0,0 +1,19 @@
+import json
+from datetime import datetime
+
+from app.application.api.messages import encoders
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+
+
+def test_stdlib_fallback_encodes_like_orjson(monkeypatch):
+    chat = Chat(title=Title(value="Поддержка"), created_at=datetime(2024, 1, 2, 3, 4, 5, 6))
+    chat.messages.append(Message(text=Text(value="Привет"), created_at=datetime(2024, 1, 2, 3, 4, 6)))
+
+    fast = encoders.encode_chat_detail(chat, prev_cursor="cursor")
+    monkeypatch.setattr(encoders, "orjson", None)
+    fallback = encoders.encode_chat_detail(chat, prev_cursor="cursor")
+
+    assert json.loads(fallback) == json.loads(fast)
+    assert json.loads(fast)["created_at"] == "2024-01-02T03:04:05.000006"
+    assert json.loads(fast)["messages"][0]["created_at"] == "2024-01-02T03:04:06"
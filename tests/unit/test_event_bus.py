@@ -0,0 +1,97 @@
+import asyncio
+
+from app.domain.events.messages import NewMessageReceivedEvent
+from app.infra.bus.events import UnixSocketBusHub, UnixSocketEventBus
+from app.infra.bus.kafka import KafkaEventBus
+from app.infra.cache.responses import ResponseCache, chat_tag
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.kafka.fake import FakeKafkaBroker
+from app.infra.kafka.producer import NoopEventPublisher
+from app.infra.push.broadcaster import ChatBroadcaster
+from app.infra.repositories.sqlite import SQLiteChatRepository
+from app.logic.commands.messages import CreateChatCommand, CreateMessageCommand, GetChatCommand
+from app.logic.init import init_fanout_mediator, init_mediator
+from app.logic.mediator import Mediator
+
+
+async def _start_node(database: str, bus: UnixSocketEventBus) -> tuple[Mediator, ChatBroadcaster, ResponseCache]:
+    broadcaster, cache = ChatBroadcaster(), ResponseCache()
+    mediator, fanout_mediator = Mediator(), Mediator()
+    init_mediator(
+        mediator,
+        chat_repository=SQLiteChatRepository(database),
+        event_publisher=NoopEventPublisher(),
+        broadcaster=broadcaster,
+        response_cache=cache,
+        event_bus=bus,
+    )
+    init_fanout_mediator(fanout_mediator, broadcaster, cache)
+    await bus.start(fanout_mediator.handle_event)
+    return mediator, broadcaster, cache
+
+
+def test_messages_written_on_one_node_reach_every_node(tmp_path):
+    async def scenario():
+        hub = UnixSocketBusHub(str(tmp_path / "bus.sock"))
+        await hub.start()
+        database = str(tmp_path / "chats.sqlite3")
+        first_bus, second_bus = UnixSocketEventBus(hub.path, "a"), UnixSocketEventBus(hub.path, "b")
+        first, first_broadcaster, first_cache = await _start_node(database, first_bus)
+        second, second_broadcaster, _ = await _start_node(database, second_bus)
+
+        chat = (await second.handle_command(CreateChatCommand(title="Shared")))[0]
+        first_cache.put(chat_tag(chat.oid), b"{}", tag=chat_tag(chat.oid), version=0)
+        first_subscription = first_broadcaster.subscribe(chat.oid)
+        second_subscription = second_broadcaster.subscribe(chat.oid)
+        await second.handle_command(CreateMessageCommand(chat_oid=chat.oid, text="Hello from b"))
+
+        async with asyncio.timeout(2):
+            pushed = await first_subscription.get()
+        await asyncio.sleep(0.05)
+        loaded = (await first.handle_command(GetChatCommand(chat_oid=chat.oid)))[0]
+
+        assert "Hello from b" in pushed
+        assert second_subscription.queue.qsize() == 1
+        assert first_cache.get(chat_tag(chat.oid)) is None
+        assert [message.text.as_generic_type() for message in loaded.messages] == ["Hello from b"]
+        for bus in (first_bus, second_bus):
+            await bus.stop()
+        await hub.stop()
+
+    asyncio.run(scenario())
+
+
+def test_kafka_bus_skips_events_from_its_own_node():
+    async def scenario():
+        broker = FakeKafkaBroker()
+        config = KafkaBrokerConfig(topic_prefix="chat", consumer_poll_timeout_ms=10)
+        received = {"a": [], "b": []}
+        buses = {
+            node_id: KafkaEventBus(
+                config,
+                node_id=node_id,
+                producer_client=broker.producer(),
+                consumer_client=broker.consumer(config.bus_topic, group_id=None),
+            )
+            for node_id in received
+        }
+        for node_id, bus in buses.items():
+            await bus.start(lambda event, node_id=node_id: _record(received[node_id], event))
+
+        event = NewMessageReceivedEvent(message_text="Hi", message_oid="m-1", chat_oid="c-1")
+        await buses["a"].publish([event])
+        async with asyncio.timeout(2):
+            while not received["b"]:
+                await asyncio.sleep(0.01)
+        for bus in buses.values():
+            await bus.stop()
+
+        assert [item.event_id for item in received["b"]] == [event.event_id]
+        assert received["a"] == []
+        assert broker._committed == {}
+
+    asyncio.run(scenario())
+
+
+async def _record(target: list, event) -> None:
+    target.append(event)
@@ -0,0 +1,46 @@
+import pytest
+
+from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
+from app.infra.serialization import events as serialization
+from app.infra.serialization.codecs import JSONCodec, get_codec
+from app.infra.serialization.events import (
+    UnsupportedSchemaVersionError,
+    event_from_envelope,
+    event_to_envelope,
+)
+
+EVENT = NewMessageReceivedEvent(message_text="Привет", message_oid="m-1", chat_oid="c-1")
+
+
+@pytest.mark.parametrize("codec_name", ["json", "msgpack"])
+def test_codecs_round_trip_events(codec_name):
+    codec = get_codec(codec_name)
+
+    decoded = event_from_envelope(codec.decode(codec.encode(event_to_envelope(EVENT))))
+
+    assert decoded == EVENT
+
+
+def test_envelope_carries_schema_version_and_json_safe_payload():
+    envelope = event_to_envelope(EVENT)
+
+    assert envelope["type"] == "NewMessageReceivedEvent"
+    assert envelope["version"] == 1
+    assert envelope["payload"]["event_id"] == str(EVENT.event_id)
+    assert JSONCodec().decode(JSONCodec().encode(envelope)) == envelope
+
+
+def test_older_versions_are_upcast_and_newer_rejected(monkeypatch):
+    serializer = serialization.EventSerializer(NewChatCreated, schema_version=2)
+    monkeypatch.setitem(serialization.EVENT_SERIALIZERS, "NewChatCreated", serializer)
+    monkeypatch.setitem(
+        serialization.UPCASTERS,
+        ("NewChatCreated", 1),
+        lambda payload: {"chat_oid": payload["chat_oid"], "chat_title": payload["title"]},
+    )
+
+    upcast = event_from_envelope({"type": "NewChatCreated", "version": 1, "payload": {"chat_oid": "c-1", "title": "Old"}})
+
+    assert upcast.chat_title == "Old"
+    with pytest.raises(UnsupportedSchemaVersionError):
+        event_from_envelope({"type": "NewChatCreated", "version": 3, "payload": {}})
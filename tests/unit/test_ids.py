@@ -0,0 +1,39 @@
+from app.domain.ids import UUID7Generator
+
+
+def test_uuid7_ids_are_monotonic_within_one_millisecond():
+    generator = UUID7Generator(clock=lambda: 1_700_000_000_000 * 1_000_000)
+
+    # More ids than the 12-bit counter holds, all in the same millisecond.
+    ids = [generator() for _ in range(5_000)]
+
+    assert ids == sorted(ids)
+    assert [str(identifier) for identifier in ids] == sorted(str(identifier) for identifier in ids)
+    assert len(set(ids)) == len(ids)
+    assert ids[0].int >> 80 == 1_700_000_000_000
+    assert all(identifier.version == 7 for identifier in ids)
+
+
+def test_uuid7_ids_do_not_go_back_when_the_clock_does():
+    now = [2_000 * 1_000_000]
+    generator = UUID7Generator(clock=lambda: now[0])
+
+    first = generator()
+    now[0] = 1_000 * 1_000_000
+    second = generator()
+
+    assert second > first
+    assert second.int >> 80 == 2_000
+
+
+def test_uuid7_counter_starts_below_2048():
+    now = [0]
+    generator = UUID7Generator(clock=lambda: now[0])
+
+    starts = []
+    for millisecond in range(1, 500):
+        now[0] = millisecond * 1_000_000
+        starts.append((generator().int >> 64) & 0xFFF)
+
+    assert max(starts) < 2048
+    assert max(starts) >= 32
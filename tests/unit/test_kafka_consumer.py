@@ -0,0 +1,75 @@
+import asyncio
+
+from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.kafka.consumer import KafkaEventConsumer
+from app.infra.kafka.fake import FakeKafkaBroker
+from app.infra.kafka.producer import KafkaEventProducer
+
+TOPICS = ["chat.NewChatCreated", "chat.NewMessageReceivedEvent"]
+
+
+def _consumer(broker: FakeKafkaBroker, config: KafkaBrokerConfig, dispatch) -> KafkaEventConsumer:
+    return KafkaEventConsumer(
+        config,
+        dispatch=dispatch,
+        client=broker.consumer(*TOPICS, group_id=config.consumer_group),
+        dead_letter_producer=broker.producer(),
+    )
+
+
+def test_consumer_dispatches_batches_and_commits_offsets():
+    async def scenario():
+        broker = FakeKafkaBroker(partitions=2)
+        config = KafkaBrokerConfig(consumer_poll_timeout_ms=0, partition_concurrency=4)
+        producer = KafkaEventProducer(config, client=broker.producer())
+        await producer.publish(NewChatCreated(chat_oid="c-1", chat_title="Support"))
+        for index in range(3):
+            await producer.publish(
+                NewMessageReceivedEvent(message_text=f"text {index}", message_oid=f"m-{index}", chat_oid="c-1")
+            )
+
+        dispatched = []
+
+        async def dispatch(event):
+            dispatched.append(event)
+
+        assert await _consumer(broker, config, dispatch).consume_batch() == 4
+        # A new consumer in the same group resumes after the committed offsets.
+        assert await _consumer(broker, config, dispatch).consume_batch() == 0
+
+        assert [event.chat_title for event in dispatched if isinstance(event, NewChatCreated)] == ["Support"]
+        assert sorted(event.message_oid for event in dispatched if isinstance(event, NewMessageReceivedEvent)) == [
+            "m-0",
+            "m-1",
+            "m-2",
+        ]
+
+    asyncio.run(scenario())
+
+
+def test_poison_and_failing_records_go_to_dead_letter_topic():
+    async def scenario():
+        broker = FakeKafkaBroker()
+        config = KafkaBrokerConfig(consumer_poll_timeout_ms=0, consumer_max_retries=2)
+        producer = KafkaEventProducer(config, client=broker.producer())
+        broker.append("chat.NewChatCreated", b"not json")
+        await producer.publish(NewChatCreated(chat_oid="c-1", chat_title="Broken"))
+        await producer.publish(NewChatCreated(chat_oid="c-2", chat_title="Fine"))
+
+        attempts = []
+
+        async def dispatch(event):
+            attempts.append(event.chat_oid)
+            if event.chat_oid == "c-1":
+                raise RuntimeError("handler failed")
+
+        await _consumer(broker, config, dispatch).consume_batch()
+
+        dead_letters = broker.records(config.dead_letter_topic)
+        assert [record.value for record in dead_letters][0] == b"not json"
+        assert len(dead_letters) == 2
+        assert dict(dead_letters[1].headers)["source-offset"] == b"1"
+        assert attempts == ["c-1", "c-1", "c-2"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,144 @@
+import asyncio
+import json
+
+from app.domain.events.messages import NewMessageReceivedEvent
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.kafka.producer import BufferedKafkaEventProducer, KafkaEventProducer
+
+
+class FakeKafkaClient:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.sent: list[tuple[str, dict]] = []
+        self.stopped = False
+
+    async def send(self, topic: str, value: bytes, headers=None):
+        async def deliver():
+            await asyncio.sleep(self.delay)
+            self.sent.append((topic, json.loads(value)))
+
+        return asyncio.ensure_future(deliver())
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+class FlakyKafkaClient(FakeKafkaClient):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    async def send(self, topic: str, value: bytes, headers=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker is down")
+        return await super().send(topic, value, headers)
+
+
+def _event(index: int) -> NewMessageReceivedEvent:
+    return NewMessageReceivedEvent(message_text=f"text {index}", message_oid=f"m-{index}", chat_oid="c-1")
+
+
+def test_buffered_producer_flushes_in_batches_and_drains_on_stop():
+    async def scenario():
+        client = FakeKafkaClient()
+        producer = BufferedKafkaEventProducer(
+            KafkaBrokerConfig(flush_batch_size=4, linger_ms=50),
+            client=client,
+        )
+
+        for index in range(10):
+            await producer.publish(_event(index))
+        await producer.stop()
+
+        assert [payload["payload"]["message_oid"] for _, payload in client.sent] == [
+            f"m-{index}" for index in range(10)
+        ]
+        assert client.sent[0][0] == "chat.NewMessageReceivedEvent"
+        assert producer.stats.published_events == 10
+        assert producer.stats.flushes == 3
+        assert client.stopped
+
+    asyncio.run(scenario())
+
+
+def test_buffered_producer_applies_backpressure_when_full():
+    async def scenario():
+        client = FakeKafkaClient(delay=0.05)
+        producer = BufferedKafkaEventProducer(
+            KafkaBrokerConfig(buffer_size=2, flush_batch_size=1, linger_ms=0),
+            client=client,
+        )
+
+        for index in range(3):
+            await producer.publish(_event(index))
+        blocked = asyncio.create_task(producer.publish(_event(3)))
+        await asyncio.sleep(0.01)
+
+        assert producer.queue_depth == 2
+        assert not blocked.done()
+
+        await blocked
+        await producer.stop()
+        assert len(client.sent) == 4
+
+    asyncio.run(scenario())
+
+
+def test_publish_batch_sends_every_event_before_waiting():
+    async def scenario():
+        client = FakeKafkaClient(delay=0.05)
+        producer = KafkaEventProducer(KafkaBrokerConfig(topic_prefix="chat"), client=client)
+
+        started = asyncio.get_running_loop().time()
+        await producer.publish_batch([_event(index) for index in range(10)])
+        elapsed = asyncio.get_running_loop().time() - started
+
+        assert [payload["payload"]["message_oid"] for _, payload in client.sent] == [
+            f"m-{index}" for index in range(10)
+        ]
+        assert elapsed < 0.2
+
+    asyncio.run(scenario())
+
+
+def test_producer_lingers_only_in_batch_mode():
+    assert KafkaBrokerConfig(publish_mode="sync", linger_ms=5).producer_linger_ms == 0
+    assert KafkaBrokerConfig(publish_mode="batch", linger_ms=5).producer_linger_ms == 5
+
+
+def test_buffered_producer_retries_failed_flushes():
+    async def scenario():
+        client = FlakyKafkaClient(failures=2)
+        producer = BufferedKafkaEventProducer(
+            KafkaBrokerConfig(flush_batch_size=4, linger_ms=0, flush_retries=3, flush_retry_backoff_ms=1),
+            client=client,
+        )
+
+        for index in range(3):
+            await producer.publish(_event(index))
+        await producer.stop()
+
+        assert [payload["payload"]["message_oid"] for _, payload in client.sent] == ["m-0", "m-1", "m-2"]
+        assert producer.stats.published_events == 3
+        assert producer.stats.failed_events == 0
+
+    asyncio.run(scenario())
+
+
+def test_buffered_producer_drops_events_after_the_last_retry():
+    async def scenario():
+        client = FlakyKafkaClient(failures=100)
+        producer = BufferedKafkaEventProducer(
+            KafkaBrokerConfig(flush_batch_size=4, linger_ms=0, flush_retries=2, flush_retry_backoff_ms=1),
+            client=client,
+        )
+
+        await producer.publish(_event(0))
+        await producer.stop()
+
+        assert client.sent == []
+        assert producer.stats.flushes == 3
+        assert producer.stats.failed_events == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,100 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+import pytest
+
+from app.domain.events.messages import NewChatCreated
+from app.infra.outbox.stores import MemoryOutboxStore
+from app.logic.events.base import EventHandler
+from app.logic.exceptions.mediator import EventHandlersFailedException
+from app.logic.mediator import Mediator
+
+
+@dataclass
+class SleepingHandler(EventHandler[NewChatCreated, str]):
+    name: str
+    delay: float = 0.0
+    fail: bool = False
+    calls: list[str] = field(default_factory=list)
+
+    async def handle(self, event: NewChatCreated) -> str:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(self.name)
+        self.calls.append(self.name)
+        return self.name
+
+
+EVENT = NewChatCreated(chat_oid="c-1", chat_title="Support")
+
+
+def test_concurrent_dispatch_runs_handlers_in_parallel():
+    async def scenario():
+        mediator = Mediator(concurrent_events=True)
+        mediator.register_event(
+            NewChatCreated,
+            [SleepingHandler(name="kafka", delay=0.1), SleepingHandler(name="search", delay=0.1)],
+        )
+
+        started = time.perf_counter()
+        results = await mediator.handle_event(EVENT)
+
+        assert results == ["kafka", "search"]
+        assert time.perf_counter() - started < 0.18
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_dispatch_collects_errors_and_timeouts():
+    async def scenario():
+        survivor = SleepingHandler(name="survivor", delay=0.02)
+        mediator = Mediator(concurrent_events=True, handler_timeout=0.05)
+        mediator.register_event(
+            NewChatCreated,
+            [
+                SleepingHandler(name="broken", fail=True),
+                SleepingHandler(name="slow", delay=1),
+                survivor,
+            ],
+        )
+
+        with pytest.raises(EventHandlersFailedException) as error:
+            await mediator.handle_event(EVENT)
+
+        assert survivor.calls == ["survivor"]
+        assert [type(exc) for exc in error.value.errors] == [RuntimeError, TimeoutError]
+
+    asyncio.run(scenario())
+
+
+def test_non_critical_handlers_run_in_background():
+    async def scenario():
+        background = SleepingHandler(name="metrics", delay=0.05, critical=False)
+        mediator = Mediator(background_non_critical=True)
+        mediator.register_event(NewChatCreated, [SleepingHandler(name="kafka"), background])
+
+        results = await mediator.handle_event(EVENT)
+
+        assert results == ["kafka"]
+        assert background.calls == []
+        await mediator.wait_background()
+        assert background.calls == ["metrics"]
+
+    asyncio.run(scenario())
+
+
+def test_outbox_defers_only_deferred_handlers():
+    async def scenario():
+        kafka = SleepingHandler(name="kafka", deferred=True)
+        push = SleepingHandler(name="push")
+        mediator = Mediator(outbox=MemoryOutboxStore())
+        mediator.register_event(NewChatCreated, [kafka, push])
+
+        await mediator.publish_events([EVENT])
+        assert (kafka.calls, push.calls) == ([], ["push"])
+
+        await mediator.handle_events([EVENT], deferred=True)
+        assert (kafka.calls, push.calls) == (["kafka"], ["push"])
+
+    asyncio.run(scenario())
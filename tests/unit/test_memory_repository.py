@@ -0,0 +1,61 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.messages import MemoryChatRepository
+
+
+def test_lookups_by_oid_and_title():
+    repository = MemoryChatRepository()
+    chat = Chat.create_chat(title=Title(value="Support"))
+
+    asyncio.run(repository.add_chat(chat))
+
+    assert asyncio.run(repository.get_chat_by_oid(chat.oid)) is chat
+    assert asyncio.run(repository.get_chat_by_title("Support")) is chat
+    assert asyncio.run(repository.check_chat_exists_by_title("Support"))
+    assert not asyncio.run(repository.check_chat_exists_by_title("Sales"))
+    assert asyncio.run(repository.get_chat_by_oid("missing")) is None
+
+
+def test_list_chats_is_ordered_by_created_at():
+    repository = MemoryChatRepository()
+    now = datetime.now()
+    late = Chat(title=Title(value="Late"), created_at=now)
+    early = Chat(title=Title(value="Early"), created_at=now - timedelta(minutes=5))
+    latest = Chat(title=Title(value="Latest"), created_at=now + timedelta(minutes=5))
+
+    for chat in (late, early, latest):
+        asyncio.run(repository.add_chat(chat))
+
+    assert asyncio.run(repository.list_chats()) == [early, late, latest]
+
+
+def test_add_message_to_missing_chat_returns_none():
+    repository = MemoryChatRepository()
+
+    result = asyncio.run(repository.add_message("missing", Message(text=Text(value="Hi"))))
+
+    assert result is None
+
+
+def test_list_chats_filters_and_keyset_pages():
+    repository = MemoryChatRepository()
+    now = datetime.now()
+    chats = [
+        Chat(title=Title(value=title), created_at=now + timedelta(seconds=index))
+        for index, title in enumerate(["Sales EU", "Support", "sales US", "Billing", "Sales APAC"])
+    ]
+    for chat in chats:
+        asyncio.run(repository.add_chat(chat))
+
+    first_page = asyncio.run(repository.list_chats(limit=2))
+    second_page = asyncio.run(repository.list_chats(limit=2, after=(first_page[-1].created_at, first_page[-1].oid)))
+    sales = asyncio.run(repository.list_chats(title_prefix="SALES"))
+    recent_sales = asyncio.run(repository.list_chats(title_prefix="sales", created_after=chats[2].created_at))
+
+    assert first_page == chats[:2]
+    assert second_page == chats[2:4]
+    assert sales == [chats[0], chats[2], chats[4]]
+    assert recent_sales == [chats[4]]
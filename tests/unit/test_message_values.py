@@ -1,6 +1,14 @@
+from base64 import urlsafe_b64encode
+
 import pytest
 
-from app.domain.exceptions.messages import EmptyTextException, TitleTooLongException
+from app.domain.entities.messages import Message
+from app.domain.exceptions.messages import (
+    EmptyTextException,
+    InvalidCursorException,
+    TitleTooLongException,
+)
+from app.domain.values.cursors import Cursor
 from app.domain.values.messages import Text, Title
 
 
@@ -31,3 +39,23 @@ def test_title_as_generic_type_returns_string():
     title = Title(value="Welcome")
 
     assert title.as_generic_type() == "Welcome"
+
+
+def test_cursor_round_trips_entity_key():
+    message = Message(text=Text(value="Hi"))
+
+    cursor = Cursor.for_entity(message)
+
+    assert Cursor(value=cursor.as_generic_type()).as_key() == (message.created_at, message.oid)
+
+
+def test_cursor_rejects_garbage():
+    with pytest.raises(InvalidCursorException):
+        Cursor(value="not-a-cursor")
+
+
+def test_cursor_rejects_timestamps_with_an_offset():
+    raw = urlsafe_b64encode(b"2020-01-01T00:00:00+00:00|x").decode()
+
+    with pytest.raises(InvalidCursorException):
+        Cursor(value=raw)
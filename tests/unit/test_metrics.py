@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from app.domain.events.messages import NewChatCreated
+from app.infra.metrics.registry import NOOP_METRICS, MetricsRegistry
+from app.logic.events.base import EventHandler
+from app.logic.mediator import Mediator
+
+
+class FailingHandler(EventHandler[NewChatCreated, None]):
+    async def handle(self, event: NewChatCreated) -> None:
+        raise RuntimeError("boom")
+
+
+def test_histogram_renders_cumulative_buckets_with_escaped_labels():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    histogram.labels('/a"b').observe(0.05)
+    histogram.labels('/a"b').observe(0.5)
+    histogram.labels('/a"b').observe(5)
+    registry.counter("errors_total", "Errors.").labels().inc(2)
+
+    rendered = registry.render().splitlines()
+
+    assert "# TYPE latency_seconds histogram" in rendered
+    assert 'latency_seconds_bucket{route="/a\\"b",le="0.1"} 1' in rendered
+    assert 'latency_seconds_bucket{route="/a\\"b",le="1"} 2' in rendered
+    assert 'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 3' in rendered
+    assert 'latency_seconds_count{route="/a\\"b"} 3' in rendered
+    assert "errors_total 2" in rendered
+    with pytest.raises(ValueError):
+        registry.counter("latency_seconds", "Clash.")
+
+
+def test_mediator_records_handler_latency_and_failures():
+    registry = MetricsRegistry()
+    mediator = Mediator(metrics=registry)
+    mediator.register_event(NewChatCreated, [FailingHandler()])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(mediator.handle_event(NewChatCreated(chat_oid="c-1", chat_title="Support")))
+
+    rendered = registry.render()
+    assert 'chat_event_handler_failures_total{event="NewChatCreated",handler="FailingHandler"} 1' in rendered
+    assert 'chat_event_handler_duration_seconds_count{event="NewChatCreated",handler="FailingHandler"} 1' in rendered
+    assert NOOP_METRICS.histogram("anything", "Ignored.").labels("x").observe(1) is None
+    assert NOOP_METRICS.render() == ""
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import mongomock_motor
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.mongo import MongoChatRepository
+
+
+def _repository() -> MongoChatRepository:
+    return MongoChatRepository(
+        mongo_client=mongomock_motor.AsyncMongoMockClient(),
+        database_name="chat-tests",
+    )
+
+
+def test_chat_and_messages_round_trip():
+    async def scenario():
+        repository = _repository()
+        chat = Chat.create_chat(title=Title(value="Support"))
+        await repository.add_chat(chat)
+        now = datetime.now()
+        for index in range(3):
+            message = Message(text=Text(value=f"message {index}"), created_at=now + timedelta(seconds=index))
+            updated_chat = await repository.add_message(chat.oid, message)
+            assert updated_chat.pull_events()[0].message_oid == message.oid
+
+        loaded = await repository.get_chat_by_oid(chat.oid)
+
+        assert loaded.title.as_generic_type() == "Support"
+        assert [message.text.as_generic_type() for message in loaded.messages] == [
+            "message 0",
+            "message 1",
+            "message 2",
+        ]
+        assert await repository.check_chat_exists_by_title("Support")
+        assert not await repository.add_chat_if_absent(Chat(title=Title(value="Support")))
+        assert await repository.add_chat_if_absent(Chat(title=Title(value="Sales")))
+        assert await repository.add_message("missing", Message(text=Text(value="Hi"))) is None
+
+        batch = [
+            Message(text=Text(value=f"batch {index}"), created_at=now + timedelta(seconds=10 + index))
+            for index in range(2)
+        ]
+        updated_chat = await repository.add_messages(chat.oid, batch)
+        assert [event.message_oid for event in updated_chat.pull_events()] == [message.oid for message in batch]
+        assert len((await repository.get_chat_by_oid(chat.oid)).messages) == 5
+
+    asyncio.run(scenario())
+
+
+def test_messages_and_chats_are_keyset_paginated():
+    async def scenario():
+        repository = _repository()
+        now = datetime.now().replace(microsecond=0)
+        chats = [
+            Chat(title=Title(value=title), created_at=now + timedelta(seconds=index))
+            for index, title in enumerate(["Sales EU", "Support", "sales US"])
+        ]
+        for chat in chats:
+            await repository.add_chat(chat)
+        for index in range(5):
+            await repository.add_message(
+                chats[0].oid,
+                Message(text=Text(value=str(index)), created_at=now + timedelta(seconds=index)),
+            )
+
+        latest = await repository.get_messages(chats[0].oid, limit=2)
+        older = await repository.get_messages(
+            chats[0].oid,
+            limit=2,
+            before=(latest[0].created_at, latest[0].oid),
+        )
+        newer = await repository.get_messages(
+            chats[0].oid,
+            limit=10,
+            after=(older[-1].created_at, older[-1].oid),
+        )
+        first_page = await repository.list_chats(limit=2)
+        second_page = await repository.list_chats(after=(first_page[-1].created_at, first_page[-1].oid))
+        sales = await repository.list_chats(title_prefix="SALES")
+
+        assert [message.text.as_generic_type() for message in latest] == ["3", "4"]
+        assert [message.text.as_generic_type() for message in older] == ["1", "2"]
+        assert [message.text.as_generic_type() for message in newer] == ["3", "4"]
+        assert [chat.oid for chat in first_page + second_page] == [chat.oid for chat in chats]
+        assert [chat.oid for chat in sales] == [chats[0].oid, chats[2].oid]
+        assert await repository.get_messages("missing", limit=10) is None
+
+    asyncio.run(scenario())
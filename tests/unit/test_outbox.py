@@ -0,0 +1,201 @@
+import asyncio
+from functools import partial
+
+import pytest
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.events.messages import NewChatCreated, NewMessageReceivedEvent
+from app.domain.values.messages import Text, Title
+from app.infra.kafka.config import KafkaBrokerConfig
+from app.infra.kafka.producer import BufferedKafkaEventProducer, KafkaEventProducer
+from app.infra.outbox.relay import OutboxRelay
+from app.infra.outbox.stores import MemoryOutboxStore, SQLiteOutboxStore
+from app.infra.repositories.messages import MemoryChatRepository
+from app.infra.repositories.sqlite import SQLiteChatRepository
+from app.logic.events.messages import NewChatCreatedHandler
+from app.logic import init
+from app.logic.mediator import Mediator
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryOutboxStore(max_attempts=2)
+    return SQLiteOutboxStore(path=str(tmp_path / "outbox.sqlite3"), max_attempts=2)
+
+
+def test_relay_dispatches_pending_events_as_one_batch(store):
+    async def scenario():
+        batches = []
+
+        async def dispatch(events):
+            batches.append(events)
+
+        events = [
+            NewChatCreated(chat_oid="c-1", chat_title="Support"),
+            NewMessageReceivedEvent(message_text="Hi", message_oid="m-1", chat_oid="c-1"),
+        ]
+        await store.add(events)
+        relay = OutboxRelay(store=store, dispatch=dispatch)
+
+        assert await relay.relay_batch() == 2
+        assert await store.fetch_pending(10) == []
+        assert batches == [events]
+        assert [event.event_id for event in batches[0]] == [event.event_id for event in events]
+
+    asyncio.run(scenario())
+
+
+def test_failed_batch_is_retried_record_by_record(store):
+    async def scenario():
+        delivered = []
+
+        async def dispatch(events):
+            if any(event.chat_oid == "broken" for event in events):
+                raise RuntimeError("cannot encode")
+            delivered.extend(event.chat_oid for event in events)
+
+        await store.add([
+            NewChatCreated(chat_oid="c-1", chat_title="Support"),
+            NewChatCreated(chat_oid="broken", chat_title="Broken"),
+        ])
+        relay = OutboxRelay(store=store, dispatch=dispatch)
+
+        assert await relay.relay_batch() == 1
+        await relay.relay_batch()
+        await relay.relay_batch()
+
+        assert delivered == ["c-1"]
+        assert await store.fetch_pending(10) == []
+
+    asyncio.run(scenario())
+
+
+def test_background_relay_delivers_events_and_drains_on_stop(store):
+    async def scenario():
+        dispatched = []
+
+        async def dispatch(events):
+            dispatched.extend(event.chat_oid for event in events)
+
+        relay = OutboxRelay(store=store, dispatch=dispatch, poll_interval=5)
+        relay.start()
+        await asyncio.sleep(0)
+        await store.add([NewChatCreated(chat_oid="c-1", chat_title="First")])
+        await asyncio.sleep(0.05)
+        await store.add([NewChatCreated(chat_oid="c-2", chat_title="Second")])
+        await relay.stop()
+
+        assert dispatched == ["c-1", "c-2"]
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request, tmp_path):
+    if request.param == "memory":
+        return MemoryChatRepository(outbox=MemoryOutboxStore())
+    path = str(tmp_path / "chats.sqlite3")
+    return SQLiteChatRepository(path=path, outbox=SQLiteOutboxStore(path=path))
+
+
+def test_repository_writes_the_events_of_each_write_to_its_outbox(repository):
+    async def scenario():
+        chat = Chat.create_chat(title=Title(value="Support"))
+        assert await repository.add_chat_if_absent(chat)
+        events = chat.pull_events()
+        stored = await repository.add_messages(chat.oid, [Message(text=Text(value="Hi"))])
+        events += stored.pull_events()
+
+        pending = await repository.outbox.fetch_pending(10)
+
+        assert [record.event.event_id for record in pending] == [event.event_id for event in events]
+        assert [type(record.event) for record in pending] == [NewChatCreated, NewMessageReceivedEvent]
+
+    asyncio.run(scenario())
+
+
+def test_rejected_writes_leave_the_outbox_empty(repository):
+    async def scenario():
+        await repository.add_chat_if_absent(Chat.create_chat(title=Title(value="Support")))
+        await repository.outbox.mark_done([record.record_id for record in await repository.outbox.fetch_pending(10)])
+
+        assert not await repository.add_chat_if_absent(Chat.create_chat(title=Title(value="Support")))
+        assert await repository.add_messages("missing", [Message(text=Text(value="Hi"))]) is None
+        assert await repository.outbox.fetch_pending(10) == []
+
+    asyncio.run(scenario())
+
+
+class UnreachableKafkaClient:
+    async def send(self, topic, value, headers=None):
+        raise ConnectionError("broker is down")
+
+
+def test_failed_kafka_publish_keeps_the_record_pending(store, monkeypatch):
+    monkeypatch.setenv("KAFKA_ENABLED", "true")
+    monkeypatch.setattr(init, "KafkaBrokerConfig", partial(KafkaBrokerConfig, publish_mode="batch"))
+    assert type(init.build_event_publisher()) is BufferedKafkaEventProducer
+    assert type(init.build_event_publisher(outbox=store)) is KafkaEventProducer
+
+    async def scenario():
+        mediator = Mediator(outbox=store)
+        mediator.register_event(NewChatCreated, [
+            NewChatCreatedHandler(
+                producer=KafkaEventProducer(KafkaBrokerConfig(publish_mode="batch"), client=UnreachableKafkaClient()),
+                deferred=True,
+            ),
+        ])
+        await store.add([NewChatCreated(chat_oid="c-1", chat_title="Support")])
+        relay = OutboxRelay(store=store, dispatch=partial(mediator.handle_events, deferred=True))
+
+        assert await relay.relay_batch() == 0
+        assert [record.event.chat_oid for record in await store.fetch_pending(10)] == ["c-1"]
+
+    asyncio.run(scenario())
+
+
+def test_memory_store_drops_exhausted_records():
+    async def scenario():
+        store = MemoryOutboxStore(max_attempts=2)
+        await store.add([NewChatCreated(chat_oid="c-1", chat_title="Support")])
+        record_ids = [record.record_id for record in await store.fetch_pending(10)]
+
+        await store.mark_failed(record_ids)
+        assert len(store._records) == 1
+        await store.mark_failed(record_ids)
+        assert store._records == {}
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_relays_sharing_a_file_claim_distinct_records(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "outbox.sqlite3")
+        first, second = SQLiteOutboxStore(path=path), SQLiteOutboxStore(path=path)
+        await first.add([NewChatCreated(chat_oid=f"c-{index}", chat_title=f"Chat {index}") for index in range(3)])
+
+        claimed = await first.fetch_pending(2)
+        assert [record.event.chat_oid for record in claimed] == ["c-0", "c-1"]
+        assert [record.event.chat_oid for record in await second.fetch_pending(10)] == ["c-2"]
+        assert await second.fetch_pending(10) == []
+
+        await first.mark_failed([claimed[0].record_id])
+        await first.mark_done([claimed[1].record_id])
+        assert [record.event.chat_oid for record in await second.fetch_pending(10)] == ["c-0"]
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_claims_expire(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "outbox.sqlite3")
+        crashed = SQLiteOutboxStore(path=path, claim_timeout=0)
+        await crashed.add([NewChatCreated(chat_oid="c-1", chat_title="Support")])
+        await crashed.fetch_pending(10)
+        await asyncio.sleep(0.01)
+
+        survivor = SQLiteOutboxStore(path=path)
+        assert [record.event.chat_oid for record in await survivor.fetch_pending(10)] == ["c-1"]
+
+    asyncio.run(scenario())
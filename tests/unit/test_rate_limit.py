@@ -0,0 +1,94 @@
+import asyncio
+
+from app.application.api.ratelimit import RateLimitConfig, RateLimitMiddleware
+from app.infra.ratelimit.buckets import TokenBucketLimiter, parse_rate
+
+
+def test_token_bucket_refills_and_bounds_keys():
+    now = [0.0]
+    limiter = TokenBucketLimiter(rate=2, burst=2, max_keys=2, clock=lambda: now[0])
+
+    assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.5]
+    now[0] = 0.5
+    assert limiter.acquire("a") == 0.0
+    limiter.acquire("b")
+    limiter.acquire("c")
+    assert len(limiter) == 2
+    assert parse_rate("5") == (5.0, 5.0)
+    assert parse_rate("0.5/10") == (0.5, 10.0)
+    assert parse_rate("") is None and parse_rate("0") is None
+
+
+def test_admission_control_sheds_requests_over_the_in_flight_limit():
+    async def scenario() -> list[int]:
+        release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = RateLimitMiddleware(app, RateLimitConfig(max_in_flight=1))
+        statuses = []
+
+        async def request():
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            scope = {"type": "http", "method": "GET", "path": "/api/chats", "headers": []}
+            await middleware(scope, None, send)
+
+        first = asyncio.create_task(request())
+        await asyncio.sleep(0)
+        await request()
+        release.set()
+        await first
+        return statuses
+
+    assert asyncio.run(scenario()) == [503, 200]
+
+
+def test_batches_spend_a_token_per_message_and_rejections_spend_nothing():
+    async def scenario() -> tuple[list[int], list[bytes], float]:
+        received = []
+
+        async def app(scope, receive, send):
+            received.append((await receive())["body"])
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = RateLimitMiddleware(app, RateLimitConfig(per_ip=(1, 10), per_chat=(1, 3)))
+        for limiter in middleware._limiters.values():
+            limiter.clock = lambda: 0.0
+        statuses = []
+
+        async def post(path: str, body: bytes) -> None:
+            chunks = [
+                {"type": "http.request", "body": body[:5], "more_body": True},
+                {"type": "http.request", "body": body[5:], "more_body": False},
+            ]
+
+            async def receive():
+                return chunks.pop(0)
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    statuses.append(message["status"])
+
+            scope = {"type": "http", "method": "POST", "path": path, "headers": [], "client": ("1.2.3.4", 1)}
+            await middleware(scope, receive, send)
+
+        batch = b'{"messages": [{"text": "a"}, {"text": "b"}, {"text": "c"}]}'
+        await post("/api/chats/c-1/messages:batch", batch)
+        await post("/api/chats/c-1/messages:batch", batch)
+        await post("/api/chats/c-2/messages", b'{"text": "hello"}')
+        ip_limiter = middleware._limiters["ip"]
+        return statuses, received, ip_limiter.retry_after("1.2.3.4", 7)
+
+    statuses, received, ip_wait = asyncio.run(scenario())
+
+    # The second batch is rejected by the chat bucket without spending IP tokens.
+    assert statuses == [201, 429, 201]
+    assert received[0].startswith(b'{"messages"') and len(received) == 2
+    assert ip_wait == 1.0
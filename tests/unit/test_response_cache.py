@@ -0,0 +1,45 @@
+from app.infra.cache.responses import CHAT_LIST_TAG, ResponseCache, chat_tag
+
+
+def test_lru_eviction_keeps_cache_under_byte_budget():
+    cache = ResponseCache(max_bytes=250)
+    for index in range(3):
+        key = chat_tag(f"c-{index}")
+        cache.put(key, b"x" * 100, tag=key, version=cache.version())
+        cache.get(chat_tag("c-0"))
+
+    assert cache.size <= 250
+    assert cache.get(chat_tag("c-0")) is not None
+    assert cache.get(chat_tag("c-1")) is None
+    assert cache.stats.evictions == 1
+
+
+def test_invalidation_drops_tagged_entries_and_stale_fills():
+    cache = ResponseCache()
+    cache.put("chats?first", b"[]", tag=CHAT_LIST_TAG, version=0)
+    cache.put("chats?second", b"[]", tag=CHAT_LIST_TAG, version=0)
+    cache.put(chat_tag("c-1"), b"{}", tag=chat_tag("c-1"), version=0)
+    stale_version = cache.version()
+
+    cache.invalidate(CHAT_LIST_TAG)
+    entry = cache.put("chats?first", b"[1]", tag=CHAT_LIST_TAG, version=stale_version)
+
+    assert entry.etag
+    assert cache.get("chats?first") is None
+    assert cache.get("chats?second") is None
+    assert cache.get(chat_tag("c-1")) is not None
+
+
+def test_list_pages_are_invalidated_through_the_chats_they_show():
+    cache = ResponseCache()
+    version = cache.version()
+    cache.put("chats?first", b"[1, 2]", tag=CHAT_LIST_TAG, version=version, related_tags=(chat_tag("c-1"), chat_tag("c-2")))
+    cache.put("chats?second", b"[3]", tag=CHAT_LIST_TAG, version=version, related_tags=(chat_tag("c-3"),))
+    cache.invalidate(chat_tag("c-4"))
+    cache.put("chats?third", b"[4]", tag=CHAT_LIST_TAG, version=version, related_tags=(chat_tag("c-4"),))
+
+    cache.invalidate(chat_tag("c-2"))
+
+    assert cache.get("chats?first") is None
+    assert cache.get("chats?second") is not None
+    assert cache.get("chats?third") is None
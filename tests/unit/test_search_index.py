@@ -0,0 +1,71 @@
+import asyncio
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.messages import MemoryChatRepository
+from app.infra.search.index import InvertedIndex, index_repository, tokenize
+from app.logic.init import build_search_index
+
+
+def test_tokenize_folds_case_and_yo():
+    assert tokenize("Ёлка, ЁЖИК и hello_world!") == ["елка", "ежик", "и", "hello_world"]
+
+
+def test_search_requires_every_term_and_ranks_by_relevance():
+    index = InvertedIndex()
+    index.add_message("c-1", "m-1", "Оплата заказа не прошла")
+    index.add_message("c-1", "m-2", "Заказ оплачен, заказ в пути")
+    index.add_message("c-2", "m-3", "Доставка заказа задерживается")
+    index.add_chat("c-2", "Доставка")
+
+    both = index.search("заказ* опла*")
+    delivery = index.search("доставка")
+
+    assert both.total == 2
+    assert [hit.document.oid for hit in both.hits] == ["m-2", "m-1"]
+    # Equal scores go to the newer document.
+    assert [hit.document.oid for hit in delivery.hits] == ["c-2", "m-3"]
+    # Without "*" a word matches only itself, not "заказа".
+    assert index.search("заказ").total == 1
+    assert index.search("заказ отмена").total == 0
+    assert index.search("").total == 0
+
+
+def test_search_pages_and_ignores_replayed_documents():
+    index = InvertedIndex()
+    for number in range(5):
+        index.add_message("c-1", f"m-{number}", f"сообщение {number}")
+
+    assert not index.add_message("c-1", "m-0", "сообщение 0")
+    first_page = index.search("сообщение", limit=2)
+    second_page = index.search("сообщение", limit=2, offset=2)
+
+    assert first_page.total == 5
+    assert [hit.document.oid for hit in first_page.hits] == ["m-4", "m-3"]
+    assert [hit.document.oid for hit in second_page.hits] == ["m-2", "m-1"]
+
+
+def test_index_repository_adds_stored_chats_and_messages():
+    async def scenario() -> tuple[int, int]:
+        repository = MemoryChatRepository()
+        chat = Chat(title=Title("Архив"))
+        await repository.add_chat(chat)
+        await repository.add_messages(chat.oid, [Message(text=Text(f"старое {n}")) for n in range(7)])
+        index = InvertedIndex()
+        added = await index_repository(index, repository, page_size=3)
+        return added, index.search("старое").total
+
+    assert asyncio.run(scenario()) == (8, 7)
+
+
+def test_search_is_off_by_default_for_repositories_on_disk(monkeypatch):
+    monkeypatch.delenv("CHAT_SEARCH", raising=False)
+    monkeypatch.setenv("CHAT_REPOSITORY", "tiered")
+    assert build_search_index() is None
+
+    monkeypatch.setenv("CHAT_SEARCH", "on")
+    assert build_search_index() is not None
+
+    monkeypatch.delenv("CHAT_SEARCH")
+    monkeypatch.setenv("CHAT_REPOSITORY", "memory")
+    assert build_search_index() is not None
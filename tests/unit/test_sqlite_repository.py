@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.repositories.sqlite import SQLiteChatRepository
+
+
+def test_chat_and_messages_round_trip(tmp_path):
+    async def scenario():
+        repository = SQLiteChatRepository(str(tmp_path / "chats.sqlite3"))
+        chat = Chat.create_chat(title=Title(value="Support"))
+        await repository.add_chat(chat)
+        now = datetime.now()
+        for index in range(3):
+            message = Message(text=Text(value=f"message {index}"), created_at=now + timedelta(seconds=index))
+            updated_chat = await repository.add_message(chat.oid, message)
+            assert updated_chat.pull_events()[0].message_oid == message.oid
+
+        loaded = await repository.get_chat_by_oid(chat.oid)
+
+        assert loaded.title.as_generic_type() == "Support"
+        assert [message.text.as_generic_type() for message in loaded.messages] == [
+            "message 0",
+            "message 1",
+            "message 2",
+        ]
+        assert await repository.check_chat_exists_by_title("Support")
+        assert await repository.add_message("missing", Message(text=Text(value="Hi"))) is None
+
+        batch = [
+            Message(text=Text(value=f"batch {index}"), created_at=now + timedelta(seconds=10 + index))
+            for index in range(2)
+        ]
+        updated_chat = await repository.add_messages(chat.oid, batch)
+        assert [event.message_oid for event in updated_chat.pull_events()] == [message.oid for message in batch]
+        assert len((await repository.get_chat_by_oid(chat.oid)).messages) == 5
+
+    asyncio.run(scenario())
+
+
+def test_messages_and_chats_are_keyset_paginated(tmp_path):
+    async def scenario():
+        repository = SQLiteChatRepository(str(tmp_path / "chats.sqlite3"))
+        now = datetime.now().replace(microsecond=0)
+        chats = [
+            Chat(title=Title(value=title), created_at=now + timedelta(seconds=index))
+            for index, title in enumerate(["Sales EU", "Support", "sales US"])
+        ]
+        for chat in chats:
+            await repository.add_chat(chat)
+        for index in range(5):
+            await repository.add_message(
+                chats[0].oid,
+                Message(text=Text(value=str(index)), created_at=now + timedelta(seconds=index)),
+            )
+
+        latest = await repository.get_messages(chats[0].oid, limit=2)
+        older = await repository.get_messages(
+            chats[0].oid,
+            limit=2,
+            before=(latest[0].created_at, latest[0].oid),
+        )
+        newer = await repository.get_messages(
+            chats[0].oid,
+            limit=10,
+            after=(older[-1].created_at, older[-1].oid),
+        )
+        first_page = await repository.list_chats(limit=2)
+        second_page = await repository.list_chats(after=(first_page[-1].created_at, first_page[-1].oid))
+        sales = await repository.list_chats(title_prefix="SALES")
+
+        assert [message.text.as_generic_type() for message in latest] == ["3", "4"]
+        assert [message.text.as_generic_type() for message in older] == ["1", "2"]
+        assert [message.text.as_generic_type() for message in newer] == ["3", "4"]
+        assert [chat.oid for chat in first_page + second_page] == [chat.oid for chat in chats]
+        assert [chat.oid for chat in sales] == [chats[0].oid, chats[2].oid]
+        assert await repository.get_messages("missing", limit=10) is None
+
+    asyncio.run(scenario())
+
+
+def test_file_is_shared_between_repository_instances(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "chats.sqlite3")
+        writer, reader = SQLiteChatRepository(path), SQLiteChatRepository(path)
+        chat = Chat.create_chat(title=Title(value="Shared"))
+        await writer.add_chat(chat)
+        await writer.add_message(chat.oid, Message(text=Text(value="Hi")))
+
+        loaded = await reader.get_chat_by_title("Shared")
+
+        assert loaded.oid == chat.oid
+        assert [message.text.as_generic_type() for message in loaded.messages] == ["Hi"]
+
+    asyncio.run(scenario())
+
+
+def test_add_chat_if_absent_rejects_a_taken_title(tmp_path):
+    async def scenario():
+        repository = SQLiteChatRepository(str(tmp_path / "chats.sqlite3"))
+        first = await repository.add_chat_if_absent(Chat(title=Title(value="Unique")))
+        second = await repository.add_chat_if_absent(Chat(title=Title(value="Unique")))
+        return first, second, await repository.list_chats()
+
+    first, second, chats = asyncio.run(scenario())
+
+    assert (first, second) == (True, False)
+    assert len(chats) == 1
+
+
+def test_stop_closes_the_connection_and_checkpoints_the_wal(tmp_path):
+    async def scenario():
+        path = tmp_path / "chats.sqlite3"
+        repository = SQLiteChatRepository(str(path))
+        await repository.add_chat(Chat.create_chat(title=Title(value="Support")))
+        assert (tmp_path / "chats.sqlite3-wal").exists()
+
+        await repository.stop()
+
+        assert not (tmp_path / "chats.sqlite3-wal").exists()
+        assert await SQLiteChatRepository(str(path)).check_chat_exists_by_title("Support")
+
+    asyncio.run(scenario())
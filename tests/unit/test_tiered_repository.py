@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.domain.entities.messages import Chat, Message
+from app.domain.values.messages import Text, Title
+from app.infra.metrics.registry import MetricsRegistry
+from app.infra.repositories.sqlite import SQLiteChatRepository
+from app.infra.repositories.tiered import TieredChatRepository
+
+
+def _repository(tmp_path, **kwargs) -> TieredChatRepository:
+    return TieredChatRepository(cold=SQLiteChatRepository(path=str(tmp_path / "cold.sqlite3")), **kwargs)
+
+
+async def _add_chats(repository: TieredChatRepository, count: int, messages: int) -> list[str]:
+    oids = []
+    for index in range(count):
+        chat = Chat.create_chat(title=Title(value=f"chat {index}"))
+        await repository.add_chat(chat)
+        await repository.add_messages(chat.oid, [Message(text=Text(value=f"message {n}")) for n in range(messages)])
+        oids.append(chat.oid)
+    return oids
+
+
+def test_cold_chats_are_spilled_and_loaded_back(tmp_path):
+    async def scenario():
+        metrics = MetricsRegistry()
+        repository = _repository(tmp_path, max_chats=2, metrics=metrics)
+        oids = await _add_chats(repository, 3, messages=5)
+        await repository.flush()
+        evictions = repository.evictions
+
+        page = await repository.get_messages(oids[0], limit=2)
+        chat = await repository.get_chat_by_oid(oids[0])
+        await repository.add_message(oids[0], Message(text=Text(value="back")))
+        listed = await repository.list_chats()
+        return repository, metrics, evictions, page, chat, listed
+
+    repository, metrics, evictions, page, chat, listed = asyncio.run(scenario())
+
+    assert evictions == 1
+    assert [message.text.as_generic_type() for message in page] == ["message 3", "message 4"]
+    assert len(chat.messages) == 6
+    assert chat.pull_events()[0].message_text == "back"
+    assert len(listed) == 3
+    assert repository.misses == 2
+    assert 'chat_repository_cache_lookups_total{result="miss"} 2' in metrics.render()
+    assert "chat_repository_hot_chats 2" in metrics.render()
+
+
+@pytest.mark.parametrize("write_back", [False, True])
+def test_message_budget_bounds_memory_and_stop_writes_everything(tmp_path, write_back):
+    async def scenario():
+        repository = _repository(tmp_path, max_chats=100, max_messages=10, write_back=write_back)
+        oids = await _add_chats(repository, 4, messages=4)
+        resident = repository.resident_messages
+        await repository.stop()
+
+        cold = SQLiteChatRepository(path=str(tmp_path / "cold.sqlite3"))
+        chats = [await cold.get_chat_by_oid(oid) for oid in oids]
+        cold.close()
+        return resident, chats
+
+    resident, chats = asyncio.run(scenario())
+
+    assert resident <= 10
+    assert [len(chat.messages) for chat in chats] == [4, 4, 4, 4]
+
+
+@pytest.mark.parametrize("write_back", [False, True])
+def test_concurrent_writes_survive_evictions(tmp_path, write_back):
+    async def scenario():
+        repository = _repository(tmp_path, max_chats=1, write_back=write_back)
+        oids = await _add_chats(repository, 3, messages=0)
+        await asyncio.gather(*(
+            repository.add_message(oids[index % 3], Message(text=Text(value=f"message {index}")))
+            for index in range(60)
+        ))
+        return [len(await repository.get_messages(oid, limit=100)) for oid in oids]
+
+    assert asyncio.run(scenario()) == [20, 20, 20]
+
+
+def test_messages_are_in_the_cold_store_once_added_unless_written_back(tmp_path):
+    async def scenario(write_back: bool) -> int:
+        directory = tmp_path / f"write_back_{write_back}"
+        directory.mkdir()
+        repository = _repository(directory, write_back=write_back)
+        oids = await _add_chats(repository, 1, messages=3)
+        cold = SQLiteChatRepository(path=str(directory / "cold.sqlite3"))
+        stored = len(await cold.get_messages(oids[0], limit=10))
+        cold.close()
+        await repository.stop()
+        return stored
+
+    assert asyncio.run(scenario(write_back=False)) == 3
+    assert asyncio.run(scenario(write_back=True)) == 0